@@ -13,34 +13,65 @@ from datetime import datetime
 from dataclasses import dataclass, asdict, field
 from typing import List, Optional, Dict
 import os
+import errno
+import logging
 import shutil
+import hashlib
+import struct
+from bisect import bisect_left, bisect_right
 import urllib.request
 import urllib.error
 import ctypes
 from ctypes import wintypes
+from functools import lru_cache, partial
+from types import SimpleNamespace
 
 from PySide6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
     QPushButton, QLabel, QLineEdit, QComboBox, QScrollArea,
-    QFrame, QSizeGrip, QGraphicsDropShadowEffect, QDialog, QTextEdit, QSizePolicy,
-    QCalendarWidget, QDateEdit, QSystemTrayIcon, QTableView, QAbstractItemView, QLayout,
-    QProgressBar, QMessageBox, QProgressDialog
+    QFrame, QSizeGrip, QGraphicsDropShadowEffect, QAbstractButton, QDialog, QTextEdit, QSizePolicy,
+    QCalendarWidget, QSystemTrayIcon, QTableView, QAbstractItemView, QLayout,
+    QProgressBar, QMessageBox, QProgressDialog, QToolTip
 )
-from PySide6.QtCore import Qt, QPoint, QRect, QPropertyAnimation, QEasingCurve, Property, QStandardPaths, QDate, QSize, QTimer, QByteArray, Signal, QThread, QEvent
+from PySide6.QtCore import Qt, QPoint, QPointF, QRect, QRectF, QPropertyAnimation, QEasingCurve, Property, QStandardPaths, QDate, QSize, QTimer, QByteArray, Signal, QThread, QEvent, QSaveFile, QIODevice, QThreadPool
 from PySide6.QtGui import (
     QIcon, QFont, QColor, QPalette, QLinearGradient, QGradient, 
-    QPainter, QPen, QBrush, QCursor, QAction, QPixmap, QDrag
+    QPainter, QPen, QBrush, QCursor, QAction, QPixmap, QDrag, QTextDocument, QPainterPath
 )
 from PySide6.QtCore import QMimeData
 
-
-# Функция для генерации глобального стиля с учётом текущей темы
-def get_global_style():
-    """Генерирует глобальный стиль с использованием цветов из текущей темы"""
-    return f"""
+# Версия приложения и адрес API релизов (модуль version может отсутствовать в сборке)
+try:
+    from version import __version__, GITHUB_API_URL
+except ImportError:
+    __version__ = "1.0.1"
+    GITHUB_API_URL = "https://api.github.com/repos/elementary1997/taskmaster/releases/latest"
+
+# Журнал фоновой проверки обновлений: по умолчанию молчит (в сборке без консоли
+# print может упасть на закрытом stdout), вывод включается переменной TASKMASTER_DEBUG
+_update_log = logging.getLogger("taskmaster.update")
+if os.environ.get("TASKMASTER_DEBUG"):
+    _update_log.setLevel(logging.DEBUG)
+    _update_log.addHandler(logging.StreamHandler())
+else:
+    _update_log.addHandler(logging.NullHandler())
+
+# Тип события перемещения (для горячих eventFilter без поиска атрибута в QEvent)
+_MOVE_TYPE = QEvent.Move
+
+# Типы событий для eventFilter главного окна: все прочие (paint, hover, таймеры...)
+# отбрасываются одной проверкой по множеству
+_GEOMETRY_EVENT_TYPES = frozenset((QEvent.Move, QEvent.Resize))
+_DRAG_OVER_EVENT_TYPES = frozenset((QEvent.DragEnter, QEvent.DragMove))
+_MAIN_FILTER_EVENT_TYPES = _GEOMETRY_EVENT_TYPES | _DRAG_OVER_EVENT_TYPES | frozenset(
+    (QEvent.MouseButtonPress, QEvent.MouseMove, QEvent.Drop))
+
+
+# Глобальная таблица стилей приложения (плейсхолдеры - ключи THEME; стили карточек добавляются отдельно)
+_GLOBAL_QSS = """
         QLineEdit:focus, QTextEdit:focus, QComboBox:focus, QDateEdit:focus {{
             outline: none !important;
-            border: 1px solid {THEME['accent_hover']} !important;
+            border: 1px solid {accent_hover} !important;
         }}
         QLineEdit, QTextEdit, QComboBox, QDateEdit {{
             outline: none;
@@ -53,36 +84,35 @@ def get_global_style():
             selection-color: inherit;
         }}
         QToolTip {{
-            background-color: {THEME['window_bg_start']} !important;
-            color: {THEME['text_primary']} !important;
-            border: 1px solid {THEME['border_color']} !important;
+            background-color: {window_bg_start} !important;
+            color: {text_primary} !important;
+            border: 1px solid {border_color} !important;
             border-radius: 6px !important;
             padding: 5px !important;
         }}
     """
 
-def get_input_field_style():
-    """Генерирует стиль для полей ввода с использованием цветов из текущей темы"""
-    return f"""
+# Стиль полей ввода (QLineEdit, QTextEdit, QComboBox, QDateEdit)
+_INPUT_FIELD_QSS = """
         QLineEdit, QTextEdit, QComboBox, QDateEdit {{
-            background-color: {THEME['input_bg']};
-            border: 1px solid {THEME['border_color']};
-            color: {THEME['text_primary']};
+            background-color: {input_bg};
+            border: 1px solid {border_color};
+            color: {text_primary};
             border-radius: 8px;
             padding: 10px 12px;
         }}
         QLineEdit:focus, QDateEdit:focus {{
-            background-color: {THEME['input_bg_focus']};
-            border: 1px solid {THEME['accent_hover']} !important;
+            background-color: {input_bg_focus};
+            border: 1px solid {accent_hover} !important;
             outline: none;
         }}
         QComboBox:focus {{
-            background-color: {THEME['input_bg_focus']};
-            border: 1px solid {THEME['accent_hover']} !important;
+            background-color: {input_bg_focus};
+            border: 1px solid {accent_hover} !important;
             outline: none;
         }}
         QTextEdit:focus {{
-            background-color: {THEME['input_bg_focus']};
+            background-color: {input_bg_focus};
             border: 0px !important;
             outline: none;
         }}
@@ -90,24 +120,781 @@ def get_input_field_style():
             border: none;
         }}
         QComboBox QAbstractItemView {{
-            background-color: {THEME['window_bg_start']};
-            border: 1px solid {THEME['border_color']};
-            color: {THEME['text_primary']};
+            background-color: {window_bg_start};
+            border: 1px solid {border_color};
+            color: {text_primary};
             outline: none;
         }}
         QComboBox QAbstractItemView::item {{
             padding: 4px;
         }}
         QComboBox QAbstractItemView::item:hover {{
-            background-color: {THEME['card_bg_hover']};
+            background-color: {card_bg_hover};
         }}
         QComboBox QAbstractItemView::item:selected {{
-            background-color: {THEME['accent_bg']};
-            color: {THEME['accent_text']};
+            background-color: {accent_bg};
+            color: {accent_text};
         }}
     """
 
 
+@lru_cache(maxsize=8)
+def _global_style(scale, theme_items):
+    """Глобальная таблица стилей для масштаба и набора цветов темы"""
+    return _GLOBAL_QSS.format_map(dict(theme_items)) + _task_card_style(scale, theme_items)
+
+
+# Функция для генерации глобального стиля с учётом текущей темы
+def get_global_style():
+    """Генерирует глобальный стиль с использованием цветов из текущей темы
+    (строка собирается один раз на пару масштаб/тема, как get_main_window_styles)"""
+    return _global_style(ZoomManager.get_scale(), tuple(THEME.items()))
+
+
+@lru_cache(maxsize=4)
+def _input_field_style(theme_items):
+    """Стиль полей ввода для набора цветов темы"""
+    return _INPUT_FIELD_QSS.format_map(dict(theme_items))
+
+
+def get_input_field_style():
+    """Генерирует стиль для полей ввода с использованием цветов из текущей темы"""
+    return _input_field_style(tuple(THEME.items()))
+
+
+# Шаблоны стилей карточки задачи: подставляются через str.format_map
+# (цвета темы - по именам ключей THEME, размеры - sN = ZoomManager.scaled(N))
+_TASK_CARD_QSS = """
+    QFrame#taskCard {{
+        background-color: {card_bg};
+        border-radius: 10px;
+        border: 1px solid {border_color};
+    }}
+    QFrame#taskCard:hover {{
+        background-color: {card_bg_hover};
+    }}
+    QLabel#taskTitle {{
+        color: {text_primary};
+    }}
+    QLabel#taskTitle[done="true"] {{
+        color: {text_tertiary};
+        text-decoration: line-through;
+    }}
+    QLabel#taskMeta {{
+        color: {text_tertiary};
+    }}
+    QLabel#taskTime {{
+        color: {text_secondary};
+        margin-right: 5px;
+    }}
+    QFrame#taskSeparator {{
+        background-color: {border_color};
+        border: none;
+    }}
+    QPushButton#taskPlayBtn {{
+        background-color: transparent;
+        border: 1px solid {border_color};
+        color: {text_secondary};
+        font-size: {s14}px;
+        border-radius: {s14}px;
+    }}
+    QPushButton#taskPlayBtn[running="true"] {{
+        color: {accent_text};
+    }}
+    QPushButton#taskPlayBtn:hover {{
+        background-color: {secondary_hover};
+        color: {accent_text};
+    }}
+    QPushButton#taskResetBtn {{
+        background-color: transparent;
+        border: 1px solid {border_color};
+        color: {text_secondary};
+        font-size: 16px;
+        border-radius: 14px;
+        padding-bottom: 2px;
+    }}
+    QPushButton#taskResetBtn:hover {{
+        background-color: {secondary_hover};
+        color: {text_primary};
+    }}
+    QPushButton#taskTimerToggle {{
+        background-color: transparent;
+        border: 1px solid {border_color};
+        border-radius: {s16}px;
+    }}
+    QPushButton#taskTimerToggle:hover {{
+        background-color: {secondary_hover};
+    }}
+    QPushButton#taskTimerToggle[open="true"] {{
+        background-color: {accent_bg};
+        border: 1px solid {accent_hover};
+    }}
+    QPushButton#taskDeleteBtn {{
+        background-color: rgba(255, 107, 107, 0.3);
+        border: none;
+        border-radius: {s14}px;
+        color: #ff6b6b;
+        font-size: {s16}px;
+        font-weight: bold;
+    }}
+    QPushButton#taskDeleteBtn:hover {{
+        background-color: rgba(255, 107, 107, 0.5);
+    }}
+    DropZoneWidget {{
+        background-color: transparent;
+    }}
+    DropZoneWidget[dropActive="true"] {{
+        background-color: {accent_bg};
+        border-radius: 8px;
+    }}
+"""
+
+# Цвет подписи приоритета
+_TASK_CARD_PRIORITY_QSS = """
+    QLabel#taskPriority[priority="{priority}"] {{
+        color: {color};
+    }}
+"""
+
+
+@lru_cache(maxsize=8)
+def _task_card_style(scale, theme_items):
+    """
+    Стили карточек задач для глобальной таблицы стилей (масштаб и набор цветов темы).
+    Элементы карточки адресуются по objectName, состояние - динамическими свойствами
+    (running, open, done, priority, dropActive), поэтому карточкам не нужны собственные setStyleSheet.
+    Чекбокс выполнения рисуется сам (PriorityCheckbox) и в таблицу стилей не входит.
+    """
+    ctx = dict(theme_items)
+    ctx.update({f"s{v}": int(v * scale) for v in (14, 16)})
+    parts = [_TASK_CARD_QSS.format_map(ctx)]
+    for priority, color in PRIORITY_COLORS.items():
+        ctx["priority"] = priority
+        ctx["color"] = color
+        parts.append(_TASK_CARD_PRIORITY_QSS.format_map(ctx))
+    return "".join(parts)
+
+
+# Стили диалогов архива, отчета по времени и обновления (плейсхолдеры - ключи THEME)
+_DIALOG_QSS = {
+    "archive_container": """
+    QFrame#dialogContainer {{
+        background: qlineargradient(
+            x1:0, y1:0, x2:1, y2:1,
+            stop:0 {window_bg_start},
+            stop:1 {window_bg_end}
+        );
+        border: 1px solid rgba(255, 255, 255, 0.15);
+        border-radius: 20px;
+    }}
+""",
+    "archive_close_btn": """
+    QPushButton {{
+        background: transparent;
+        color: {text_secondary};
+        font-size: 18px;
+        border: none;
+    }}
+    QPushButton:hover {{
+        color: {text_primary};
+        background-color: {secondary_hover};
+        border-radius: 15px;
+    }}
+""",
+    "report_container": """
+    QFrame#reportContainer {{
+        background: qlineargradient(
+            x1:0, y1:0, x2:1, y2:1,
+            stop:0 {window_bg_start},
+            stop:1 {window_bg_end}
+        );
+        border: 1px solid {border_color};
+        border-radius: 20px;
+    }}
+""",
+    "report_close_btn": """
+    QPushButton {{
+        background: transparent;
+        color: {text_secondary};
+        font-size: 20px;
+        border: none;
+    }}
+    QPushButton:hover {{
+        color: {text_primary};
+        background-color: {secondary_hover};
+        border-radius: 16px;
+    }}
+""",
+    "report_nav_btn": """
+    QPushButton {{
+        background-color: {secondary_bg};
+        color: {text_primary};
+        border-radius: 10px;
+        border: 1px solid {border_color};
+        font-size: 14px;
+    }}
+    QPushButton:hover {{
+        background-color: {secondary_hover};
+        border-color: {accent_hover};
+    }}
+""",
+    "report_date_btn": """
+    QPushButton {{
+        background-color: {input_bg};
+        color: {text_primary};
+        padding: 0 20px;
+        border: 1px solid {border_color};
+        border-radius: 10px;
+    }}
+    QPushButton:hover {{
+        background-color: {input_bg_focus};
+        border-color: {accent_hover};
+    }}
+""",
+    "report_scrollbar": """
+    QScrollBar:vertical {{
+        border: none;
+        background: transparent;
+        width: 8px;
+    }}
+    QScrollBar::handle:vertical {{
+        background: {scroll_handle};
+        border-radius: 4px;
+    }}
+""",
+    "report_export_btn": """
+    QPushButton {{
+        background-color: {accent_bg};
+        color: {accent_text};
+        padding: 0 25px;
+        border-radius: 12px;
+        border: none;
+    }}
+    QPushButton:hover {{
+        background-color: {accent_hover};
+    }}
+""",
+    "report_item": """
+    QFrame#reportItem {{
+        background-color: {secondary_bg};
+        border-radius: 10px;
+    }}
+    QFrame#reportItem:hover {{
+        background-color: {secondary_hover};
+    }}
+""",
+    "report_calendar_container": """
+    QFrame {{
+        background-color: {window_bg_start};
+        border: 1px solid {border_color};
+        border-radius: 12px;
+    }}
+""",
+    # Попап слайдера масштаба/прозрачности (SliderPopup)
+    "slider_popup_container": """
+    QFrame {{
+        background-color: {window_bg_start};
+        border: 1px solid {border_color};
+        border-radius: 8px;
+    }}
+""",
+    "update_dialog": "background-color: {window_bg_end}; color: {text_primary};",
+    "update_title": "color: {accent_hover};",
+    "update_changelog": """
+    QTextEdit {{
+        background-color: rgba(255, 255, 255, 0.05);
+        border: 1px solid {border_color};
+        border-radius: 8px;
+        padding: 10px;
+        color: {text_primary};
+        font-size: 13px;
+    }}
+""",
+    "update_progress": """
+    QProgressBar {{
+        background-color: rgba(255, 255, 255, 0.1);
+        border: 1px solid {border_color};
+        border-radius: 5px;
+        text-align: center;
+        color: {text_primary};
+        height: 20px;
+    }}
+    QProgressBar::chunk {{
+        background-color: {accent_bg};
+        border-radius: 4px;
+    }}
+""",
+    "update_accept_btn": """
+    QPushButton {{
+        background-color: {accent_bg};
+        color: {accent_text};
+        border: none;
+        border-radius: 6px;
+        font-weight: bold;
+        padding: 0 20px;
+    }}
+    QPushButton:hover {{
+        background-color: {accent_hover};
+    }}
+""",
+    "update_later_btn": """
+    QPushButton {{
+        background-color: rgba(255, 255, 255, 0.1);
+        color: {text_primary};
+        border: none;
+        border-radius: 6px;
+        padding: 0 20px;
+    }}
+    QPushButton:hover {{
+        background-color: rgba(255, 255, 255, 0.2);
+    }}
+""",
+}
+
+
+@lru_cache(maxsize=4)
+def _dialog_styles(theme_items):
+    """Готовые таблицы стилей диалогов для набора цветов темы"""
+    ctx = dict(theme_items)
+    return SimpleNamespace(**{name: qss.format_map(ctx) for name, qss in _DIALOG_QSS.items()})
+
+
+def get_dialog_styles():
+    """
+    Таблицы стилей диалогов архива, отчета по времени и обновления для текущей темы.
+    Форматируются один раз на тему: ключ кэша - сами цвета THEME, поэтому смена темы
+    (THEME.update) не требует отдельной инвалидации.
+    """
+    return _dialog_styles(tuple(THEME.items()))
+
+
+# Стили главного окна (плейсхолдеры - ключи THEME; одинаковые кнопки делят один шаблон)
+_MAIN_WINDOW_QSS = {
+    # Фон окна и элементы, зависящие только от темы (заголовок, форма добавления, счетчик,
+    # кнопка фильтров, область прокрутки) - одна таблица на контейнер вместо таблицы на виджет
+    "main_container": """
+    QFrame#mainContainer {{
+        background: qlineargradient(
+            x1:0, y1:0, x2:1, y2:1,
+            stop:0 {window_bg_start},
+            stop:1 {window_bg_end}
+        );
+        border: none;
+    }}
+    QLabel#appTitle {{
+        color: {text_primary};
+    }}
+    QFrame#addForm, QFrame#addForm QFrame {{
+        background-color: {form_bg};
+        border-radius: 12px;
+        border: 1px solid {border_color};
+    }}
+    QLabel#taskCounter {{
+        color: {text_secondary};
+    }}
+    QPushButton#filterBtn {{
+        background-color: rgba(255, 255, 255, 0.05);
+        border: 1px solid {border_color};
+        color: {text_secondary};
+        border-radius: 14px;
+        padding: 0 12px;
+        font-size: 11px;
+        font-weight: 500;
+    }}
+    QPushButton#filterBtn:hover {{
+        background-color: rgba(255, 255, 255, 0.1);
+        border: 1px solid rgba(255, 255, 255, 0.2);
+        color: {text_primary};
+    }}
+    QScrollArea#tasksScroll {{
+        background: transparent;
+        border: none;
+    }}
+    QScrollArea#tasksScroll QScrollBar:vertical {{
+        background: transparent;
+        width: 6px;
+        margin: 0px;
+    }}
+    QScrollArea#tasksScroll QScrollBar::handle:vertical {{
+        background: {scroll_handle};
+        min-height: 20px;
+        border-radius: 3px;
+    }}
+    QScrollArea#tasksScroll QScrollBar::add-line:vertical, QScrollArea#tasksScroll QScrollBar::sub-line:vertical {{
+        height: 0px;
+    }}
+    QScrollArea#tasksScroll QScrollBar::add-page:vertical, QScrollArea#tasksScroll QScrollBar::sub-page:vertical {{
+        background: none;
+    }}
+""",
+    "title_input": """
+    QLineEdit {{
+        background-color: {input_bg};
+        border: 1px solid {border_color};
+        border-radius: 8px;
+        padding: 10px 12px;
+        color: {text_primary};
+        selection-background-color: {accent_hover};
+        selection-color: {accent_text};
+    }}
+    QLineEdit:focus {{
+        border: 1px solid {accent_hover};
+        background-color: {input_bg_focus};
+    }}
+    QLineEdit::selection {{
+        background-color: {accent_hover};
+        color: {accent_text};
+    }}
+""",
+    "priority_combo": """
+    QComboBox {{
+        background-color: {input_bg};
+        border: 1px solid {border_color};
+        border-radius: 8px;
+        padding: 8px 12px;
+        color: {text_primary};
+    }}
+    QComboBox:hover {{
+        background-color: {input_bg_focus};
+    }}
+    QComboBox:focus {{
+        border: 1px solid rgba(107, 207, 127, 0.6);
+    }}
+    QComboBox::drop-down {{
+        border: none;
+    }}
+    QComboBox QAbstractItemView {{
+        background-color: {card_bg};
+        border: 1px solid {border_color};
+        color: {text_primary};
+        outline: none;
+    }}
+    QComboBox QAbstractItemView::item {{
+        padding: 4px;
+    }}
+    QComboBox QAbstractItemView::item:hover {{
+        background-color: {card_bg_hover};
+    }}
+    QComboBox QAbstractItemView::item:selected {{
+        background-color: {accent_bg};
+        color: {accent_text};
+    }}
+""",
+    "add_btn": """
+    QPushButton {{
+        background-color: {accent_bg};
+        border: none;
+        border-radius: 8px;
+        padding: 8px 16px;
+        color: {accent_text};
+    }}
+    QPushButton:hover {{
+        background-color: {accent_hover};
+    }}
+""",
+    "active_header": "color: {text_primary}; padding: 0px;",
+    "bottom_bar": """
+    QFrame#bottomBar {{
+        background-color: {card_bg};
+        border: 1px solid {border_color};
+        border-radius: 22px;
+    }}
+    QPushButton#helpBtn {{
+        background-color: transparent;
+        color: #ff4d4d;
+        border: 1px solid {border_color};
+        border-radius: 16px;
+        font-size: 18px;
+        font-weight: bold;
+    }}
+    QPushButton#helpBtn:hover {{
+        background-color: {secondary_hover};
+        border-color: #ff4d4d;
+    }}
+    QPushButton#updateBtn, QPushButton#toolsBtn, QPushButton#completedBtn {{
+        background-color: transparent;
+        color: {text_secondary};
+        border: 1px solid {border_color};
+        border-radius: 16px;
+        font-size: 16px;
+    }}
+    QPushButton#updateBtn:hover, QPushButton#toolsBtn:hover, QPushButton#completedBtn:hover {{
+        background-color: {secondary_hover};
+        color: {text_primary};
+        border-color: {accent_hover};
+    }}
+    QPushButton#updateBtn[updateAvailable="true"] {{
+        border: 2px solid #4dabf7;
+    }}
+    QPushButton#updateBtn[updateAvailable="true"]:hover {{
+        background-color: rgba(77, 171, 247, 0.1);
+    }}
+    QPushButton#toolsBtn[open="true"] {{
+        background-color: {accent_bg};
+        color: {accent_text};
+        border: 1px solid {accent_hover};
+    }}
+""",
+    "separator": "background-color: {border_color}; border: none;",
+    # Кнопки панели инструментов: маленькие (property class="tool") и крупные в рамке
+    # (масштаб, прозрачность, теги) - одна таблица на контейнер
+    "tools_container": """
+    QPushButton#zoomBtn, QPushButton#opacityBtn, QPushButton#tagsBtn {{
+        background-color: transparent;
+        color: {text_primary};
+        border: 1px solid {border_color};
+        border-radius: 6px;
+        font-size: 16px;
+    }}
+    QPushButton#zoomBtn {{
+        font-weight: bold;
+        font-size: 14px;
+    }}
+    QPushButton#zoomBtn:hover, QPushButton#opacityBtn:hover, QPushButton#tagsBtn:hover {{
+        background-color: {secondary_hover};
+        border-color: {accent_hover};
+    }}
+    QPushButton[class="tool"] {{
+        background-color: transparent;
+        border: none;
+        color: {text_secondary};
+        font-size: 14px;
+        border-radius: 4px;
+    }}
+    QPushButton[class="tool"]:hover {{
+        background-color: {secondary_hover};
+        color: {text_primary};
+    }}
+    QPushButton[class="tool"]:checked {{
+        background-color: {accent_bg};
+        color: {accent_text};
+    }}
+    QPushButton#minimalModeBtn {{
+        font-size: 16px;
+    }}
+""",
+    "tags_menu": """
+    QMenu {{
+        background-color: {card_bg};
+        border: 1px solid {border_color};
+        border-radius: 8px;
+        padding: 4px;
+    }}
+    QMenu::item {{
+        padding: 8px 16px;
+        border-radius: 4px;
+        color: {text_primary};
+    }}
+    QMenu::item:selected {{
+        background-color: {accent_bg};
+        color: {accent_text};
+    }}
+""",
+    "filter_menu": """
+            QMenu {{
+                background-color: {window_bg_end};
+                color: {text_primary};
+                border: 1px solid {border_color};
+                border-radius: 8px;
+                padding: 6px;
+            }}
+            QMenu::item {{
+                padding: 8px 32px 8px 16px;
+                border-radius: 4px;
+                margin: 2px;
+            }}
+            QMenu::item:selected {{
+                background-color: {accent_bg};
+                color: {accent_text};
+            }}
+            QMenu::icon {{
+                padding-left: 10px;
+            }}
+""",
+    "theme_menu": """
+            QMenu {{
+                background-color: {window_bg_end};
+                color: {text_primary};
+                border: 1px solid {border_color};
+                border-radius: 8px;
+                padding: 5px;
+            }}
+            QMenu::item {{
+                padding: 5px 20px;
+                border-radius: 4px;
+            }}
+            QMenu::item:selected {{
+                background-color: {secondary_hover};
+            }}
+""",
+    # Окна сообщений проверки обновлений
+    "msgbox_latest": """
+                QMessageBox {{
+                    background-color: {window_bg_end};
+                }}
+                QLabel {{
+                    color: {text_primary};
+                    font-size: 14px;
+                }}
+                QPushButton {{
+                    background-color: {accent_bg};
+                    color: {accent_text};
+                    border: none;
+                    border-radius: 6px;
+                    padding: 6px 16px;
+                    min-width: 80px;
+                }}
+                QPushButton:hover {{
+                    background-color: {accent_hover};
+                }}
+            """,
+    "msgbox_plain": """
+                    QMessageBox {{
+                        background-color: {window_bg_end};
+                        color: {text_primary};
+                    }}
+                """,
+    "msgbox_no_releases": """
+                    QMessageBox {{
+                        background-color: {window_bg_end};
+                    }}
+                    QLabel {{
+                        color: {text_primary};
+                        font-size: 13px;
+                    }}
+                    QPushButton {{
+                        background-color: {accent_bg};
+                        color: {accent_text};
+                        border: none;
+                        border-radius: 6px;
+                        padding: 6px 16px;
+                    }}
+                """,
+    "msgbox_error": """
+                QMessageBox {{
+                    background-color: {window_bg_end};
+                }}
+                QLabel {{
+                    color: {text_primary};
+                }}
+                QPushButton {{
+                    background-color: {accent_bg};
+                    color: {accent_text};
+                    border: none;
+                    border-radius: 6px;
+                    padding: 6px 16px;
+                }}
+            """,
+}
+
+
+def _set_style_state(widget, name, value):
+    """Сменить динамическое свойство элемента и перечитать для него стиль (селекторы [name="value"])"""
+    if widget.property(name) == value:
+        return
+    widget.setProperty(name, value)
+    style = widget.style()
+    style.unpolish(widget)
+    style.polish(widget)
+
+
+def _set_style_if_changed(widget, qss):
+    """setStyleSheet только при смене строки: повторная установка той же таблицы
+    всё равно заставляет Qt заново разбирать стиль и полировать всех потомков"""
+    if getattr(widget, '_css_key', None) != qss:
+        widget._css_key = qss
+        widget.setStyleSheet(qss)
+
+
+@lru_cache(maxsize=4)
+def _main_window_styles(theme_items):
+    """Готовые таблицы стилей главного окна для набора цветов темы"""
+    ctx = dict(theme_items)
+    return SimpleNamespace(**{name: qss.format_map(ctx) for name, qss in _MAIN_WINDOW_QSS.items()})
+
+
+def get_main_window_styles():
+    """Таблицы стилей главного окна для текущей темы (кэш по цветам THEME, как get_dialog_styles)"""
+    return _main_window_styles(tuple(THEME.items()))
+
+
+# Стили главного окна, зависящие от масштаба (плейсхолдеры pxN - ZoomManager.scaled(N))
+_SCALED_MAIN_WINDOW_QSS = {
+    "active_header": "color: {text_primary}; padding: {px8}px 0px;",
+    "toggle_completed_btn": """
+                QPushButton {{
+                    background-color: transparent;
+                    color: {text_secondary};
+                    border: none;
+                    font-size: {px18}px;
+                    font-weight: bold;
+                }}
+                QPushButton:hover {{
+                    color: {text_primary};
+                }}
+            """,
+    "add_btn": """
+                QPushButton {{
+                    background-color: {accent_bg};
+                    border: none;
+                    border-radius: {px8}px;
+                    padding: {px8}px {px16}px;
+                    color: {accent_text};
+                }}
+                QPushButton:hover {{
+                    background-color: {accent_hover};
+                }}
+            """,
+    "title_input": """
+            QLineEdit {{
+                background-color: {input_bg};
+                border: 1px solid {border_color};
+                border-radius: {px8}px;
+                padding: {px10}px {px12}px;
+                color: {text_primary};
+                selection-background-color: {accent_hover};
+                selection-color: {accent_text};
+            }}
+            QLineEdit:focus {{
+                border: 1px solid {accent_hover};
+                background-color: {input_bg_focus};
+            }}
+            QLineEdit::selection {{
+                background-color: {accent_hover};
+                color: {accent_text};
+            }}
+        """,
+}
+
+
+@lru_cache(maxsize=16)
+def _scaled_main_window_styles(scale, theme_items):
+    """Таблицы стилей главного окна для масштаба и набора цветов темы"""
+    ctx = dict(theme_items)
+    ctx.update({f"px{v}": int(v * scale) for v in (8, 10, 12, 16, 18)})
+    return SimpleNamespace(**{name: qss.format_map(ctx) for name, qss in _SCALED_MAIN_WINDOW_QSS.items()})
+
+
+# Координаты курсора из lParam оконных сообщений: два знаковых 16-битных числа (x, y)
+_unpack_lparam_xy = struct.Struct("<hh").unpack
+
+# SetWindowPos: положение в z-порядке без перемещения, изменения размера и активации окна
+_HWND_TOPMOST = wintypes.HWND(-1)
+_HWND_NOTOPMOST = wintypes.HWND(-2)
+_SWP_Z_ORDER_ONLY = 0x0002 | 0x0001 | 0x0010  # SWP_NOMOVE | SWP_NOSIZE | SWP_NOACTIVATE
+
+
+# Цвет рамки чекбокса карточки по приоритету
+_CHECK_COLORS = {"high": "#ff6b6b", "medium": "#ffd93d"}
+
+# Шрифты главного окна (QFont разделяет данные между копиями - один объект на все виджеты)
+_FONT_TITLE = QFont("Segoe UI", 18, QFont.Bold)
+_FONT_INPUT = QFont("Segoe UI", 11)
+_FONT_COMBO = QFont("Segoe UI", 10)
+_FONT_BTN = QFont("Segoe UI", 10, QFont.Medium)
+_FONT_COUNTER = QFont("Segoe UI", 9)
+
+
 
 # Константы
 # Определение пути к файлу данных
@@ -132,6 +919,9 @@ def get_settings_file():
 
 SETTINGS_FILE = get_settings_file()
 
+# Кэш HTML чейнджлога последнего показанного обновления
+CHANGELOG_CACHE_FILE = SETTINGS_FILE.with_name("changelog_cache.json")
+
 # === Вспомогательные функции ===
 
 def pluralize(number, forms):
@@ -151,6 +941,69 @@ def pluralize(number, forms):
         return forms[1]
     return forms[2]
 
+
+@lru_cache(maxsize=32)
+def _version_key(version):
+    """Кортеж для сравнения версий "1.2.3"; хвостовые нули отброшены, поэтому 1.0 и 1.0.0 равны"""
+    parts = [int(x) for x in version.split('.')]
+    while parts and parts[-1] == 0:
+        parts.pop()
+    return tuple(parts)
+
+
+# Формы слова "задача" для счетчика
+_TASKS_PLURAL = ('задача', 'задачи', 'задач')
+
+
+@lru_cache(maxsize=1024)
+def _due_julian_day(due_date):
+    """Юлианский день срока задачи "yyyy-MM-dd" (кэш по строке: срок разбирается один раз,
+    смена task.due_date просто дает другой ключ). Некорректная дата дает день пустой QDate,
+    который меньше любой реальной даты - как и при сравнении самих QDate"""
+    return QDate.fromString(due_date, "yyyy-MM-dd").toJulianDay()
+
+
+@lru_cache(maxsize=32)
+def _priority_pix(color_hex, w, h):
+    """Пиксмап индикатора приоритета (кэшируется по цвету и размеру)"""
+    pix = QPixmap(w, h)
+    pix.fill(Qt.transparent)
+    painter = QPainter(pix)
+    painter.setRenderHint(QPainter.Antialiasing)
+    painter.setPen(Qt.NoPen)
+    painter.setBrush(QColor(color_hex))
+    painter.drawRoundedRect(0, 0, w, h, 2, 2)
+    painter.end()
+    return pix
+
+
+@lru_cache(maxsize=8)
+def _completed_btn_icon(has_dot, color_hex):
+    """Иконка кнопки архива: галочка и красная точка, если есть выполненные задачи
+    (кэшируется по наличию точки и цвету темы)"""
+    # Базовая иконка (галочка)
+    size = 32
+    pixmap = QPixmap(size, size)
+    pixmap.fill(Qt.transparent)
+    
+    painter = QPainter(pixmap)
+    painter.setRenderHint(QPainter.Antialiasing)
+    
+    # Рисуем галочку (текст), по центру
+    painter.setFont(QFont("Segoe UI Emoji", 16))
+    painter.setPen(QColor(color_hex))
+    painter.drawText(QRect(0, 0, size, size), Qt.AlignCenter, "✅")
+    
+    # Если есть задачи, рисуем красную точку в правом верхнем углу
+    if has_dot:
+        dot_size = 10
+        painter.setBrush(QColor("#ff4d4d")) # Красный
+        painter.setPen(Qt.NoPen)
+        painter.drawEllipse(size - dot_size - 2, 2, dot_size, dot_size)
+        
+    painter.end()
+    return QIcon(pixmap)
+
 # === Классы ===
 
 class SettingsManager:
@@ -362,13 +1215,32 @@ PRIORITY_NAMES = {
     "low": "Низкий"
 }
 
+# Порядок сортировки по приоритету (неизвестный приоритет - в конец)
+_PRIORITY_ORDER = {"high": 0, "medium": 1, "low": 2}
+
+# Интервал повторения задач в днях
+REPEAT_INTERVAL_DAYS = {
+    "daily": 1,
+    "weekly": 7,
+    "monthly": 30,
+}
+
 
 class SoundManager:
+    _enabled = None  # Кэш настройки sounds_enabled: файл настроек читается один раз
+    
+    @classmethod
+    def set_enabled(cls, enabled):
+        """Обновить кэш настройки звуков (сама настройка сохраняется вызывающим кодом)"""
+        cls._enabled = enabled
+    
     @staticmethod
     def play_complete_sound():
         """Проигрывает приятный щелчок как в современных таск-менеджерах"""
         # Проверяем, включены ли звуки
-        if not SettingsManager.get("sounds_enabled", True):
+        if SoundManager._enabled is None:
+            SoundManager._enabled = SettingsManager.get("sounds_enabled", True)
+        if not SoundManager._enabled:
             return
         
         try:
@@ -435,6 +1307,7 @@ class ZoomManager:
     """Управление масштабированием интерфейса"""
     _scale = 1.0
     _callbacks = []
+    _font_cache = {}  # (family, масштабированный размер, weight) -> QFont
 
     @classmethod
     def set_scale(cls, scale: float):
@@ -456,7 +1329,12 @@ class ZoomManager:
         
     @classmethod
     def font(cls, family: str, size: int, weight=QFont.Normal) -> QFont:
-        return QFont(family, cls.scaled(size), weight)
+        key = (family, cls.scaled(size), weight)
+        cached = cls._font_cache.get(key)
+        if cached is None:
+            cached = cls._font_cache[key] = QFont(family, key[1], weight)
+        # Копия (implicit sharing - дешево): вызывающий код может менять шрифт
+        return QFont(cached)
         
     @classmethod
     def stylesheet_font_size(cls, size: int) -> str:
@@ -502,7 +1380,8 @@ class TaskStorage:
                         item["last_repeated_date"] = None
                     if "time_spent" not in item:
                         item["time_spent"] = 0
-                    if "time_log" not in item:
+                    # time_log всегда словарь (в т.ч. при null в файле) - таймеру не нужны проверки
+                    if item.get("time_log") is None:
                         item["time_log"] = {}
                     if "is_running" not in item:
                         item["is_running"] = False
@@ -520,11 +1399,11 @@ class TaskStorage:
             return []
     
     @staticmethod
-    def save(tasks: List[Task]) -> None:
-        """Сохранение задач в файл"""
+    def write(data: List[dict]) -> None:
+        """Запись уже сериализованных задач в файл (безопасно вызывать из фонового потока)"""
         try:
             with open(TASKS_FILE, "w", encoding="utf-8") as f:
-                json.dump([asdict(t) for t in tasks], f, ensure_ascii=False, indent=2)
+                json.dump(data, f, ensure_ascii=False, indent=2)
         except Exception as e:
             print(f"Ошибка сохранения: {e}")
 
@@ -838,7 +1717,7 @@ class DateNavigator(QFrame):
         self.prev_btn = QPushButton("←")
         self.prev_btn.setFixedSize(ZoomManager.scaled(28), ZoomManager.scaled(28))
         self.prev_btn.setCursor(QCursor(Qt.PointingHandCursor))
-        self.prev_btn.clicked.connect(lambda: self.change_date(-1))
+        self.prev_btn.clicked.connect(partial(self.change_date, -1))
         layout.addWidget(self.prev_btn)
         
         # Текст даты
@@ -851,7 +1730,7 @@ class DateNavigator(QFrame):
         self.next_btn = QPushButton("→")
         self.next_btn.setFixedSize(ZoomManager.scaled(28), ZoomManager.scaled(28))
         self.next_btn.setCursor(QCursor(Qt.PointingHandCursor))
-        self.next_btn.clicked.connect(lambda: self.change_date(1))
+        self.next_btn.clicked.connect(partial(self.change_date, 1))
         layout.addWidget(self.next_btn)
         
         # Styles will be updated by update_styles
@@ -1554,8 +2433,7 @@ class TaskDialog(DraggableDialog):
             self.title_input.setText(self.task.title)
             self.description_input.setPlainText(self.task.description)
             
-            priority_map = {"high": 0, "medium": 1, "low": 2}
-            self.priority_combo.setCurrentIndex(priority_map.get(self.task.priority, 1))
+            self.priority_combo.setCurrentIndex(_PRIORITY_ORDER.get(self.task.priority, 1))
             
             if self.task.due_date:
                 date = QDate.fromString(self.task.due_date, "yyyy-MM-dd")
@@ -1633,7 +2511,7 @@ class TaskDialog(DraggableDialog):
                     background-color: rgba(255, 255, 255, 0.2);
                 }}
             """)
-            remove_btn.clicked.connect(lambda checked, t=tag: self._remove_tag(t))
+            remove_btn.clicked.connect(partial(self._remove_tag, tag))
             tag_layout.addWidget(remove_btn)
             
             self.selected_tags_layout.addWidget(tag_widget)
@@ -1955,7 +2833,7 @@ class TagsDialog(DraggableDialog):
                     color: #ff6b6b;
                 }}
             """)
-            delete_btn.clicked.connect(lambda checked, t=tag: self._delete_tag_from_system(t))
+            delete_btn.clicked.connect(partial(self._delete_tag_from_system, tag))
             tag_layout.addWidget(delete_btn)
             
             self.tags_layout.addWidget(tag_widget)
@@ -2095,7 +2973,7 @@ class TagsDialog(DraggableDialog):
                 
                 # Сохраняем изменения в задачах
                 if removed_count > 0:
-                    TaskStorage.save(window.tasks)
+                    window._schedule_save()
                     window._refresh_tasks()
                 
                 # Удаляем тег из постоянного хранилища
@@ -2176,6 +3054,15 @@ class NotificationDialog(DraggableDialog):
         self.settings_manager = parent.settings_manager if hasattr(parent, 'settings_manager') else SettingsManager()
         self.parent_window = parent
         
+        # Виджеты, создаваемые в _setup_ui (clear_btn - только при наличии задач)
+        self.title = None
+        self.close_btn = None
+        self.content_layout = None
+        self.clear_btn = None
+        
+        # Флаг отложенного обновления масштаба (несколько изменений за тик -> одно обновление)
+        self._zoom_pending = False
+        
         self.setWindowTitle("Уведомления")
         self.setMinimumWidth(ZoomManager.scaled(320))
         self.resize(ZoomManager.scaled(320), ZoomManager.scaled(400))
@@ -2206,7 +3093,19 @@ class NotificationDialog(DraggableDialog):
             parent.installEventFilter(self)
         
         # Регистрируем callback для обновления при изменении масштаба
-        ZoomManager.add_callback(self.update_ui_scale)
+        ZoomManager.add_callback(self._request_update_ui_scale)
+        
+    def _request_update_ui_scale(self):
+        """Запланировать обновление масштаба на следующую итерацию цикла событий"""
+        if self._zoom_pending:
+            return
+        self._zoom_pending = True
+        QTimer.singleShot(0, self._do_update_ui_scale)
+    
+    def _do_update_ui_scale(self):
+        """Выполнить отложенное обновление масштаба"""
+        self._zoom_pending = False
+        self.update_ui_scale()
         
     def _update_container_style(self):
         """Обновление стиля контейнера с учетом масштаба"""
@@ -2445,7 +3344,7 @@ class NotificationDialog(DraggableDialog):
         self._update_container_style()
         
         # Обновляем заголовок
-        if hasattr(self, 'title'):
+        if self.title is not None:
             self.title.setFont(ZoomManager.font("Segoe UI", 16, QFont.Bold))
         
         # Обновляем отступы заголовка
@@ -2463,12 +3362,12 @@ class NotificationDialog(DraggableDialog):
                     )
         
         # Обновляем кнопку закрытия
-        if hasattr(self, 'close_btn'):
+        if self.close_btn is not None:
             self.close_btn.setFixedSize(ZoomManager.scaled(30), ZoomManager.scaled(30))
             self._update_close_btn_style()
         
         # Обновляем отступы контента
-        if hasattr(self, 'content_layout'):
+        if self.content_layout is not None:
             self.content_layout.setSpacing(ZoomManager.scaled(10))
             self.content_layout.setContentsMargins(
                 ZoomManager.scaled(20), 
@@ -2502,7 +3401,7 @@ class NotificationDialog(DraggableDialog):
             t_date.setFont(QFont("Segoe UI", 8))
         
         # Обновляем кнопку очистки
-        if hasattr(self, 'clear_btn'):
+        if self.clear_btn is not None:
             self.clear_btn.setFont(ZoomManager.font("Segoe UI", 10))
             self._update_clear_btn_style()
         
@@ -2555,11 +3454,11 @@ class NotificationDialog(DraggableDialog):
         self.content_layout.addWidget(no_notifications_label)
         
         # Обновляем заголовок
-        if hasattr(self, 'title'):
+        if self.title is not None:
             self.title.setText("🔔 Уведомления")
         
         # Обновляем кнопку - меняем текст на "Закрыть" и меняем обработчик
-        if hasattr(self, 'clear_btn'):
+        if self.clear_btn is not None:
             self.clear_btn.setText("Закрыть")
             self.clear_btn.clicked.disconnect()
             self.clear_btn.clicked.connect(self.close)
@@ -2582,10 +3481,11 @@ class NotificationDialog(DraggableDialog):
     
     def eventFilter(self, obj, event):
         """Отслеживание перемещения главного окна для обновления позиции диалога"""
-        if obj == self.parent_window and event.type() == QEvent.Move:
+        et = event.type()
+        if et == _MOVE_TYPE and obj is self.parent_window:
             # Обновляем позицию диалога при перемещении главного окна
             self._update_position()
-        return super().eventFilter(obj, event)
+        return False
     
     def _update_position(self):
         """Обновление позиции диалога относительно кнопки уведомлений"""
@@ -2627,6 +3527,11 @@ class AboutDialog(DraggableDialog):
     
     def _setup_ui(self):
         """Настройка интерфейса"""
+        # Цвета темы, повторяющиеся в стилях, не меняются за время жизни диалога - читаем один раз
+        text_primary = THEME['text_primary']
+        text_secondary = THEME['text_secondary']
+        card_bg = THEME['card_bg']
+        
         # Увеличиваем отступы для тени
         main_layout = QVBoxLayout(self)
         main_layout.setContentsMargins(15, 15, 15, 15)
@@ -2662,7 +3567,7 @@ class AboutDialog(DraggableDialog):
         title_label = QLabel("ℹ️ О программе")
         title_label.setFont(QFont("Segoe UI", 16, QFont.Bold))
         title_label.setStyleSheet(f"""
-            color: {THEME['text_primary']};
+            color: {text_primary};
             background: transparent;
             border: none;
             outline: none;
@@ -2686,7 +3591,7 @@ class AboutDialog(DraggableDialog):
         project_frame.setFrameShape(QFrame.NoFrame)  # Убираем рамку
         project_frame.setStyleSheet(f"""
             QFrame {{
-                background-color: {THEME['card_bg']};
+                background-color: {card_bg};
                 border-radius: 12px;
                 border: none;
             }}
@@ -2697,13 +3602,13 @@ class AboutDialog(DraggableDialog):
         
         project_title = QLabel("😎 TaskMaster")
         project_title.setFont(QFont("Segoe UI", 18, QFont.Bold))
-        project_title.setStyleSheet(f"color: {THEME['text_primary']}; border: none; background: transparent;")
+        project_title.setStyleSheet(f"color: {text_primary}; border: none; background: transparent;")
         project_title.setTextInteractionFlags(Qt.NoTextInteraction)
         project_layout.addWidget(project_title)
         
         version_label = QLabel("Версия 1.0.2")
         version_label.setFont(QFont("Segoe UI", 11))
-        version_label.setStyleSheet(f"color: {THEME['text_secondary']}; border: none; background: transparent;")
+        version_label.setStyleSheet(f"color: {text_secondary}; border: none; background: transparent;")
         version_label.setTextInteractionFlags(Qt.NoTextInteraction)
         project_layout.addWidget(version_label)
         
@@ -2713,7 +3618,7 @@ class AboutDialog(DraggableDialog):
             "управления задачами."
         )
         desc_label.setFont(QFont("Segoe UI", 10))
-        desc_label.setStyleSheet(f"color: {THEME['text_secondary']}; border: none; background: transparent;")
+        desc_label.setStyleSheet(f"color: {text_secondary}; border: none; background: transparent;")
         desc_label.setWordWrap(True)
         desc_label.setTextInteractionFlags(Qt.NoTextInteraction)
         project_layout.addWidget(desc_label)
@@ -2726,7 +3631,7 @@ class AboutDialog(DraggableDialog):
         features_frame.setFrameShape(QFrame.NoFrame)  # Убираем рамку
         features_frame.setStyleSheet(f"""
             QFrame {{
-                background-color: {THEME['card_bg']};
+                background-color: {card_bg};
                 border-radius: 12px;
                 border: none;
             }}
@@ -2737,7 +3642,7 @@ class AboutDialog(DraggableDialog):
         
         features_title = QLabel("⭐ Основные возможности")
         features_title.setFont(QFont("Segoe UI", 14, QFont.Bold))
-        features_title.setStyleSheet(f"color: {THEME['text_primary']}; border: none; background: transparent;")
+        features_title.setStyleSheet(f"color: {text_primary}; border: none; background: transparent;")
         features_title.setTextInteractionFlags(Qt.NoTextInteraction)
         features_layout.addWidget(features_title)
         
@@ -2749,13 +3654,13 @@ class AboutDialog(DraggableDialog):
             "Автосохранение всех данных"
         ]
         
-        for feature_text in features_list:
-            feature_item = QLabel(f"• {feature_text}")
-            feature_item.setFont(QFont("Segoe UI", 10))
-            feature_item.setStyleSheet(f"color: {THEME['text_secondary']}; border: none; background: transparent; padding: 4px 0px;")
-            feature_item.setWordWrap(True)
-            feature_item.setTextInteractionFlags(Qt.NoTextInteraction)
-            features_layout.addWidget(feature_item)
+        # Один многострочный лейбл вместо отдельного QLabel на каждый пункт
+        features_body = QLabel("\n".join(f"• {feature_text}" for feature_text in features_list))
+        features_body.setFont(QFont("Segoe UI", 10))
+        features_body.setStyleSheet(f"color: {text_secondary}; border: none; background: transparent; padding: 4px 0px;")
+        features_body.setWordWrap(True)
+        features_body.setTextInteractionFlags(Qt.NoTextInteraction)
+        features_layout.addWidget(features_body)
         
         layout.addWidget(features_frame)
         layout.addStretch()
@@ -2812,6 +3717,12 @@ class TaskViewDialog(DraggableDialog):
     
     def _setup_ui(self):
         """Настройка интерфейса"""
+        # Цвета темы, повторяющиеся в стилях, не меняются за время жизни диалога - читаем один раз
+        text_primary = THEME['text_primary']
+        text_secondary = THEME['text_secondary']
+        card_bg = THEME['card_bg']
+        border_color = THEME['border_color']
+        
         # Увеличиваем отступы для тени
         main_layout = QVBoxLayout(self)
         main_layout.setContentsMargins(15, 15, 15, 15)
@@ -2847,7 +3758,7 @@ class TaskViewDialog(DraggableDialog):
         title_label = QLabel("📋 Описание задачи")
         title_label.setFont(QFont("Segoe UI", 14, QFont.Bold))
         title_label.setStyleSheet(f"""
-            color: {THEME['text_primary']};
+            color: {text_primary};
             background: transparent;
             border: none;
             outline: none;
@@ -2869,7 +3780,7 @@ class TaskViewDialog(DraggableDialog):
         info_frame = QFrame()
         info_frame.setStyleSheet(f"""
             QFrame {{
-                background-color: {THEME['card_bg']};
+                background-color: {card_bg};
                 border-radius: 12px;
                 border: none;
             }}
@@ -2881,7 +3792,7 @@ class TaskViewDialog(DraggableDialog):
         # Название задачи (без фона)
         task_title = QLabel(self.task.title)
         task_title.setFont(QFont("Segoe UI", 16, QFont.Bold))
-        task_title.setStyleSheet(f"color: {THEME['text_primary']}; background: transparent; border: none; outline: none;")
+        task_title.setStyleSheet(f"color: {text_primary}; background: transparent; border: none; outline: none;")
         task_title.setWordWrap(True)
         task_title.setTextInteractionFlags(Qt.NoTextInteraction)
         task_title.setFocusPolicy(Qt.NoFocus)
@@ -2901,7 +3812,7 @@ class TaskViewDialog(DraggableDialog):
         # Статус
         status_label = QLabel(f"📊 Статус: {self.task.status}")
         status_label.setFont(QFont("Segoe UI", 11))
-        status_label.setStyleSheet(f"color: {THEME['text_secondary']}; background: transparent; border: none; outline: none;")
+        status_label.setStyleSheet(f"color: {text_secondary}; background: transparent; border: none; outline: none;")
         status_label.setTextInteractionFlags(Qt.NoTextInteraction)
         status_label.setFocusPolicy(Qt.NoFocus)
         status_label.setAttribute(Qt.WA_TransparentForMouseEvents, False)
@@ -2915,14 +3826,14 @@ class TaskViewDialog(DraggableDialog):
                 
                 if task_date == today.addDays(1):
                     date_text = "Завтра"
-                    date_color = THEME['text_secondary']
+                    date_color = text_secondary
                 elif task_date < today:
                     date_text = f"Просрочено ({task_date.toString('dd.MM')})"
                     date_color = "#ff6b6b"  # Red
                 else:
                     # Показываем дату в формате dd.MM
                     date_text = task_date.toString("dd.MM")
-                    date_color = THEME['text_secondary']
+                    date_color = text_secondary
                 
                 due_date_label = QLabel(f"📅 Срок выполнения: {date_text}")
                 due_date_label.setFont(QFont("Segoe UI", 11))
@@ -2938,7 +3849,7 @@ class TaskViewDialog(DraggableDialog):
         if hasattr(self.task, 'tags') and self.task.tags:
             tags_label = QLabel("🏷️ Теги: " + ", ".join(self.task.tags))
             tags_label.setFont(QFont("Segoe UI", 10))
-            tags_label.setStyleSheet(f"color: {THEME['text_secondary']}; background: transparent; border: none; outline: none;")
+            tags_label.setStyleSheet(f"color: {text_secondary}; background: transparent; border: none; outline: none;")
             tags_label.setTextInteractionFlags(Qt.NoTextInteraction)
             tags_label.setFocusPolicy(Qt.NoFocus)
             tags_label.setAttribute(Qt.WA_TransparentForMouseEvents, False)
@@ -2958,9 +3869,9 @@ class TaskViewDialog(DraggableDialog):
             desc_text = QLabel(self.task.description)
             desc_text.setFont(QFont("Segoe UI", 10))
             desc_text.setStyleSheet(f"""
-                color: {THEME['text_primary']};
+                color: {text_primary};
                 background-color: {THEME['input_bg']};
-                border: 1px solid {THEME['border_color']};
+                border: 1px solid {border_color};
                 border-radius: 8px;
                 padding: 12px;
             """)
@@ -3001,10 +3912,10 @@ class TaskViewDialog(DraggableDialog):
         close_dialog_btn.setStyleSheet(f"""
             QPushButton {{
                 background-color: {THEME['secondary_bg']};
-                border: 1px solid {THEME['border_color']};
+                border: 1px solid {border_color};
                 border-radius: 8px;
                 padding: 10px 20px;
-                color: {THEME['text_primary']};
+                color: {text_primary};
             }}
             QPushButton:hover {{
                 background-color: {THEME['secondary_hover']};
@@ -3034,6 +3945,159 @@ class TaskViewDialog(DraggableDialog):
             self.parent_window.edit_task(self.task)
 
 
+# Тень карточки: готовый 9-slice пиксмап вместо QGraphicsDropShadowEffect
+# (эффект рендерит каждую карточку во внеэкранный буфер на каждой перерисовке)
+_CARD_SHADOW_BLUR = 6
+# Выход тени за края карточки (лево, верх, право, низ): тень рисует контейнер карточек
+# в промежутках между ними, сами карточки своих размеров не меняют
+_CARD_SHADOW_MARGINS = (3, 1, 3, 5)
+# Радиус скругления фона карточки (QFrame#taskCard в _TASK_CARD_QSS)
+_CARD_RADIUS = 10
+
+
+@lru_cache(maxsize=1)
+def _card_shadow_pix():
+    """Пиксмап мягкой тени с углами 2*blur, середина растягивается при отрисовке"""
+    blur = _CARD_SHADOW_BLUR
+    size = blur * 4 + 1
+    pix = QPixmap(size, size)
+    pix.fill(Qt.transparent)
+    painter = QPainter(pix)
+    painter.setRenderHint(QPainter.Antialiasing)
+    painter.setPen(Qt.NoPen)
+    # Концентрические скругленные прямоугольники с накоплением прозрачности
+    painter.setBrush(QColor(0, 0, 0, 30 // blur))
+    for i in range(blur):
+        inner = size - 2 * i
+        painter.drawRoundedRect(i, i, inner, inner, 10 + blur - i, 10 + blur - i)
+    painter.end()
+    return pix
+
+
+def _draw_card_shadow(painter, rect):
+    """Отрисовка тени по 9 фрагментам пиксмапа в прямоугольник rect"""
+    pix = _card_shadow_pix()
+    c = _CARD_SHADOW_BLUR * 2
+    src_mid = pix.width() - 2 * c
+    x, y, w, h = rect.x(), rect.y(), rect.width(), rect.height()
+    mid_w = max(0, w - 2 * c)
+    mid_h = max(0, h - 2 * c)
+    # (x, ширина) по горизонтали и (y, высота) по вертикали для приемника и источника
+    cols = ((x, c, 0, c), (x + c, mid_w, c, src_mid), (x + w - c, c, c + src_mid, c))
+    rows = ((y, c, 0, c), (y + c, mid_h, c, src_mid), (y + h - c, c, c + src_mid, c))
+    for dy, dh, sy, sh in rows:
+        for dx, dw, sx, sw in cols:
+            if dw > 0 and dh > 0:
+                painter.drawPixmap(QRect(dx, dy, dw, dh), pix, QRect(sx, sy, sw, sh))
+
+
+def _paint_card_shadows(widget, event):
+    """Тени карточек-потомков widget, нарисованные в самом widget вокруг карточек.
+    Области карточек вырезаются из отрисовки: фон карточек полупрозрачный,
+    и тень под ним (своя или соседней карточки) затемняла бы его"""
+    m_left, m_top, m_right, m_bottom = _CARD_SHADOW_MARGINS
+    dirty = event.rect()
+    shadows = []
+    cut = QPainterPath()
+    for child in widget.children():
+        if isinstance(child, TaskCard) and child.isVisible():
+            geo = child.geometry()
+            shadow_rect = geo.adjusted(-m_left, -m_top, m_right, m_bottom)
+            if shadow_rect.intersects(dirty):
+                shadows.append(shadow_rect)
+            cut.addRoundedRect(QRectF(geo), _CARD_RADIUS, _CARD_RADIUS)
+    if not shadows:
+        return
+    clip = QPainterPath()
+    clip.addRect(QRectF(widget.rect()))
+    painter = QPainter(widget)
+    painter.setClipPath(clip.subtracted(cut))
+    for shadow_rect in shadows:
+        _draw_card_shadow(painter, shadow_rect)
+    painter.end()
+
+
+class CardListWidget(QWidget):
+    """Контейнер карточек задач: рисует их тени (см. _paint_card_shadows)"""
+    
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        _paint_card_shadows(self, event)
+
+
+# Общие для всех карточек объекты Qt (создаются после QApplication, при первом обращении)
+@lru_cache(maxsize=1)
+def _pointing_cursor():
+    """Курсор-указатель для кликабельных элементов карточек"""
+    return QCursor(Qt.PointingHandCursor)
+
+
+@lru_cache(maxsize=16)
+def _square_size(side):
+    """QSize(side, side) - переиспользуется между карточками при одном масштабе"""
+    return QSize(side, side)
+
+
+@lru_cache(maxsize=4096)
+def _fmt_time(seconds):
+    """Форматирование времени таймера в ЧЧ:ММ:СС (ММ:СС до часа), общее для всех карточек"""
+    if seconds < 3600:
+        return f"{seconds // 60:02d}:{seconds % 60:02d}"
+    m, s = divmod(seconds, 60)
+    h, m = divmod(m, 60)
+    return f"{h}:{m:02d}:{s:02d}"
+
+
+class PriorityCheckbox(QAbstractButton):
+    """Круглый чекбокс выполнения задачи, рисуемый вручную (без таблицы стилей)"""
+    
+    def __init__(self, priority, parent=None):
+        super().__init__(parent)
+        self.priority = priority
+        self.setCheckable(True)
+        self.setCursor(_pointing_cursor())
+    
+    def enterEvent(self, event):
+        self.update()
+        super().enterEvent(event)
+    
+    def leaveEvent(self, event):
+        self.update()
+        super().leaveEvent(event)
+    
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.Antialiasing)
+        
+        check_color = QColor(_CHECK_COLORS.get(self.priority, "#6bcf7f"))
+        side = min(self.width(), self.height())
+        border = max(1.0, side / 12.0)
+        half = border / 2.0
+        circle = QRectF(half, half, side - border, side - border)
+        
+        # Заливка: выполнено - цвет приоритета, наведение - он же полупрозрачный
+        if self.isChecked():
+            painter.setBrush(check_color)
+        elif self.underMouse():
+            hover_color = QColor(check_color)
+            hover_color.setAlpha(0x40)
+            painter.setBrush(hover_color)
+        else:
+            painter.setBrush(Qt.NoBrush)
+        painter.setPen(QPen(check_color, border))
+        painter.drawEllipse(circle)
+        
+        # Галочка
+        if self.isChecked():
+            painter.setPen(QPen(QColor(255, 255, 255), max(1.5, side / 10.0), Qt.SolidLine, Qt.RoundCap, Qt.RoundJoin))
+            painter.drawPolyline([
+                QPointF(side * 0.30, side * 0.52),
+                QPointF(side * 0.44, side * 0.66),
+                QPointF(side * 0.70, side * 0.36),
+            ])
+        painter.end()
+
+
 class TaskCard(QFrame):
     """Карточка задачи с современным дизайном"""
     
@@ -3047,56 +4111,60 @@ class TaskCard(QFrame):
         self.repeat_label = None
         self.priority_label = None
         self.date_label = None
+        self.tags_label = None
+        self.completion_label = None
+        
+        # Панель таймера (создается лениво)
+        self.timer_controls_container = None
+        self.time_label = None
+        self.play_btn = None
+        self.reset_btn = None
         
         # Drag & Drop
         self.drag_start_position = None
+        self._active_drag = None  # Выполняющийся drag (запускается только один)
+        
+        # Масштаб, под который уже подогнаны размеры и шрифты карточки
+        self._applied_scale = None
         
         self._setup_ui()
         
+    _set_style_state = staticmethod(_set_style_state)
+        
     def _setup_ui(self):
         """Настройка интерфейса карточки"""
         self.setObjectName("taskCard")
-        self.setCursor(QCursor(Qt.PointingHandCursor))
+        self.setCursor(_pointing_cursor())
         
         # Основной layout - компактнее
         layout = QHBoxLayout(self)
         layout.setContentsMargins(10, 8, 10, 8)
         layout.setSpacing(8)
         
+        # Масштабированные размеры считаем один раз на карточку
+        scaled = ZoomManager.scaled
+        s1, s3, s20, s24, s28, s30, s32 = (scaled(v) for v in (1, 3, 20, 24, 28, 30, 32))
+        
         # Индикатор приоритета - меньше
-        priority_indicator = QFrame()
-        priority_indicator.setFixedSize(ZoomManager.scaled(3), ZoomManager.scaled(28))
-        priority_color = PRIORITY_COLORS.get(self.task.priority, "#6bcf7f")
-        priority_indicator.setStyleSheet(f"""
-            background-color: {priority_color};
-            border-radius: 2px;
-        """)
-        layout.addWidget(priority_indicator)
+        # (готовый пиксмап из кэша вместо QFrame со своим стилем)
+        self.priority_indicator = QLabel()
+        self.priority_indicator.setFixedSize(s3, s28)
+        layout.addWidget(self.priority_indicator)
         
         # Контент задачи
         content_layout = QVBoxLayout()
         content_layout.setSpacing(2)
         
         # Заголовок - компактнее
+        # (индикатор повторения добавляется в начало ряда при привязке задачи, если нужен)
         title_layout = QHBoxLayout()
         title_layout.setSpacing(6)
+        self.title_layout = title_layout
         
-        # Индикатор повторения
-        if self.task.repeat_type:
-            repeat_icons = {"daily": "🔄", "weekly": "📅", "monthly": "📆"}
-            repeat_icon = repeat_icons.get(self.task.repeat_type, "🔄")
-            self.repeat_label = QLabel(repeat_icon)
-            self.repeat_label.setFont(QFont("Segoe UI", 9))
-            repeat_tooltips = {"daily": "Повторяется ежедневно", "weekly": "Повторяется еженедельно", "monthly": "Повторяется ежемесячно"}
-            self.repeat_label.setToolTip(repeat_tooltips.get(self.task.repeat_type, "Повторяющаяся задача"))
-            self.repeat_label.setTextInteractionFlags(Qt.NoTextInteraction)
-            title_layout.addWidget(self.repeat_label)
-        
-        title_label = QLabel(self.task.title)
+        title_label = QLabel()
         title_label.setFont(QFont("Segoe UI", 10, QFont.Medium))
-        title_label.setStyleSheet(f"color: {THEME['text_primary']};")
-        if self.task.status == "Выполнено":
-            title_label.setStyleSheet(f"color: {THEME['text_tertiary']}; text-decoration: line-through;")
+        title_label.setObjectName("taskTitle")
+        title_label.setProperty("done", self.task.status == "Выполнено")
         title_label.setTextInteractionFlags(Qt.NoTextInteraction)
         title_label.setWordWrap(True)  # Включаем перенос текста
         title_label.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Preferred)  # Адаптивное масштабирование
@@ -3109,32 +4177,18 @@ class TaskCard(QFrame):
         info_layout = QHBoxLayout()
         info_layout.setSpacing(6)
         
-        self.priority_label = QLabel(f"{PRIORITY_NAMES[self.task.priority]}")
+        self.priority_label = QLabel()
         self.priority_label.setFont(QFont("Segoe UI", 8))
-        self.priority_label.setStyleSheet(f"color: {priority_color};")
+        self.priority_label.setObjectName("taskPriority")
+        self.priority_label.setProperty("priority", self.task.priority)
         self.priority_label.setTextInteractionFlags(Qt.NoTextInteraction)
         info_layout.addWidget(self.priority_label)
         
         # Индикатор даты убран из карточки - теперь показывается только в диалоге описания
+        # Теги и дата выполнения добавляются при привязке задачи, если нужны
         
-        # Теги (если есть)
-        if hasattr(self.task, 'tags') and self.task.tags:
-            tags_text = " ".join([f"🏷️ {tag}" for tag in self.task.tags])
-            tags_label = QLabel(tags_text)
-            tags_label.setFont(QFont("Segoe UI", 9))
-            tags_label.setStyleSheet(f"color: {THEME['text_tertiary']};")
-            tags_label.setTextInteractionFlags(Qt.NoTextInteraction)
-            info_layout.addWidget(tags_label)
-        
-        # Дата выполнения (для архива)
-        if self.task.status == "Выполнено" and self.task.completion_date:
-            comp_date_label = QLabel(f"✅ {self.task.completion_date}")
-            comp_date_label.setFont(QFont("Segoe UI", 8))
-            comp_date_label.setStyleSheet(f"color: {THEME['text_tertiary']};")
-            comp_date_label.setTextInteractionFlags(Qt.NoTextInteraction)
-            info_layout.addWidget(comp_date_label)
-            
         info_layout.addStretch()
+        self.info_layout = info_layout
         content_layout.addLayout(info_layout)
         
         layout.addLayout(content_layout, 1)
@@ -3143,261 +4197,255 @@ class TaskCard(QFrame):
         actions_layout = QHBoxLayout()
         actions_layout.setSpacing(4)
         
-        # Контейнер для элементов таймера
-        self.timer_controls_container = QWidget()
-        timer_controls_layout = QHBoxLayout(self.timer_controls_container)
-        timer_controls_layout.setContentsMargins(0, 0, 0, 0)
-        timer_controls_layout.setSpacing(4)
+        # Панель таймера (время, play, сброс) создается при первом открытии - см. _build_timer_controls
+        self.actions_layout = actions_layout
         
-        # Таймер и кнопка Play
-        self.time_label = QLabel(self._format_time(self.task.time_spent))
-        self.time_label.setFont(ZoomManager.font("Consolas", 10)) # Моноширинный шрифт для цифр
-        self.time_label.setStyleSheet(f"color: {THEME['text_secondary']}; margin-right: 5px;")
-        
-        self.play_btn = QPushButton()
-        self.play_btn.setFixedSize(ZoomManager.scaled(28), ZoomManager.scaled(28))
-        self.play_btn.setText("⏯️" if self.task.is_running else "▶️")  # ⏯️ для паузы, ▶️ для play
-        self.play_btn.setToolTip("Пауза" if self.task.is_running else "Запустить")
-        self.play_btn.setCursor(QCursor(Qt.PointingHandCursor))
-        self.play_btn.setAttribute(Qt.WA_TransparentForMouseEvents, False)  # Предотвращаем проброс событий
-        self.play_btn.setStyleSheet(f"""
-            QPushButton {{
-                background-color: transparent;
-                border: 1px solid {THEME['border_color']};
-                color: {THEME['accent_text'] if self.task.is_running else THEME['text_secondary']};
-                font-size: {ZoomManager.scaled(14)}px;
-                border-radius: {ZoomManager.scaled(14)}px;
-            }}
-            QPushButton:hover {{
-                background-color: {THEME['secondary_hover']};
-                color: {THEME['accent_text']};
-            }}
-        """)
-        self.play_btn.clicked.connect(self._toggle_timer)
-        
-        timer_controls_layout.addWidget(self.time_label)
-        timer_controls_layout.addWidget(self.play_btn)
-        
-        # Кнопка сброса таймера
-        reset_btn = QPushButton("🔄")  # Круговая стрелка
-        reset_btn.setFixedSize(ZoomManager.scaled(28), ZoomManager.scaled(28))
-        reset_btn.setToolTip("Сбросить таймер")
-        reset_btn.setCursor(QCursor(Qt.PointingHandCursor))
-        reset_btn.setAttribute(Qt.WA_TransparentForMouseEvents, False)  # Предотвращаем проброс событий
-        reset_btn.setStyleSheet(f"""
-            QPushButton {{
-                background-color: transparent;
-                border: 1px solid {THEME['border_color']};
-                color: {THEME['text_secondary']};
-                font-size: 16px;
-                border-radius: 14px;
-                padding-bottom: 2px;
-            }}
-            QPushButton:hover {{
-                background-color: {THEME['secondary_hover']};
-                color: {THEME['text_primary']};
-            }}
-        """)
-        reset_btn.clicked.connect(self._reset_timer)
-        timer_controls_layout.addWidget(reset_btn)
-        
-        # Скрываем контейнер по умолчанию
-        self.timer_controls_container.setVisible(False)
-        actions_layout.addWidget(self.timer_controls_container)
-        
-        # Кнопка-переключатель таймера
-        self.toggle_timer_btn = QPushButton()
-        timer_icon = create_timer_icon()
-        if not timer_icon.isNull():
-            # Используем иконку из файла
-            self.toggle_timer_btn.setIcon(timer_icon)
-            self.toggle_timer_btn.setIconSize(QSize(ZoomManager.scaled(30), ZoomManager.scaled(30)))  # Почти размер кнопки 32x32
-        else:
-            # Fallback на эмодзи, если иконка не найдена
-            self.toggle_timer_btn.setText("⏱️")
-        self.toggle_timer_btn.setFixedSize(ZoomManager.scaled(32), ZoomManager.scaled(32))
-        self.toggle_timer_btn.setCursor(QCursor(Qt.PointingHandCursor))
-        self.toggle_timer_btn.setStyleSheet(f"""
-            QPushButton {{
-                background-color: transparent;
-                border: 1px solid {THEME['border_color']};
-                border-radius: {ZoomManager.scaled(16)}px;
-            }}
-            QPushButton:hover {{
-                background-color: {THEME['secondary_hover']};
-            }}
-        """)
-        self.toggle_timer_btn.clicked.connect(self._toggle_timer_controls)
-        actions_layout.addWidget(self.toggle_timer_btn)
+        # Кнопка-переключатель таймера
+        self.toggle_timer_btn = QPushButton()
+        icon_size = s30  # Почти размер кнопки 32x32
+        timer_icon = _get_timer_icon(icon_size)
+        if not timer_icon.isNull():
+            # Используем иконку из файла
+            self.toggle_timer_btn.setIcon(timer_icon)
+            self.toggle_timer_btn.setIconSize(_square_size(icon_size))
+        else:
+            # Fallback на эмодзи, если иконка не найдена
+            self.toggle_timer_btn.setText("⏱️")
+        self.toggle_timer_btn.setFixedSize(s32, s32)
+        self.toggle_timer_btn.setCursor(_pointing_cursor())
+        self.toggle_timer_btn.setObjectName("taskTimerToggle")
+        self.toggle_timer_btn.setProperty("open", False)
+        self.toggle_timer_btn.clicked.connect(self._toggle_timer_controls)
+        actions_layout.addWidget(self.toggle_timer_btn)
         
         # Разделитель
         self.timer_separator = QFrame()
         self.timer_separator.setFrameShape(QFrame.VLine)
         self.timer_separator.setFrameShadow(QFrame.Sunken)
-        self.timer_separator.setFixedWidth(ZoomManager.scaled(1))
-        self.timer_separator.setFixedHeight(ZoomManager.scaled(20))
-        self.timer_separator.setStyleSheet(f"background-color: {THEME['border_color']}; border: none;")
+        self.timer_separator.setFixedWidth(s1)
+        self.timer_separator.setFixedHeight(s20)
+        self.timer_separator.setObjectName("taskSeparator")
         actions_layout.addWidget(self.timer_separator)
         
         # Чекбокс выполнения
-        self.checkbox = QPushButton("✓" if self.task.status == "Выполнено" else "")
-        self.checkbox.setFixedSize(ZoomManager.scaled(24), ZoomManager.scaled(24))
-        self.checkbox.setCheckable(True)
-        self.checkbox.setChecked(self.task.status == "Выполнено")
-        self.checkbox.setCursor(QCursor(Qt.PointingHandCursor))
-        
-        # Определение цвета чекбокса
-        check_color = "#6bcf7f"
-        if self.task.priority == "high":
-            check_color = "#ff6b6b"
-        elif self.task.priority == "medium":
-            check_color = "#ffd93d"
-            
-        self.checkbox.setStyleSheet(f"""
-            QPushButton {{
-                background-color: {'#6bcf7f' if self.task.status == 'Выполнено' else 'transparent'};
-                border: {ZoomManager.scaled(2)}px solid {check_color};
-                border-radius: {ZoomManager.scaled(12)}px;
-                color: #ffffff;
-                font-weight: bold;
-                font-size: {ZoomManager.scaled(14)}px;
-            }}
-            QPushButton:hover {{
-                background-color: {check_color}40;
-            }}
-            QPushButton:checked {{
-                background-color: {check_color};
-                border: {ZoomManager.scaled(2)}px solid {check_color};
-            }}
-        """)
+        self.checkbox = PriorityCheckbox(self.task.priority)
+        self.checkbox.setFixedSize(s24, s24)
         self.checkbox.clicked.connect(self._on_checked)
         actions_layout.addWidget(self.checkbox)
         
         # Кнопка удаления
-        delete_btn = QPushButton("🗑️")
-        delete_btn.setFixedSize(ZoomManager.scaled(30), ZoomManager.scaled(30))
-        delete_btn.setCursor(QCursor(Qt.PointingHandCursor))
-        delete_btn.setStyleSheet(f"""
-            QPushButton {{
-                background-color: rgba(255, 107, 107, 0.3);
-                border: none;
-                border-radius: {ZoomManager.scaled(14)}px;
-                color: #ff6b6b;
-                font-size: {ZoomManager.scaled(16)}px;
-                font-weight: bold;
-            }}
-            QPushButton:hover {{
-                background-color: rgba(255, 107, 107, 0.5);
-            }}
-        """)
-        delete_btn.clicked.connect(self._delete_task)
-        actions_layout.addWidget(delete_btn)
+        self.delete_btn = QPushButton("🗑️")
+        self.delete_btn.setFixedSize(s30, s30)
+        self.delete_btn.setCursor(_pointing_cursor())
+        self.delete_btn.setObjectName("taskDeleteBtn")
+        self.delete_btn.clicked.connect(partial(self._dispatch, "delete_task"))
+        actions_layout.addWidget(self.delete_btn)
         
         layout.addLayout(actions_layout)
         
-        # Стили карточки
-        self.setStyleSheet(f"""
-            QFrame#taskCard {{
-                background-color: {THEME['card_bg']};
-                border-radius: 10px;
-                border: 1px solid {THEME['border_color']};
-            }}
-            QFrame#taskCard:hover {{
-                background-color: {THEME['card_bg_hover']};
-            }}
-        """)
+        # Стили карточки и ее элементов задаются глобальной таблицей стилей (_task_card_style)
         
         # Адаптивное масштабирование карточки
         self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Minimum)
         
-        # Тень
-        shadow = QGraphicsDropShadowEffect()
-        shadow.setBlurRadius(20)
-        shadow.setColor(QColor(0, 0, 0, 60))
-        shadow.setOffset(0, 4)
-        self.setGraphicsEffect(shadow)
+        # Тень рисует контейнер карточек (CardListWidget) из готового пиксмапа
         
-        # Применяем текущий масштаб
+        # Данные задачи и текущий масштаб
+        self._bind_task()
         self.update_ui_scale()
     
-    def mousePressEvent(self, event):
-        """Открытие окна просмотра при клике"""
-        if event.button() == Qt.LeftButton:
-            # Открываем окно просмотра
-            dialog = TaskViewDialog(self.task, self.parent_window)
-            dialog.exec()
-            event.accept()
+    def _update_priority_pix(self):
+        """Пиксмап индикатора приоритета под текущие приоритет задачи и размер индикатора"""
+        indicator_size = self.priority_indicator.size()
+        priority_color = PRIORITY_COLORS.get(self.task.priority, "#6bcf7f")
+        self.priority_indicator.setPixmap(
+            _priority_pix(priority_color, indicator_size.width(), indicator_size.height()))
+    
+    def _meta_label(self, point_size, after):
+        """Лейбл мета-информации (теги, дата выполнения) в ряду приоритета сразу за after"""
+        label = QLabel()
+        label.setFont(ZoomManager.font("Segoe UI", point_size))
+        label.setObjectName("taskMeta")
+        label.setTextInteractionFlags(Qt.NoTextInteraction)
+        # Место в ряду не зависит от того, какой лейбл понадобился первым:
+        # теги всегда сразу за приоритетом, дата выполнения - за тегами
+        self.info_layout.insertWidget(self.info_layout.indexOf(after) + 1, label)
+        return label
+    
+    @staticmethod
+    def _bind_key(task):
+        """Поля задачи, которые показывает карточка (см. _bind_task)"""
+        return (task.title, task.status, task.priority, task.repeat_type,
+                tuple(task.tags) if task.tags else (), task.completion_date)
+    
+    def _bind_task(self):
+        """Заполнение элементов карточки данными self.task (без пересоздания виджетов)"""
+        task = self.task
+        is_done = task.status == "Выполнено"
+        self._bound_key = self._bind_key(task)
+        
+        self._update_priority_pix()
+        
+        # Индикатор повторения
+        if task.repeat_type:
+            if self.repeat_label is None:
+                self.repeat_label = QLabel()
+                self.repeat_label.setFont(ZoomManager.font("Segoe UI", 9))
+                self.repeat_label.setTextInteractionFlags(Qt.NoTextInteraction)
+                self.title_layout.insertWidget(0, self.repeat_label)
+            repeat_icons = {"daily": "🔄", "weekly": "📅", "monthly": "📆"}
+            repeat_tooltips = {"daily": "Повторяется ежедневно", "weekly": "Повторяется еженедельно", "monthly": "Повторяется ежемесячно"}
+            self.repeat_label.setText(repeat_icons.get(task.repeat_type, "🔄"))
+            self.repeat_label.setToolTip(repeat_tooltips.get(task.repeat_type, "Повторяющаяся задача"))
+            self.repeat_label.show()
+        elif self.repeat_label is not None:
+            self.repeat_label.hide()
+        
+        self.title_label.setText(task.title)
+        self._set_style_state(self.title_label, "done", is_done)
+        
+        self.priority_label.setText(PRIORITY_NAMES[task.priority])
+        self._set_style_state(self.priority_label, "priority", task.priority)
+        
+        # Теги (если есть)
+        if hasattr(task, 'tags') and task.tags:
+            if self.tags_label is None:
+                self.tags_label = self._meta_label(9, self.priority_label)
+            self.tags_label.setText(" ".join([f"🏷️ {tag}" for tag in task.tags]))
+            self.tags_label.show()
+        elif self.tags_label is not None:
+            self.tags_label.hide()
+        
+        # Дата выполнения (для архива)
+        if is_done and task.completion_date:
+            if self.completion_label is None:
+                self.completion_label = self._meta_label(8, self.tags_label or self.priority_label)
+            self.completion_label.setText(f"✅ {task.completion_date}")
+            self.completion_label.show()
+        elif self.completion_label is not None:
+            self.completion_label.hide()
+        
+        self.checkbox.priority = task.priority
+        self.checkbox.setChecked(is_done)
+        self.checkbox.update()
+    
+    def rebind(self, task):
+        """Показать в карточке другую задачу, переиспользуя уже созданные виджеты"""
+        # Открытая панель таймера относится к прежней задаче - сворачиваем, как у новой карточки
+        if (task.id != self.task.id and self.timer_controls_container is not None
+                and self.timer_controls_container.isVisible()):
+            self._toggle_timer_controls()
+        # Та же задача без изменений видимых полей - виджеты уже показывают ее данные
+        if task is not self.task or self._bind_key(task) != self._bound_key:
+            self.task = task
+            self._bind_task()
+        if self.timer_controls_container is not None:
+            self.update_time_display(task.time_spent)
+            self.update_timer_state(task.is_running)
+        self.update_ui_scale()
+    
+    def _update_shadow_area(self, rect):
+        """Перерисовать у контейнера область тени вокруг rect (тень выходит за края карточки)"""
+        parent = self.parentWidget()
+        if parent is not None:
+            m_left, m_top, m_right, m_bottom = _CARD_SHADOW_MARGINS
+            parent.update(rect.adjusted(-m_left, -m_top, m_right, m_bottom))
+    
+    def moveEvent(self, event):
+        self._update_shadow_area(QRect(event.oldPos(), self.size()))
+        self._update_shadow_area(self.geometry())
+        super().moveEvent(event)
+    
+    def resizeEvent(self, event):
+        self._update_shadow_area(QRect(self.pos(), event.oldSize()))
+        self._update_shadow_area(self.geometry())
+        super().resizeEvent(event)
+    
+    def showEvent(self, event):
+        self._update_shadow_area(self.geometry())
+        super().showEvent(event)
+    
+    def hideEvent(self, event):
+        self._update_shadow_area(self.geometry())
+        super().hideEvent(event)
     
-    def _toggle_timer(self):
-        """Переключение таймера"""
-        self.parent_window.toggle_task_timer(self.task.id)
+    def _dispatch(self, action, *_signal_args):
+        """Передать действие над задачей главному окну (action - имя метода окна)"""
+        if self.parent_window:
+            getattr(self.parent_window, action)(self.task.id)
 
     def update_time_display(self, seconds):
         """Обновление отображения времени"""
-        self.time_label.setText(self._format_time(seconds))
+        if self.time_label is None:
+            return  # Панель еще не создана - время возьмется из задачи при создании
+        text = _fmt_time(seconds)
+        if text != self.time_label.text():
+            self.time_label.setText(text)
     
     def update_timer_state(self, is_running):
         """Обновление состояния кнопки таймера"""
+        if self.play_btn is None:
+            return
         self.play_btn.setText("⏯️" if is_running else "▶️")
         self.play_btn.setToolTip("Пауза" if is_running else "Запустить")
+        self._set_style_state(self.play_btn, "running", bool(is_running))
         
     def _format_time(self, seconds):
         """Форматирование времени в ЧЧ:ММ:СС"""
-        m, s = divmod(seconds, 60)
-        h, m = divmod(m, 60)
-        if h > 0:
-            return f"{h}:{m:02d}:{s:02d}"
-        else:
-            return f"{m:02d}:{s:02d}"
+        return _fmt_time(seconds)
 
-    def _reset_timer(self):
-        """Сброс таймера"""
-        if self.parent_window:
-            self.parent_window.reset_task_timer(self.task.id)
-    
+    def _build_timer_controls(self):
+        """Создание панели таймера (по требованию, большинство карточек ее не открывает)"""
+        s28 = ZoomManager.scaled(28)
+        
+        # Контейнер для элементов таймера
+        self.timer_controls_container = QWidget()
+        timer_controls_layout = QHBoxLayout(self.timer_controls_container)
+        timer_controls_layout.setContentsMargins(0, 0, 0, 0)
+        timer_controls_layout.setSpacing(4)
+        
+        # Таймер и кнопка Play
+        self.time_label = QLabel(self._format_time(self.task.time_spent))
+        self.time_label.setFont(ZoomManager.font("Consolas", 10)) # Моноширинный шрифт для цифр
+        self.time_label.setObjectName("taskTime")
+        
+        self.play_btn = QPushButton()
+        self.play_btn.setFixedSize(s28, s28)
+        self.play_btn.setText("⏯️" if self.task.is_running else "▶️")  # ⏯️ для паузы, ▶️ для play
+        self.play_btn.setToolTip("Пауза" if self.task.is_running else "Запустить")
+        self.play_btn.setCursor(_pointing_cursor())
+        self.play_btn.setAttribute(Qt.WA_TransparentForMouseEvents, False)  # Предотвращаем проброс событий
+        self.play_btn.setObjectName("taskPlayBtn")
+        self.play_btn.setProperty("running", bool(self.task.is_running))
+        self.play_btn.clicked.connect(partial(self._dispatch, "toggle_task_timer"))
+        
+        timer_controls_layout.addWidget(self.time_label)
+        timer_controls_layout.addWidget(self.play_btn)
+        
+        # Кнопка сброса таймера
+        self.reset_btn = QPushButton("🔄")  # Круговая стрелка
+        self.reset_btn.setFixedSize(s28, s28)
+        self.reset_btn.setToolTip("Сбросить таймер")
+        self.reset_btn.setCursor(_pointing_cursor())
+        self.reset_btn.setAttribute(Qt.WA_TransparentForMouseEvents, False)  # Предотвращаем проброс событий
+        self.reset_btn.setObjectName("taskResetBtn")
+        self.reset_btn.clicked.connect(partial(self._dispatch, "reset_task_timer"))
+        timer_controls_layout.addWidget(self.reset_btn)
+        
+        # Панель стоит первой в ряду кнопок, перед переключателем таймера
+        self.actions_layout.insertWidget(0, self.timer_controls_container)
+        
     def _toggle_timer_controls(self):
         """Переключение видимости панели таймера"""
+        if self.timer_controls_container is None:
+            self._build_timer_controls()
         is_visible = self.timer_controls_container.isVisible()
         self.timer_controls_container.setVisible(not is_visible)
         
         # Обновляем стиль кнопки
-        if not is_visible:
-            self.toggle_timer_btn.setStyleSheet(f"""
-                QPushButton {{
-                    background-color: {THEME['accent_bg']};
-                    border: 1px solid {THEME['accent_hover']};
-                    border-radius: 16px;
-                }}
-            """)
-        else:
-            self.toggle_timer_btn.setStyleSheet(f"""
-                QPushButton {{
-                    background-color: transparent;
-                    border: 1px solid {THEME['border_color']};
-                    border-radius: 16px;
-                }}
-                QPushButton:hover {{
-                    background-color: {THEME['secondary_hover']};
-                }}
-            """)
+        self._set_style_state(self.toggle_timer_btn, "open", not is_visible)
 
 
-    def _edit_task(self):
-        """Открыть диалог редактирования"""
-        if self.parent_window:
-            self.parent_window.edit_task(self.task)
-    
-    def _toggle_complete(self):
-        """Переключение статуса выполнения"""
-        if self.parent_window:
-            self.parent_window.toggle_task_status(self.task.id)
-    
-    
-    def _delete_task(self):
-        """Удаление задачи"""
-        if self.parent_window:
-            self.parent_window.delete_task(self.task.id)
-
     def _on_checked(self, checked):
         """Обработка клика по checkbox задачи"""
         # Update styling immediately for responsiveness
@@ -3414,106 +4462,68 @@ class TaskCard(QFrame):
     def _update_style(self):
         """Обновление стилей карточки"""
         # Обновляем стиль чекбокса
-        check_color = "#6bcf7f"
-        if self.task.priority == "high":
-            check_color = "#ff6b6b"
-        elif self.task.priority == "medium":
-                check_color = "#ffd93d"
-        
+        # (чекбокс рисуется сам - достаточно перерисовки)
         is_checked = self.checkbox.isChecked()
+        self.checkbox.update()
         
-        self.checkbox.setStyleSheet(f"""
-            QPushButton {{
-                background-color: {'#6bcf7f' if is_checked else 'transparent'};
-                border: 2px solid {check_color};
-                border-radius: 12px;
-                color: #ffffff;
-                font-weight: bold;
-                font-size: 14px;
-            }}
-            QPushButton:hover {{
-                background-color: {check_color}40;
-            }}
-            QPushButton:checked {{
-                background-color: #6bcf7f;
-                border: 2px solid #6bcf7f;
-            }}
-        """)
-        
-        # Зачеркивание текста
-        title_color = THEME['text_tertiary'] if is_checked else THEME['text_primary']
-        text_decoration = "line-through" if is_checked else "none"
-        
-        # Обновляем заголовок напрямую
-        if hasattr(self, 'title_label'):
-            self.title_label.setStyleSheet(f"color: {title_color}; text-decoration: {text_decoration};")
+        # Зачеркивание текста - обновляем заголовок напрямую
+        self._set_style_state(self.title_label, "done", is_checked)
 
     def update_ui_scale(self):
         """Обновление интерфейса при изменении масштаба"""
-        # Обновляем размеры кнопок
-        if hasattr(self, 'play_btn'):
-            self.play_btn.setFixedSize(ZoomManager.scaled(28), ZoomManager.scaled(28))
-            self.play_btn.setStyleSheet(f"""
-                QPushButton {{
-                    background-color: transparent;
-                    border: 1px solid {THEME['border_color']};
-                    color: {THEME['accent_text'] if self.task.is_running else THEME['text_secondary']};
-                    font-size: {ZoomManager.scaled(14)}px;
-                    border-radius: {ZoomManager.scaled(14)}px;
-                }}
-                QPushButton:hover {{
-                    background-color: {THEME['secondary_hover']};
-                    color: {THEME['accent_text']};
-                }}
-            """)
-        
-        if hasattr(self, 'toggle_timer_btn'):
-            self.toggle_timer_btn.setFixedSize(ZoomManager.scaled(32), ZoomManager.scaled(32))
-            self.toggle_timer_btn.setIconSize(QSize(ZoomManager.scaled(30), ZoomManager.scaled(30)))
-            self.toggle_timer_btn.setStyleSheet(f"""
-                QPushButton {{
-                    background-color: transparent;
-                    border: 1px solid {THEME['border_color']};
-                    border-radius: {ZoomManager.scaled(16)}px;
-                }}
-                QPushButton:hover {{
-                    background-color: {THEME['secondary_hover']};
-                }}
-            """)
+        # Цвета карточки задаются глобальной таблицей стилей, здесь зависят от масштаба только размеры
+        scale = ZoomManager.get_scale()
+        if scale == self._applied_scale:
+            return
+        self._applied_scale = scale
         
-        if hasattr(self, 'checkbox'):
-            self.checkbox.setFixedSize(ZoomManager.scaled(24), ZoomManager.scaled(24))
-            check_color = "#6bcf7f"
-            if self.task.priority == "high":
-                check_color = "#ff6b6b"
-            elif self.task.priority == "medium":
-                check_color = "#ffd93d"
-            self.checkbox.setStyleSheet(f"""
-                QPushButton {{
-                    background-color: {'#6bcf7f' if self.task.status == 'Выполнено' else 'transparent'};
-                    border: {ZoomManager.scaled(2)}px solid {check_color};
-                    border-radius: {ZoomManager.scaled(12)}px;
-                    color: #ffffff;
-                    font-weight: bold;
-                    font-size: {ZoomManager.scaled(14)}px;
-                }}
-                QPushButton:hover {{
-                    background-color: {check_color}40;
-                }}
-                QPushButton:checked {{
-                    background-color: {check_color};
-                    border: {ZoomManager.scaled(2)}px solid {check_color};
-                }}
-            """)
+        # Размеры и шрифты меняем пачкой: без перерисовки между отдельными вызовами
+        # и с одним пересчетом геометрии карточки в конце
+        batch = self.updatesEnabled()
+        if batch:
+            self.setUpdatesEnabled(False)
+        try:
+            self._apply_ui_scale()
+        finally:
+            if batch:
+                self.setUpdatesEnabled(True)
+        self.updateGeometry()
+    
+    def _apply_ui_scale(self):
+        """Размеры кнопок и шрифты карточки под текущий масштаб"""
+        scaled = ZoomManager.scaled
+        s1, s3, s20, s24, s28, s30, s32 = (scaled(v) for v in (1, 3, 20, 24, 28, 30, 32))
+        
+        # Кнопки и лейблы ниже всегда создаются в _setup_ui (до первого вызова),
+        # проверяем только необязательные: повтор, теги, дату выполнения и панель таймера
+        # (карточки из пула не пересоздаются, поэтому размеры из _setup_ui обновляем здесь все)
+        self.priority_indicator.setFixedSize(s3, s28)
+        self._update_priority_pix()
+        self.toggle_timer_btn.setFixedSize(s32, s32)
+        timer_icon = _get_timer_icon(s30)
+        if not timer_icon.isNull():
+            self.toggle_timer_btn.setIcon(timer_icon)
+        self.toggle_timer_btn.setIconSize(_square_size(s30))
+        self.timer_separator.setFixedSize(s1, s20)
+        self.checkbox.setFixedSize(s24, s24)
+        self.delete_btn.setFixedSize(s30, s30)
         
         # Обновляем шрифты
-        if hasattr(self, 'title_label') and self.title_label:
-            self.title_label.setFont(ZoomManager.font("Segoe UI", 10, QFont.Medium))
-        if hasattr(self, 'repeat_label') and self.repeat_label:
+        self.title_label.setFont(ZoomManager.font("Segoe UI", 10, QFont.Medium))
+        self.priority_label.setFont(ZoomManager.font("Segoe UI", 8))
+        if self.repeat_label is not None:
             self.repeat_label.setFont(ZoomManager.font("Segoe UI", 9))
-        if hasattr(self, 'priority_label') and self.priority_label:
-            self.priority_label.setFont(ZoomManager.font("Segoe UI", 8))
-        if hasattr(self, 'time_label'):
+        if self.tags_label is not None:
+            self.tags_label.setFont(ZoomManager.font("Segoe UI", 9))
+        if self.completion_label is not None:
+            self.completion_label.setFont(ZoomManager.font("Segoe UI", 8))
+        
+        # Панель таймера
+        if self.play_btn is not None:
+            self.play_btn.setFixedSize(s28, s28)
+        if self.reset_btn is not None:
+            self.reset_btn.setFixedSize(s28, s28)
+        if self.time_label is not None:
             self.time_label.setFont(ZoomManager.font("Consolas", 10))
     
     def mousePressEvent(self, event):
@@ -3526,8 +4536,9 @@ class TaskCard(QFrame):
         """Обработка отпускания кнопки мыши"""
         if event.button() == Qt.LeftButton:
             # Если это был клик (а не drag), открываем окно просмотра
-            if self.drag_start_position is not None:
-                distance = (event.position().toPoint() - self.drag_start_position).manhattanLength()
+            start = self.drag_start_position
+            if start is not None:
+                distance = (event.position().toPoint() - start).manhattanLength()
                 if distance < 10:  # Это был клик, а не drag
                     # Открываем окно просмотра задачи
                     dialog = TaskViewDialog(self.task, self.parent_window)
@@ -3537,15 +4548,17 @@ class TaskCard(QFrame):
     
     def mouseMoveEvent(self, event):
         """Перетаскивание карточки"""
+        start = self.drag_start_position
+        if start is None or self._active_drag is not None:
+            return
+        
         # Проверяем, что зажата левая кнопка
         if not (event.buttons() & Qt.LeftButton):
             return
-            
-        if self.drag_start_position is None:
-            return
         
         # Проверяем, что переместились достаточно далеко
-        distance = (event.position().toPoint() - self.drag_start_position).manhattanLength()
+        pos = event.position().toPoint()
+        distance = (pos - start).manhattanLength()
         
         if distance < 10:  # Порог для начала drag
             return
@@ -3556,16 +4569,20 @@ class TaskCard(QFrame):
         mime_data.setText(str(self.task.id))  # Передаем ID задачи
         drag.setMimeData(mime_data)
         
-        # Создаем превью карточки
-        pixmap = self.grab()
-        drag.setPixmap(pixmap)
-        drag.setHotSpot(event.position().toPoint())
+        # Превью карточки снимается в момент начала drag - всегда с актуальными
+        # цветами темы и значением таймера (drag редок, кэш тут не окупается)
+        drag.setPixmap(self.grab())
+        drag.setHotSpot(pos)
         
         # Сбрасываем позицию чтобы не запускать drag повторно
         self.drag_start_position = None
         
         # Выполняем drag
-        drag.exec(Qt.MoveAction)
+        self._active_drag = drag
+        try:
+            drag.exec(Qt.MoveAction)
+        finally:
+            self._active_drag = None
 
 
 
@@ -3597,7 +4614,7 @@ class CompletedHeaderWidget(QWidget):
             event.acceptProposedAction()
 
 
-class DropZoneWidget(QWidget):
+class DropZoneWidget(CardListWidget):
     """Виджет-контейнер с поддержкой drop"""
     
     def __init__(self, zone_type, parent_window, parent=None):
@@ -3605,21 +4622,31 @@ class DropZoneWidget(QWidget):
         self.zone_type = zone_type  # 'active' или 'completed'
         self.parent_window = parent_window
         self.setAcceptDrops(True)
+        self.setAttribute(Qt.WA_StyledBackground, True)
+        self.setProperty("dropActive", False)
+    
+    def _set_drop_active(self, active):
+        """Подсветка зоны через свойство dropActive (правила в глобальной таблице стилей)"""
+        if self.property("dropActive") == active:
+            return
+        self.setProperty("dropActive", active)
+        style = self.style()
+        style.unpolish(self)
+        style.polish(self)
     
     def dragEnterEvent(self, event):
         """Обработка входа в зону drop"""
         if event.mimeData().hasText():
             event.acceptProposedAction()
-            # Подсветка зоны
-            self.setStyleSheet(f"background-color: {THEME['accent_bg']};  border-radius: 8px;")
+            self._set_drop_active(True)
     
     def dragLeaveEvent(self, event):
         """Обработка выхода из зоны drop"""
-        self.setStyleSheet("background-color: transparent;")
+        self._set_drop_active(False)
     
     def dropEvent(self, event):
         """Обработка drop"""
-        self.setStyleSheet("background-color: transparent;")
+        self._set_drop_active(False)
         
         if event.mimeData().hasText():
             task_id = event.mimeData().text()
@@ -3645,13 +4672,7 @@ class SliderPopup(QDialog):
         layout.setContentsMargins(0, 0, 0, 0)
         
         container = QFrame()
-        container.setStyleSheet(f"""
-            QFrame {{
-                background-color: {THEME['window_bg_start']};
-                border: 1px solid {THEME['border_color']};
-                border-radius: 8px;
-            }}
-        """)
+        container.setStyleSheet(get_dialog_styles().slider_popup_container)
         layout.addWidget(container)
         
         inner = QVBoxLayout(container)
@@ -3705,12 +4726,75 @@ class SliderPopup(QDialog):
         self.val_lbl.setStyleSheet(f"color: {THEME['text_secondary']}; font-size: 11px; border: none;")
         inner.addWidget(self.val_lbl)
         
-        self.slider.valueChanged.connect(lambda v: self.val_lbl.setText(str(v)))
+        self.slider.valueChanged.connect(self._show_value)
+    
+    def _show_value(self, value):
+        """Отображение текущего значения слайдера"""
+        self.val_lbl.setText(str(value))
 
 
+class _ProgressWriter:
+    """Обертка QSaveFile для shutil.copyfileobj: считает записанные байты и сообщает процент"""
+    
+    def __init__(self, f, total_size, on_percent):
+        self._f = f
+        self._total_size = total_size
+        self._on_percent = on_percent
+        self._written = 0
+        self._last_percent = -1
+    
+    def write(self, data):
+        result = self._f.write(data)
+        if result < 0:
+            raise OSError(self._f.errorString())
+        self._written += len(data)
+        if self._total_size > 0:
+            # Сообщаем только об изменившемся проценте (не чаще 101 раза за загрузку)
+            percent = self._written * 100 // self._total_size
+            if percent != self._last_percent:
+                self._last_percent = percent
+                self._on_percent(percent)
+        return result
+
+
+class UpdateCheckThread(QThread):
+    """Поток запроса информации о последнем релизе на GitHub"""
+    checked = Signal(str, object, str)  # Последняя версия, описание изменений, ссылка на установщик
+    failed = Signal(object)  # Исключение, возникшее при запросе
+
+    def __init__(self, api_url):
+        super().__init__()
+        self.api_url = api_url
+
+    def run(self):
+        try:
+            req = urllib.request.Request(self.api_url)
+            req.add_header('User-Agent', 'TaskMaster')
+            
+            with urllib.request.urlopen(req, timeout=5) as response:
+                data = json.load(response)
+            
+            latest_version = data['tag_name'].lstrip('v')
+            changelog = data.get('body', 'Нет описания изменений')
+            
+            # Ищем только инсталлятор в активах релиза (TaskMaster-Installer-*.exe);
+            # если его нет, используем html_url как запасной вариант
+            installer_url = next(
+                (asset['browser_download_url'] for asset in data.get('assets', ())
+                 if 'installer' in asset['name'].lower() and asset['name'].lower().endswith('.exe')),
+                None) or data.get('html_url', '')
+        except Exception as e:
+            self.failed.emit(e)
+            return
+        
+        self.checked.emit(latest_version, changelog, installer_url)
+
 
 class DownloadThread(QThread):
     """Поток для скачивания файла с отслеживанием прогресса"""
+    # Размер блока копирования: крупные блоки - меньше итераций и сигналов прогресса
+    CHUNK_SIZE = 1024 * 1024
+
     progress = Signal(int)
     finished = Signal(str)  # Путь к скачанному файлу или ошибка (начинается с "ERROR:")
 
@@ -3726,19 +4810,16 @@ class DownloadThread(QThread):
             
             with urllib.request.urlopen(req) as response:
                 total_size = int(response.info().get('Content-Length', 0))
-                bytes_downloaded = 0
-                chunk_size = 1024 * 64
                 
-                with open(self.dest_path, 'wb') as f:
-                    while True:
-                        chunk = response.read(chunk_size)
-                        if not chunk:
-                            break
-                        f.write(chunk)
-                        bytes_downloaded += len(chunk)
-                        if total_size > 0:
-                            percent = int((bytes_downloaded / total_size) * 100)
-                            self.progress.emit(percent)
+                # QSaveFile пишет во временный файл и переименовывает его только в commit(),
+                # поэтому прерванная загрузка не оставляет недописанный установщик
+                f = QSaveFile(self.dest_path)
+                if not f.open(QIODevice.WriteOnly):
+                    raise OSError(f.errorString())
+                writer = _ProgressWriter(f, total_size, self.progress.emit)
+                shutil.copyfileobj(response, writer, self.CHUNK_SIZE)
+                if not f.commit():
+                    raise OSError(f.errorString())
             
             self.finished.emit(self.dest_path)
         except (FileNotFoundError, OSError) as e:
@@ -3752,6 +4833,91 @@ class DownloadThread(QThread):
             self.finished.emit(f"ERROR: {str(e)}")
 
 
+def _changelog_cache_key(version, changelog):
+    """Ключ кэша чейнджлога: версия + md5 текста"""
+    return f"{version}:{hashlib.md5(changelog.encode('utf-8')).hexdigest()}"
+
+
+def _load_cached_changelog_html(key):
+    """HTML чейнджлога из кэша на диске или None"""
+    try:
+        with open(CHANGELOG_CACHE_FILE, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if data.get("key") != key:
+        return None
+    return data.get("html")
+
+
+class ChangelogRenderThread(QThread):
+    """Поток преобразования Markdown чейнджлога в HTML (вне потока GUI)"""
+    rendered = Signal(str)  # Готовый HTML
+
+    def __init__(self, changelog, cache_key, parent=None):
+        super().__init__(parent)
+        self.changelog = changelog
+        self.cache_key = cache_key
+
+    def run(self):
+        doc = QTextDocument()
+        doc.setMarkdown(self.changelog)
+        html = doc.toHtml()
+        # Сохраняем только последний чейнджлог - старые версии больше не показываются
+        try:
+            with open(CHANGELOG_CACHE_FILE, 'w', encoding='utf-8') as f:
+                json.dump({"key": self.cache_key, "html": html}, f, ensure_ascii=False)
+        except OSError:
+            pass
+        # Диалог уже закрыт - HTML пригодится только из кэша при следующем показе
+        if not self.isInterruptionRequested():
+            self.rendered.emit(html)
+
+
+def _replace_executable(new_file_path):
+    """Замена исполняемого файла приложения новым (bak-копия старого остается рядом)"""
+    try:
+        current_exe = sys.executable
+        # Проверяем, запущены ли мы как EXE (frozen)
+        is_frozen = getattr(sys, 'frozen', False)
+        
+        if not is_frozen:
+            # Если мы просто скрипт, то имитируем успех (для тестов)
+            print(f"DEBUG: Not frozen. Would replace {current_exe} with {new_file_path}")
+            return True
+            
+        bak_file = current_exe + ".bak"
+        
+        # 1. Удаляем старый .bak если есть
+        if os.path.exists(bak_file):
+            try: os.remove(bak_file)
+            except: pass
+        
+        # 2. Переименовываем текущий EXE (на Windows это можно делать с запущенным файлом)
+        os.rename(current_exe, bak_file)
+    except Exception as e:
+        print(f"Update error: {str(e)}")
+        return False
+    
+    # 3. Ставим новый файл на место старого: на том же диске это переименование,
+    # на другом - копирование содержимого (метаданные инсталлятору не нужны)
+    try:
+        try:
+            os.replace(new_file_path, current_exe)
+        except OSError as e:
+            if e.errno != errno.EXDEV:
+                raise
+            shutil.copyfile(new_file_path, current_exe)
+    except Exception as e:
+        print(f"Update error: {str(e)}")
+        # Возвращаем старый EXE на место, чтобы приложение продолжило запускаться
+        try: os.replace(bak_file, current_exe)
+        except OSError: pass
+        return False
+    
+    return True
+
+
 class UpdateDialog(QDialog):
     """Диалог уведомления об обновлении с поддержкой Markdown"""
     def __init__(self, parent, version, changelog, download_url):
@@ -3761,7 +4927,8 @@ class UpdateDialog(QDialog):
         
         self.setWindowTitle("Обновление доступно")
         self.setMinimumSize(450, 500)
-        self.setStyleSheet(f"background-color: {THEME['window_bg_end']}; color: {THEME['text_primary']};")
+        styles = get_dialog_styles()
+        self.setStyleSheet(styles.update_dialog)
         
         layout = QVBoxLayout(self)
         layout.setContentsMargins(20, 20, 20, 20)
@@ -3770,41 +4937,32 @@ class UpdateDialog(QDialog):
         # Заголовок
         title_lbl = QLabel(f"🚀 Доступна версия v{version}")
         title_lbl.setFont(QFont("Segoe UI", 16, QFont.Bold))
-        title_lbl.setStyleSheet(f"color: {THEME['accent_hover']};")
+        title_lbl.setStyleSheet(styles.update_title)
         layout.addWidget(title_lbl)
         
         # Чейнджлог
         self.text_edit = QTextEdit()
         self.text_edit.setReadOnly(True)
-        self.text_edit.setMarkdown(changelog)
-        self.text_edit.setStyleSheet(f"""
-            QTextEdit {{
-                background-color: rgba(255, 255, 255, 0.05);
-                border: 1px solid {THEME['border_color']};
-                border-radius: 8px;
-                padding: 10px;
-                color: {THEME['text_primary']};
-                font-size: 13px;
-            }}
-        """)
+        # Разбор Markdown длинного чейнджлога не должен задерживать показ диалога:
+        # берем готовый HTML из кэша или разбираем в фоновом потоке
+        self.changelog_thread = None
+        cache_key = _changelog_cache_key(version, changelog)
+        html = _load_cached_changelog_html(cache_key)
+        if html is not None:
+            self.text_edit.setHtml(html)
+        else:
+            self.text_edit.setPlainText("Загрузка списка изменений…")
+            # Владелец потока - приложение: закрытие диалога не должно уничтожать работающий поток
+            self.changelog_thread = ChangelogRenderThread(changelog, cache_key, QApplication.instance())
+            self.changelog_thread.rendered.connect(self.text_edit.setHtml, Qt.QueuedConnection)
+            self.changelog_thread.finished.connect(self.changelog_thread.deleteLater)
+            self.changelog_thread.start()
+        self.text_edit.setStyleSheet(styles.update_changelog)
         layout.addWidget(self.text_edit)
         
         # Прогресс бар
         self.progress_bar = QProgressBar()
-        self.progress_bar.setStyleSheet(f"""
-            QProgressBar {{
-                background-color: rgba(255, 255, 255, 0.1);
-                border: 1px solid {THEME['border_color']};
-                border-radius: 5px;
-                text-align: center;
-                color: {THEME['text_primary']};
-                height: 20px;
-            }}
-            QProgressBar::chunk {{
-                background-color: {THEME['accent_bg']};
-                border-radius: 4px;
-            }}
-        """)
+        self.progress_bar.setStyleSheet(styles.update_progress)
         self.progress_bar.hide()
         layout.addWidget(self.progress_bar)
         
@@ -3821,36 +4979,13 @@ class UpdateDialog(QDialog):
         self.update_btn = QPushButton("Обновить сейчас")
         self.update_btn.setFixedHeight(36)
         self.update_btn.setCursor(Qt.PointingHandCursor)
-        self.update_btn.setStyleSheet(f"""
-            QPushButton {{
-                background-color: {THEME['accent_bg']};
-                color: {THEME['accent_text']};
-                border: none;
-                border-radius: 6px;
-                font-weight: bold;
-                padding: 0 20px;
-            }}
-            QPushButton:hover {{
-                background-color: {THEME['accent_hover']};
-            }}
-        """)
+        self.update_btn.setStyleSheet(styles.update_accept_btn)
         self.update_btn.clicked.connect(self._start_download)
         
         self.later_btn = QPushButton("Позже")
         self.later_btn.setFixedHeight(36)
         self.later_btn.setCursor(Qt.PointingHandCursor)
-        self.later_btn.setStyleSheet(f"""
-            QPushButton {{
-                background-color: rgba(255, 255, 255, 0.1);
-                color: {THEME['text_primary']};
-                border: none;
-                border-radius: 6px;
-                padding: 0 20px;
-            }}
-            QPushButton:hover {{
-                background-color: rgba(255, 255, 255, 0.2);
-            }}
-        """)
+        self.later_btn.setStyleSheet(styles.update_later_btn)
         self.later_btn.clicked.connect(self.reject)
         
         btn_layout.addStretch()
@@ -3867,9 +5002,10 @@ class UpdateDialog(QDialog):
 
     def mouseMoveEvent(self, event):
         if self.old_pos is not None:
-            delta = QPoint(event.globalPos() - self.old_pos)
+            global_pos = event.globalPos()
+            delta = global_pos - self.old_pos
             self.move(self.x() + delta.x(), self.y() + delta.y())
-            self.old_pos = event.globalPos()
+            self.old_pos = global_pos
 
     def mouseReleaseEvent(self, event):
         self.old_pos = None
@@ -3899,10 +5035,23 @@ class UpdateDialog(QDialog):
         self.temp_dest = os.path.join(temp_dir, filename)
         
         self.download_thread = DownloadThread(self.download_url, self.temp_dest)
-        self.download_thread.progress.connect(self.progress_bar.setValue)
+        # Прогресс приходит из потока загрузки - явно через очередь событий GUI
+        self.download_thread.progress.connect(self._on_download_progress, Qt.QueuedConnection)
         self.download_thread.finished.connect(self._on_download_finished)
         self.download_thread.start()
 
+    def done(self, result):
+        # Не ждем поток разбора чейнджлога: он доработает сам и удалится по finished
+        if self.changelog_thread is not None:
+            self.changelog_thread.requestInterruption()
+            self.changelog_thread = None
+        super().done(result)
+
+    def _on_download_progress(self, percent):
+        """Обновление прогресса загрузки (без лишних перерисовок при том же значении)"""
+        if percent != self.progress_bar.value():
+            self.progress_bar.setValue(percent)
+
     def _on_download_finished(self, result):
         if result.startswith("ERROR:"):
             self.update_btn.setEnabled(True)
@@ -3935,45 +5084,59 @@ class UpdateDialog(QDialog):
         QApplication.quit()  # Закрываем приложение
 
     def _replace_executable(self, new_file_path):
-        try:
-            current_exe = sys.executable
-            # Проверяем, запущены ли мы как EXE (frozen)
-            is_frozen = getattr(sys, 'frozen', False)
-            
-            if not is_frozen:
-                # Если мы просто скрипт, то имитируем успех (для тестов)
-                print(f"DEBUG: Not frozen. Would replace {current_exe} with {new_file_path}")
-                return True
-                
-            bak_file = current_exe + ".bak"
-            
-            # 1. Удаляем старый .bak если есть
-            if os.path.exists(bak_file):
-                try: os.remove(bak_file)
-                except: pass
-            
-            # 2. Переименовываем текущий EXE (на Windows это можно делать с запущенным файлом)
-            os.rename(current_exe, bak_file)
-            
-            # 3. Копируем новый файл на место старого
-            shutil.copy2(new_file_path, current_exe)
-            
-            return True
-        except Exception as e:
-            print(f"Update error: {str(e)}")
-            return False
+        """Замена EXE новым файлом (True - успешно)"""
+        return _replace_executable(new_file_path)
+
+
+
+@lru_cache(maxsize=512)
+def _julian_date_key(julian_day):
+    """Ключ дня "yyyy-MM-dd" по номеру юлианского дня"""
+    return QDate.fromJulianDay(julian_day).toString("yyyy-MM-dd")
+
 
+def _date_key(date):
+    """Ключ дня "yyyy-MM-dd" для QDate (кэшируется - навигация по датам ходит по одним и тем же дням)"""
+    return _julian_date_key(date.toJulianDay())
+
+
+def _completion_day(completion_date):
+    """
+    День выполнения задачи в формате "yyyy-MM-dd" (completion_date хранится как "dd.MM.yyyy HH:mm").
+    Нераспознанная дата с точками дает None - такая задача не попадает ни в один день архива
+    """
+    date_part = completion_date.split(" ", 1)[0]
+    if "." in date_part:
+        date = QDate.fromString(date_part, "dd.MM.yyyy")
+        return date.toString("yyyy-MM-dd") if date.isValid() else None
+    return date_part
 
 
 class CompletedTasksDialog(DraggableDialog):
     """Диалог для просмотра и управления выполненными задачами"""
+    # Список карточек виртуальный: создаются только карточки в видимой области,
+    # уходящие из нее возвращаются в пул и переиспользуются (TaskCard.rebind).
+    # Высота строки - высота карточки при текущей ширине (заголовок переносится,
+    # теги и дата добавляют лейблы), ее измеряет скрытая карточка _measure_card
+    ROW_SPACING = 8
+    LIST_MARGINS = (15, 0, 15, 20)  # Отступы списка: слева, сверху, справа, снизу
+    
     def __init__(self, parent):
         super().__init__(parent)
         self.setWindowTitle("Архив задач")
         self.resize(420, 550)
         self.parent_window = parent
         self.all_completed_tasks = []  # Все выполненные задачи
+        self._by_date = {}  # Индекс выполненных задач: "yyyy-MM-dd" -> список задач
         self.selected_date = QDate.currentDate()  # Выбранная дата
+        styles = get_dialog_styles()
+        
+        self._shown_tasks = []  # Задачи выбранной даты (строки списка)
+        self._bound_cards = {}  # Индекс строки -> показанная карточка
+        self._card_pool = []  # Скрытые карточки для переиспользования
+        self._row_offsets = [0]  # Начало каждой строки по вертикали (+ конец списка последним)
+        self._rows_width = None  # Ширина карточек, для которой измерены строки
+        self._measure_card = None  # Скрытая карточка для измерения высоты строк
         
         # Основной лейаут для тени
         main_layout = QVBoxLayout(self)
@@ -3982,17 +5145,7 @@ class CompletedTasksDialog(DraggableDialog):
         # Контейнер
         self.container = QFrame()
         self.container.setObjectName("dialogContainer")
-        self.container.setStyleSheet(f"""
-            QFrame#dialogContainer {{
-                background: qlineargradient(
-                    x1:0, y1:0, x2:1, y2:1,
-                    stop:0 {THEME['window_bg_start']},
-                    stop:1 {THEME['window_bg_end']}
-                );
-                border: 1px solid rgba(255, 255, 255, 0.15);
-                border-radius: 20px;
-            }}
-        """)
+        self.container.setStyleSheet(styles.archive_container)
         main_layout.addWidget(self.container)
         
         self.apply_standard_shadow(self.container)
@@ -4015,19 +5168,7 @@ class CompletedTasksDialog(DraggableDialog):
         close_btn = QPushButton("✕")
         close_btn.setFixedSize(30, 30)
         close_btn.setCursor(Qt.PointingHandCursor)
-        close_btn.setStyleSheet(f"""
-            QPushButton {{
-                background: transparent;
-                color: {THEME['text_secondary']};
-                font-size: 18px;
-                border: none;
-            }}
-            QPushButton:hover {{
-                color: {THEME['text_primary']};
-                background-color: {THEME['secondary_hover']};
-                border-radius: 15px;
-            }}
-        """)
+        close_btn.setStyleSheet(styles.archive_close_btn)
         close_btn.clicked.connect(self.close)
         header_layout.addWidget(close_btn)
         
@@ -4042,6 +5183,17 @@ class CompletedTasksDialog(DraggableDialog):
         layout.addWidget(date_nav_frame)
 
         
+        # Область скролла со списком создается при первом показе (_setup_list_area)
+        self._content_layout = layout
+        self._list_built = False
+        
+        # Добавляем grip
+        self.add_grip(self.container)
+    
+    def _setup_list_area(self):
+        """Создание области списка задач (один раз, при первом показе)"""
+        self._list_built = True
+        
         # Область скролла
         self.scroll = QScrollArea()
         self.scroll.setWidgetResizable(True)
@@ -4051,81 +5203,193 @@ class CompletedTasksDialog(DraggableDialog):
                 border: none;
             }
         """)
-        
-        scroll_content = QWidget()
-        scroll_content.setStyleSheet("background: transparent;")
-        self.tasks_layout = QVBoxLayout(scroll_content)
-        self.tasks_layout.setContentsMargins(20, 10, 20, 20)
-        self.tasks_layout.setSpacing(10)
-        self.tasks_layout.addStretch()
-        
-        self.scroll.setWidget(scroll_content)
-        layout.addWidget(self.scroll)
         self.scroll.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
         
-        self.tasks_container = QWidget()
-        self.tasks_container.setStyleSheet("background: transparent;")
-        self.tasks_layout = QVBoxLayout(self.tasks_container)
-        self.tasks_layout.setContentsMargins(15, 0, 15, 20)
-        self.tasks_layout.setSpacing(8)
-        self.tasks_layout.addStretch()
+        self.tasks_container = CardListWidget()
+        # Стиль только для самого контейнера, чтобы не перекрывать глобальные стили карточек
+        self.tasks_container.setObjectName("archiveTasks")
+        self.tasks_container.setStyleSheet("QWidget#archiveTasks { background: transparent; }")
+        # Карточки размещаются вручную (setGeometry) - без layout, см. _layout_visible_cards
+        self.tasks_container.installEventFilter(self)
         
         self.scroll.setWidget(self.tasks_container)
-        layout.addWidget(self.scroll)
+        self._content_layout.addWidget(self.scroll)
+        self.scroll.verticalScrollBar().valueChanged.connect(self._layout_visible_cards)
+        # Диалог уже показывается - новый дочерний виджет показываем сразу, а не отложенно
+        self.scroll.show()
         
-        # Добавляем grip
-        self.add_grip(self.container)
+        # Grip должен остаться поверх добавленного списка
+        self.grip_wrapper.raise_()
+    
+    def showEvent(self, event):
+        if not self._list_built:
+            self._setup_list_area()
+            self._display_tasks(self._shown_tasks)
+        super().showEvent(event)
     
     def _on_date_changed(self, date):
         """Обработчик изменения даты"""
+        if date == self.selected_date:
+            return  # Та же дата - список уже актуален
         self.selected_date = date
         self._refresh_tasks()
     
     def _refresh_tasks(self):
         """Обновление списка задач по выбранной дате"""
-        # Фильтруем задачи по дате выполнения
-        current_date_str = self.selected_date.toString("yyyy-MM-dd")
-        filtered_tasks = []
-        
-        for task in self.all_completed_tasks:
-            # Проверяем дату выполнения задачи
-            if task.completion_date:
-                # Если дата выполнения совпадает с выбранной датой
-                if task.completion_date == current_date_str:
-                    filtered_tasks.append(task)
+        # Задачи выбранной даты берем из индекса, построенного в set_tasks
+        current_date_str = _date_key(self.selected_date)
+        filtered_tasks = self._by_date.get(current_date_str, [])
         
         # Отображаем отфильтрованные задачи
         self._display_tasks(filtered_tasks)
     
     def _display_tasks(self, tasks):
         """Отображение списка задач"""
-        # Очистка
-        while self.tasks_layout.count() > 1: # Оставляем stretch
-            item = self.tasks_layout.takeAt(0)
-            if item.widget():
-                item.widget().deleteLater()
-                
-        # Добавление
-        for task in tasks:
-            # Создаем карточку, передаем parent_window для обработки кликов (чекбокс, удаление)
-            card = TaskCard(task, self.parent_window) 
-            card.setAcceptDrops(False)
-            
-            # Скрываем кнопку таймера и разделитель в архиве
-            if hasattr(card, 'toggle_timer_btn'):
-                card.toggle_timer_btn.setVisible(False)
-            if hasattr(card, 'timer_separator'):
-                card.timer_separator.setVisible(False)
-            
-            self.tasks_layout.insertWidget(self.tasks_layout.count() - 1, card)
+        # Все показанные карточки возвращаем в пул - строки привязываются заново
+        self._release_cards(list(self._bound_cards))
+        self._shown_tasks = tasks
+        if not self._list_built:
+            return  # Список будет построен и заполнен при первом показе
+        
+        self.tasks_container.setUpdatesEnabled(False)
+        try:
+            self._measure_rows()
+            self._layout_visible_cards()
+        finally:
+            self.tasks_container.setUpdatesEnabled(True)
+    
+    def _card_width(self):
+        """Ширина карточек списка при текущей ширине контейнера"""
+        left, _, right, _ = self.LIST_MARGINS
+        return self.tasks_container.width() - left - right
+    
+    def _measure_rows(self):
+        """Высоты строк под текущую ширину: таблица начал строк и высота контейнера"""
+        _, top, _, bottom = self.LIST_MARGINS
+        width = self._card_width()
+        spacing = ZoomManager.scaled(self.ROW_SPACING)
+        offsets = [top]
+        if self._shown_tasks:
+            card = self._measure_card
+            if card is None:
+                card = self._measure_card = self._new_card(self._shown_tasks[0])
+            for task in self._shown_tasks:
+                card.rebind(task)
+                offsets.append(offsets[-1] + self._card_height(card, width) + spacing)
+        self._row_offsets = offsets
+        self._rows_width = width
+        # Высота контейнера задает диапазон прокрутки для всего списка
+        self.tasks_container.setMinimumHeight(offsets[-1] + bottom)
+    
+    @staticmethod
+    def _card_height(card, width):
+        """Высота карточки при ширине width (с учетом переноса заголовка)"""
+        # Скрытая карточка не получает LayoutRequest после rebind - без явной активации
+        # вложенные layout'ы отдают высоту, закэшированную для прежней задачи
+        card.ensurePolished()
+        card.layout().activate()
+        if card.hasHeightForWidth():
+            return card.heightForWidth(width)
+        return card.sizeHint().height()
+    
+    def _release_cards(self, indexes):
+        """Скрыть карточки строк indexes и вернуть их в пул"""
+        for index in indexes:
+            card = self._bound_cards.pop(index)
+            card.hide()
+            self._card_pool.append(card)
+    
+    def _take_card(self, task):
+        """Карточка для задачи: из пула или новая"""
+        if self._card_pool:
+            card = self._card_pool.pop()
+            card.rebind(task)
+            return card
+        return self._new_card(task)
+    
+    def _new_card(self, task):
+        """Новая скрытая карточка архива"""
+        # Создаем карточку, передаем parent_window для обработки кликов (чекбокс, удаление)
+        card = TaskCard(task, self.parent_window)
+        card.setParent(self.tasks_container)
+        card.setAcceptDrops(False)
+        
+        # Скрываем кнопку таймера и разделитель в архиве
+        card.toggle_timer_btn.setVisible(False)
+        card.timer_separator.setVisible(False)
+        card.hide()
+        return card
+    
+    def _layout_visible_cards(self, *_signal_args):
+        """Показать карточки только для строк, попадающих в видимую область прокрутки"""
+        tasks = self._shown_tasks
+        offsets = self._row_offsets
+        left = self.LIST_MARGINS[0]
+        scroll_y = self.scroll.verticalScrollBar().value()
+        view_h = self.scroll.viewport().height()
+        
+        # Строки, пересекающие видимую область: поиск по таблице начал строк
+        first = max(0, bisect_right(offsets, scroll_y) - 1)
+        last = min(len(tasks), bisect_left(offsets, scroll_y + view_h))
+        
+        # Ушедшие из видимой области строки
+        self._release_cards([i for i in self._bound_cards if not first <= i < last])
+        
+        width = self._card_width()
+        spacing = ZoomManager.scaled(self.ROW_SPACING)
+        for index in range(first, last):
+            card = self._bound_cards.get(index)
+            if card is None:
+                card = self._take_card(tasks[index])
+                self._bound_cards[index] = card
+            card.setGeometry(left, offsets[index], width, offsets[index + 1] - offsets[index] - spacing)
+            card.show()
+    
+    def eventFilter(self, obj, event):
+        # Ширина карточек следует за шириной контейнера (появление полосы прокрутки, resize),
+        # а с ней и высота строк с переносом заголовка
+        if obj is self.tasks_container and event.type() == QEvent.Resize:
+            if self._card_width() != self._rows_width:
+                self._measure_rows()
+            self._layout_visible_cards()
+        return super().eventFilter(obj, event)
         
     def set_tasks(self, tasks, parent_window):
         """Установка списка всех выполненных задач"""
         self.all_completed_tasks = tasks
         self.parent_window = parent_window
+        
+        # Индекс по дню выполнения (один проход вместо перебора при каждой смене даты)
+        self._by_date = {}
+        for task in tasks:
+            if task.completion_date:
+                day = _completion_day(task.completion_date)
+                if day is not None:
+                    self._by_date.setdefault(day, []).append(task)
         # Обновляем отображение по текущей выбранной дате
         self._refresh_tasks()
 
+@lru_cache(maxsize=4096)
+def _format_hms(seconds):
+    """Форматирование времени в ЧЧ:ММ:СС для отчета (часы всегда двузначные)"""
+    h, rem = divmod(seconds, 3600)
+    m, s = divmod(rem, 60)
+    return f"{h:02d}:{m:02d}:{s:02d}"
+
+
+class ClickableFrame(QFrame):
+    """Рамка-строка, сообщающая о нажатии id своей задачи"""
+    clicked = Signal(int)  # id задачи
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.task_id = None
+
+    def mousePressEvent(self, event):
+        self.clicked.emit(self.task_id)
+        event.accept()
+
+
 class TimeReportDialog(DraggableDialog):
     """Диалог отчета по времени за выбранный день"""
     def __init__(self, parent=None, initial_date=None):
@@ -4133,15 +5397,18 @@ class TimeReportDialog(DraggableDialog):
         self.selected_date = initial_date or QDate.currentDate()
         self.tasks = parent.tasks if parent else []
         self.parent_window = parent
+        self._build_time_index()
         
         self.setWindowTitle("Отчет по времени")
         self.setMinimumWidth(400)
         self.setMinimumHeight(450)
         
         self._setup_ui()
-        self._refresh_report()
+        # Отчет заполняется при первом показе (см. showEvent)
 
     def _setup_ui(self):
+        styles = get_dialog_styles()
+        
         # Основной лейаут для тени
         main_layout = QVBoxLayout(self)
         main_layout.setContentsMargins(15, 15, 15, 15)
@@ -4149,17 +5416,7 @@ class TimeReportDialog(DraggableDialog):
         # Контейнер
         self.container = QFrame()
         self.container.setObjectName("reportContainer")
-        self.container.setStyleSheet(f"""
-            QFrame#reportContainer {{
-                background: qlineargradient(
-                    x1:0, y1:0, x2:1, y2:1,
-                    stop:0 {THEME['window_bg_start']},
-                    stop:1 {THEME['window_bg_end']}
-                );
-                border: 1px solid {THEME['border_color']};
-                border-radius: 20px;
-            }}
-        """)
+        self.container.setStyleSheet(styles.report_container)
         main_layout.addWidget(self.container)
         
         # Применяем тень
@@ -4188,19 +5445,7 @@ class TimeReportDialog(DraggableDialog):
         close_btn = QPushButton("✕")
         close_btn.setFixedSize(32, 32)
         close_btn.setCursor(QCursor(Qt.PointingHandCursor))
-        close_btn.setStyleSheet(f"""
-            QPushButton {{
-                background: transparent;
-                color: {THEME['text_secondary']};
-                font-size: 20px;
-                border: none;
-            }}
-            QPushButton:hover {{
-                color: {THEME['text_primary']};
-                background-color: {THEME['secondary_hover']};
-                border-radius: 16px;
-            }}
-        """)
+        close_btn.setStyleSheet(styles.report_close_btn)
         close_btn.clicked.connect(self.close)
         header.addWidget(close_btn)
         
@@ -4213,45 +5458,21 @@ class TimeReportDialog(DraggableDialog):
         prev_btn = QPushButton("◀")
         prev_btn.setFixedSize(36, 36)
         prev_btn.setCursor(QCursor(Qt.PointingHandCursor))
-        prev_btn.setStyleSheet(f"""
-            QPushButton {{
-                background-color: {THEME['secondary_bg']};
-                color: {THEME['text_primary']};
-                border-radius: 10px;
-                border: 1px solid {THEME['border_color']};
-                font-size: 14px;
-            }}
-            QPushButton:hover {{
-                background-color: {THEME['secondary_hover']};
-                border-color: {THEME['accent_hover']};
-            }}
-        """)
-        prev_btn.clicked.connect(lambda: self._change_date(-1))
+        prev_btn.setStyleSheet(styles.report_nav_btn)
+        prev_btn.clicked.connect(partial(self._change_date, -1))
         
         self.date_btn = QPushButton(self.selected_date.toString("dd.MM.yyyy"))
         self.date_btn.setFixedHeight(36)
         self.date_btn.setCursor(QCursor(Qt.PointingHandCursor))
         self.date_btn.setFont(ZoomManager.font("Segoe UI", 11, QFont.Medium))
-        self.date_btn.setStyleSheet(f"""
-            QPushButton {{
-                background-color: {THEME['input_bg']};
-                color: {THEME['text_primary']};
-                padding: 0 20px;
-                border: 1px solid {THEME['border_color']};
-                border-radius: 10px;
-            }}
-            QPushButton:hover {{
-                background-color: {THEME['input_bg_focus']};
-                border-color: {THEME['accent_hover']};
-            }}
-        """)
+        self.date_btn.setStyleSheet(styles.report_date_btn)
         self.date_btn.clicked.connect(self._show_calendar)
         
         next_btn = QPushButton("▶")
         next_btn.setFixedSize(36, 36)
         next_btn.setCursor(QCursor(Qt.PointingHandCursor))
-        next_btn.setStyleSheet(prev_btn.styleSheet())
-        next_btn.clicked.connect(lambda: self._change_date(1))
+        next_btn.setStyleSheet(styles.report_nav_btn)
+        next_btn.clicked.connect(partial(self._change_date, 1))
         
         date_nav.addWidget(prev_btn)
         date_nav.addWidget(self.date_btn, 1)
@@ -4259,31 +5480,10 @@ class TimeReportDialog(DraggableDialog):
         
         inner_layout.addLayout(date_nav)
         
-        # Tasks List
-        self.scroll = QScrollArea()
-        self.scroll.setWidgetResizable(True)
-        self.scroll.setStyleSheet("QScrollArea { border: none; background: transparent; }")
-        self.scroll.verticalScrollBar().setStyleSheet(f"""
-            QScrollBar:vertical {{
-                border: none;
-                background: transparent;
-                width: 8px;
-            }}
-            QScrollBar::handle:vertical {{
-                background: {THEME['scroll_handle']};
-                border-radius: 4px;
-            }}
-        """)
-        
-        self.list_container = QWidget()
-        self.list_container.setStyleSheet("background: transparent;")
-        self.list_layout = QVBoxLayout(self.list_container)
-        self.list_layout.setContentsMargins(0, 0, 0, 0)
-        self.list_layout.setSpacing(8)
-        self.list_layout.addStretch()
-        
-        self.scroll.setWidget(self.list_container)
-        inner_layout.addWidget(self.scroll)
+        # Список задач строится при первом показе (_setup_list_area) - здесь только его место
+        self._inner_layout = inner_layout
+        self._list_index = inner_layout.count()
+        self._list_built = False
         
         # Footer
         footer = QHBoxLayout()
@@ -4300,18 +5500,7 @@ class TimeReportDialog(DraggableDialog):
         export_btn.setFixedHeight(36)
         export_btn.setCursor(QCursor(Qt.PointingHandCursor))
         export_btn.setFont(ZoomManager.font("Segoe UI", 10, QFont.Bold))
-        export_btn.setStyleSheet(f"""
-            QPushButton {{
-                background-color: {THEME['accent_bg']};
-                color: {THEME['accent_text']};
-                padding: 0 25px;
-                border-radius: 12px;
-                border: none;
-            }}
-            QPushButton:hover {{
-                background-color: {THEME['accent_hover']};
-            }}
-        """)
+        export_btn.setStyleSheet(styles.report_export_btn)
         export_btn.clicked.connect(self._export_report)
         footer.addWidget(export_btn)
         
@@ -4330,13 +5519,7 @@ class TimeReportDialog(DraggableDialog):
         
         # Стилизованный контейнер
         container = QFrame(cal_dialog)
-        container.setStyleSheet(f"""
-            QFrame {{
-                background-color: {THEME['window_bg_start']};
-                border: 1px solid {THEME['border_color']};
-                border-radius: 12px;
-            }}
-        """)
+        container.setStyleSheet(get_dialog_styles().report_calendar_container)
         
         layout = QVBoxLayout(cal_dialog)
         layout.setContentsMargins(0, 0, 0, 0)
@@ -4350,9 +5533,11 @@ class TimeReportDialog(DraggableDialog):
         inner_layout.addWidget(calendar)
         
         def on_selected():
-            self.selected_date = calendar.calendar.selectedDate()
-            self.date_btn.setText(self.selected_date.toString("dd.MM.yyyy"))
-            self._refresh_report()
+            date = calendar.calendar.selectedDate()
+            if date != self.selected_date:
+                self.selected_date = date
+                self.date_btn.setText(self.selected_date.toString("dd.MM.yyyy"))
+                self._refresh_report()
             cal_dialog.accept()
             
         calendar.calendar.clicked.connect(on_selected)
@@ -4373,90 +5558,138 @@ class TimeReportDialog(DraggableDialog):
         
         cal_dialog.exec()
 
-    def _refresh_report(self):
-        # Очистка текущего списка
-        while self.list_layout.count() > 1:
-            item = self.list_layout.takeAt(0)
-            if item.widget():
-                item.widget().deleteLater()
-                
-        date_str = self.selected_date.toString("yyyy-MM-dd")
-        total_seconds = 0
-        found_any = False
+    def _setup_list_area(self):
+        """Создание области списка задач (один раз, при первом показе или обновлении)"""
+        self._list_built = True
+        styles = get_dialog_styles()
+        
+        self.scroll = QScrollArea()
+        self.scroll.setWidgetResizable(True)
+        self.scroll.setStyleSheet("QScrollArea { border: none; background: transparent; }")
+        self.scroll.verticalScrollBar().setStyleSheet(styles.report_scrollbar)
+        
+        self.list_container = QWidget()
+        self.list_container.setStyleSheet("background: transparent;")
+        self.list_layout = QVBoxLayout(self.list_container)
+        self.list_layout.setContentsMargins(0, 0, 0, 0)
+        self.list_layout.setSpacing(8)
+        
+        # Строки отчета переиспользуются между датами (см. _get_row), лишние скрываются
+        self._row_pool = []
+        
+        self.no_tasks_lbl = QLabel("В этот день задач не зафиксировано")
+        self.no_tasks_lbl.setAlignment(Qt.AlignCenter)
+        self.no_tasks_lbl.setStyleSheet(f"color: {THEME['text_tertiary']}; padding: 20px;")
+        self.no_tasks_lbl.hide()
+        self.list_layout.addWidget(self.no_tasks_lbl)
+        self.list_layout.addStretch()
         
-        # Сортируем задачи по времени
-        report_data = []
+        self.scroll.setWidget(self.list_container)
+        self._inner_layout.insertWidget(self._list_index, self.scroll)
+        # Диалог уже показывается - новый дочерний виджет показываем сразу, а не отложенно
+        self.scroll.show()
+
+    def showEvent(self, event):
+        if not self._list_built:
+            self._refresh_report()
+        super().showEvent(event)
+
+    def _build_time_index(self):
+        """Индекс времени по дням: дата -> [(задача, секунды)] по убыванию времени и итоги за день"""
+        self._by_date = {}
         for task in self.tasks:
-            time_val = task.time_log.get(date_str, 0)
-            if time_val > 0:
-                report_data.append((task, time_val))
-                
-        report_data.sort(key=lambda x: x[1], reverse=True)
+            for date_key, time_val in task.time_log.items():
+                if time_val > 0:
+                    self._by_date.setdefault(date_key, []).append((task, time_val))
+        self._totals = {}
+        for date_key, entries in self._by_date.items():
+            entries.sort(key=lambda x: x[1], reverse=True)
+            self._totals[date_key] = sum(time_val for _, time_val in entries)
+
+    def _get_row(self, index):
+        """Строка отчета с номером index: из пула или новая (рамка, заголовок, описание, время)"""
+        if index < len(self._row_pool):
+            return self._row_pool[index]
+        
+        styles = get_dialog_styles()
+        item_frame = ClickableFrame()
+        item_frame.setObjectName("reportItem")
+        item_frame.setCursor(QCursor(Qt.PointingHandCursor))
+        item_frame.setStyleSheet(styles.report_item)
+        item_frame.clicked.connect(self._view_task)
+        
+        item_layout = QHBoxLayout(item_frame)
+        item_layout.setContentsMargins(15, 12, 15, 12)
+        
+        text_container = QVBoxLayout()
+        text_container.setSpacing(2)
+        
+        title_lbl = QLabel()
+        title_lbl.setFont(ZoomManager.font("Segoe UI", 10, QFont.Medium))
+        title_lbl.setWordWrap(True)
+        title_lbl.setStyleSheet(f"color: {THEME['text_primary']}; background: transparent; border: none;")
+        text_container.addWidget(title_lbl)
+        
+        desc_lbl = QLabel()
+        desc_lbl.setFont(ZoomManager.font("Segoe UI", 8))
+        desc_lbl.setStyleSheet(f"color: {THEME['text_tertiary']}; background: transparent; border: none;")
+        text_container.addWidget(desc_lbl)
+        
+        time_lbl = QLabel()
+        time_lbl.setFont(ZoomManager.font("Consolas", 10, QFont.Bold))
+        time_lbl.setStyleSheet(f"color: {THEME['text_primary']}; background: transparent; border: none;")
+        
+        item_layout.addLayout(text_container, 1)
+        item_layout.addWidget(time_lbl)
+        
+        # Строки идут перед надписью "нет задач" и растяжкой
+        self.list_layout.insertWidget(index, item_frame)
+        row = (item_frame, title_lbl, desc_lbl, time_lbl)
+        self._row_pool.append(row)
+        return row
+
+    def _refresh_report(self):
+        if not self._list_built:
+            self._setup_list_area()
+        date_str = _date_key(self.selected_date)
         
-        for task, time_val in report_data:
-            total_seconds += time_val
-            found_any = True
-            
-            item_frame = QFrame()
-            item_frame.setObjectName("reportItem")
-            item_frame.setCursor(QCursor(Qt.PointingHandCursor))
-            item_frame.setProperty("taskId", task.id)
-            item_frame.setStyleSheet(f"""
-                QFrame#reportItem {{
-                    background-color: {THEME['secondary_bg']};
-                    border-radius: 10px;
-                }}
-                QFrame#reportItem:hover {{
-                    background-color: {THEME['secondary_hover']};
-                }}
-            """)
-            item_frame.installEventFilter(self)
-            
-            item_layout = QHBoxLayout(item_frame)
-            item_layout.setContentsMargins(15, 12, 15, 12)
-            
-            text_container = QVBoxLayout()
-            text_container.setSpacing(2)
-            
-            title_lbl = QLabel(task.title)
-            title_lbl.setFont(ZoomManager.font("Segoe UI", 10, QFont.Medium))
-            title_lbl.setWordWrap(True)
-            title_lbl.setStyleSheet(f"color: {THEME['text_primary']}; background: transparent; border: none;")
-            text_container.addWidget(title_lbl)
-            
-            if task.description:
-                # Показываем короткое превью описания
-                preview = task.description.split('\n')[0]
-                if len(preview) > 60: preview = preview[:57] + "..."
-                desc_lbl = QLabel(preview)
-                desc_lbl.setFont(ZoomManager.font("Segoe UI", 8))
-                desc_lbl.setStyleSheet(f"color: {THEME['text_tertiary']}; background: transparent; border: none;")
-                text_container.addWidget(desc_lbl)
-                item_frame.setToolTip(task.description)
-            
-            time_lbl = QLabel(self._format_time(time_val))
-            time_lbl.setFont(ZoomManager.font("Consolas", 10, QFont.Bold))
-            time_lbl.setStyleSheet(f"color: {THEME['text_primary']}; background: transparent; border: none;")
+        # Задачи дня уже отсортированы по времени (см. _build_time_index)
+        report_data = self._by_date.get(date_str, [])
+        
+        # Перепривязка строк одним проходом: без промежуточных перерисовок и пересчетов layout
+        self.list_container.setUpdatesEnabled(False)
+        try:
+            for index, (task, time_val) in enumerate(report_data):
+                item_frame, title_lbl, desc_lbl, time_lbl = self._get_row(index)
+                item_frame.task_id = task.id
+                title_lbl.setText(task.title)
+            
+                if task.description:
+                    # Показываем короткое превью описания (первая строка, без разбиения на список строк)
+                    desc = task.description
+                    end = desc.find('\n')
+                    if end == -1: end = len(desc)
+                    preview = desc[:57] + "..." if end > 60 else desc[:end]
+                    desc_lbl.setText(preview)
+                    desc_lbl.show()
+                    item_frame.setToolTip(task.description)
+                else:
+                    desc_lbl.hide()
+                    item_frame.setToolTip("")
             
-            item_layout.addLayout(text_container, 1)
-            item_layout.addWidget(time_lbl)
+                time_lbl.setText(_format_hms(time_val))
+                item_frame.show()
             
-            self.list_layout.insertWidget(self.list_layout.count() - 1, item_frame)
+            # Лишние строки с прошлой даты скрываем, а не удаляем
+            for item_frame, *_ in self._row_pool[len(report_data):]:
+                item_frame.hide()
             
-        if not found_any:
-            no_tasks_lbl = QLabel("В этот день задач не зафиксировано")
-            no_tasks_lbl.setAlignment(Qt.AlignCenter)
-            no_tasks_lbl.setStyleSheet(f"color: {THEME['text_tertiary']}; padding: 20px;")
-            self.list_layout.insertWidget(0, no_tasks_lbl)
+            self.no_tasks_lbl.setVisible(not report_data)
+            self.list_layout.activate()
+        finally:
+            self.list_container.setUpdatesEnabled(True)
             
-        self.total_lbl.setText(f"Итого: {self._format_time(total_seconds)}")
-
-    def eventFilter(self, obj, event):
-        if obj.objectName() == "reportItem" and event.type() == QEvent.MouseButtonPress:
-            task_id = obj.property("taskId")
-            self._view_task(task_id)
-            return True
-        return super().eventFilter(obj, event)
+        self.total_lbl.setText(f"Итого: {_format_hms(self._totals.get(date_str, 0))}")
 
     def _view_task(self, task_id):
         from typing import List
@@ -4465,36 +5698,29 @@ class TimeReportDialog(DraggableDialog):
             dialog = TaskViewDialog(target_task, self.parent_window)
             dialog.exec()
             # Обновляем отчет при закрытии (вдруг задачу удалили/изменили)
+            self._build_time_index()
             self._refresh_report()
 
     def _format_time(self, seconds):
-        hours = seconds // 3600
-        minutes = (seconds % 3600) // 60
-        secs = seconds % 60
-        return f"{hours:02d}:{minutes:02d}:{secs:02d}"
+        return _format_hms(seconds)
 
     def _export_report(self):
         date_str = self.selected_date.toString("dd.MM.yyyy")
-        filename = f"Report_{self.selected_date.toString('yyyy-MM-dd')}.txt"
+        date_key = _date_key(self.selected_date)
+        filename = f"Report_{date_key}.txt"
+        
+        # Собираем отчет целиком и пишем в файл одним вызовом
+        parts = [f"ОТЧЕТ ПО ВРЕМЕНИ: {date_str}\n", "-" * 40 + "\n\n"]
+        for task, time_val in self._by_date.get(date_key, []):
+            parts.append(f"[{_format_hms(time_val)}] {task.title}\n")
+            if task.description:
+                parts.append(f"   Описание: {task.description}\n")
+            parts.append("-" * 20 + "\n")
+        parts.append(f"\nВСЕГО ЗА ДЕНЬ: {_format_hms(self._totals.get(date_key, 0))}\n")
         
         try:
             with open(filename, "w", encoding="utf-8") as f:
-                f.write(f"ОТЧЕТ ПО ВРЕМЕНИ: {date_str}\n")
-                f.write("-" * 40 + "\n\n")
-                
-                date_key = self.selected_date.toString("yyyy-MM-dd")
-                total_seconds = 0
-                
-                for task in self.tasks:
-                    time_val = task.time_log.get(date_key, 0)
-                    if time_val > 0:
-                        total_seconds += time_val
-                        f.write(f"[{self._format_time(time_val)}] {task.title}\n")
-                        if task.description:
-                            f.write(f"   Описание: {task.description}\n")
-                        f.write("-" * 20 + "\n")
-                
-                f.write(f"\nВСЕГО ЗА ДЕНЬ: {self._format_time(total_seconds)}\n")
+                f.write("".join(parts))
             
             QMessageBox.information(self, "Экспорт", f"Отчет сохранен в файл: {filename}")
         except Exception as e:
@@ -4511,6 +5737,8 @@ class ModernTaskManager(QMainWindow):
         self._cleanup_old_version()
         
         self.tasks: List[Task] = []
+        self._next_id = 1  # Следующий свободный ID задачи (пересчитывается в _load_tasks)
+        self._tasks_by_id: Dict[int, Task] = {}  # Индекс self.tasks по ID: обновляется при каждом изменении списка
         self.drag_position = None
         self.selected_date = QDate.currentDate() # Текущая выбранная дата
         self.update_available = False  # Флаг доступности обновления
@@ -4518,19 +5746,135 @@ class ModernTaskManager(QMainWindow):
         self.current_tag_filter = None  # Текущий фильтр по тегу (None = все теги)
         self._initial_resize_done = False # Флаг для предотвращения авторесайза после старта
         self.notifications_dismissed = False  # Флаг: пользователь закрыл уведомления
+        self._overdue_badge_state = None  # Последнее состояние индикатора просроченных задач
+        self._update_check_thread = None  # Поток ручной проверки обновлений
+        self._ui_scale_applied = None  # Масштаб, для которого последний раз выполнялся _refresh_ui_scale
+        self._update_check_progress = None
         self.overdue_tasks: List[Task] = []  # Список просроченных задач
         self._active_filter_menu = None  # Ссылка на открытое меню фильтров
+        # Создаются в _setup_ui; None до построения интерфейса (вместо hasattr в обработчиках событий)
+        self.filter_btn = None
+        self.header_widget = None
+        self.active_tasks_layout = None
+        self.tasks_layout = None
+        self.completed_tasks_btn = None
+        self.completed_tasks_container = None
+        self.grip_container = None
+        self.grip_wrapper = None
+        self._drag_exclusion_widgets = None  # Кнопки, над которыми окно не перетаскивается (WM_NCHITTEST)
+        # Прямоугольники кнопок-исключений и заголовка в координатах окна (см. _get_hit_rects)
+        self._hit_rects = None
+        self._hit_rect_watched = None  # Виджеты и их предки, сдвиг которых сбрасывает _hit_rects
+        # Окно развернуто/во весь экран: рамки изменения размера в WM_NCHITTEST не проверяются
+        self._is_maximized = False
+        # Размер окна для WM_NCHITTEST (обновляется в resizeEvent)
+        self._w = self.width()
+        self._h = self.height()
+        
+        # ТРЕКИНГ СОСТОЯНИЯ ПОПАПОВ (Fix for detachment bug)
+        # Счетчик дублирует размер множества - в nativeEvent достаточно проверить число.
+        # Уничтоженный комбобокс удаляется явно (сигнал destroyed в _patch_single_combo)
+        self._active_popups = set()
+        self._active_popup_count = 0
+        # Версия состояния попапов: меняется при открытии/закрытии, входит в ключ кэша WM_NCHITTEST
+        self._popup_version = 0
+        # Последний результат WM_NCHITTEST: (lParam, версия попапов, результат).
+        # Сбрасывается при перемещении и изменении размера окна
+        self._nchittest_cache = None
+        
+        # Обработчики сообщений Windows в nativeEvent (код сообщения -> метод)
+        self._native_handlers = {
+            0x0083: self._on_nccalcsize,      # WM_NCCALCSIZE
+            0x0112: self._on_syscommand,      # WM_SYSCOMMAND
+            0x00A1: self._on_nclbuttondown,   # WM_NCLBUTTONDOWN
+            0x0231: self._on_enter_sizemove,  # WM_ENTERSIZEMOVE
+            0x0084: self._on_nchittest,       # WM_NCHITTEST
+        }
         
         # Устанавливаем eventFilter для отслеживания перемещения окна
         self.installEventFilter(self)
         
         # Таймер для трекинга времени
+        # Тикает раз в секунду только пока есть запущенные таймеры задач (см. _sync_timer_ticks)
         self.timer = QTimer(self)
+        self.timer.setInterval(1000)
         self.timer.timeout.connect(self._update_timers)
-        self.timer.start(1000) # Обновление каждую секунду
+        self._running_timer_tasks: List[Task] = []
+        
+        # Отложенное обновление стилей: несколько запросов подряд схлопываются в один проход
+        self._style_refresh_timer = QTimer(self)
+        self._style_refresh_timer.setSingleShot(True)
+        self._style_refresh_timer.setInterval(16)
+        self._style_refresh_timer.timeout.connect(self._do_refresh_styles)
+        
+        # Перестроение списка задач: запросы за один проход цикла событий
+        # (drop, закрытие диалога, смена фильтра) схлопываются в один _refresh_tasks
+        self._tasks_refresh_timer = QTimer(self)
+        self._tasks_refresh_timer.setSingleShot(True)
+        self._tasks_refresh_timer.setInterval(0)
+        self._tasks_refresh_timer.timeout.connect(self._refresh_tasks)
+        
+        # Масштаб: тики слайдера за один проход цикла событий применяются одним
+        # пересчетом стилей и перестроением списка (по последнему значению)
+        self._pending_zoom = None
+        self._zoom_apply_timer = QTimer(self)
+        self._zoom_apply_timer.setSingleShot(True)
+        self._zoom_apply_timer.setInterval(0)
+        self._zoom_apply_timer.timeout.connect(self._apply_pending_zoom)
+        
+        # Последняя отрисованная иконка архива: (есть ли выполненные, цвет галочки)
+        self._completed_icon_key = None
+        
+        # Карточки активных задач в порядке layout (переиспользуются в _refresh_tasks)
+        self._card_pool = []
+        self._card_by_task_id = {}  # ID задачи -> показывающая ее карточка из пула
+        
+        # Геометрия экрана для позиционирования всплывающих окон (сбрасывается в moveEvent)
+        self._screen_geo_cache = None
+        
+        # Меню фильтра по тегам и набор тегов, из которого собраны его пункты
+        self._tags_menu = None
+        self._tags_menu_tags = None
+        # Меню фильтров и тем: создаются при первом открытии и дальше переиспользуются
+        self._filter_menu = None
+        self._theme_menu = None
+
+        # То же для индикатора обновления (сигнал update_found)
+        self._pending_update_badge = False
+        self._update_badge_timer = QTimer(self)
+        self._update_badge_timer.setSingleShot(True)
+        self._update_badge_timer.setInterval(16)
+        self._update_badge_timer.timeout.connect(
+            lambda: self._show_update_badge(self._pending_update_badge))
+        
+        # Смена дня при открытом окне: раз в минуту сравниваем дату с датой последней
+        # проверки просроченных задач; сам список пересобирается только после полуночи
+        self._overdue_scan_day = None
+        self._overdue_day_timer = QTimer(self)
+        self._overdue_day_timer.setInterval(60 * 1000)
+        self._overdue_day_timer.timeout.connect(self._on_overdue_day_tick)
+        self._overdue_day_timer.start()
+        
+        # Сохранение задач: изменения за 300 мс пишутся на диск одной записью в фоновом
+        # потоке. В пуле один поток, поэтому записи выполняются строго по очереди
+        self._save_timer = QTimer(self)
+        self._save_timer.setSingleShot(True)
+        self._save_timer.setInterval(300)
+        self._save_timer.timeout.connect(self._flush_save)
+        # Накопленное время запущенных таймеров сбрасывается на диск не реже раза в минуту
+        self._time_save_timer = QTimer(self)
+        self._time_save_timer.setSingleShot(True)
+        self._time_save_timer.setInterval(60 * 1000)
+        self._time_save_timer.timeout.connect(self._flush_save)
+        self._save_pool = QThreadPool(self)
+        self._save_pool.setMaxThreadCount(1)
+        QApplication.instance().aboutToQuit.connect(self._save_now)
+        
+        # Все настройки читаем с диска один раз - конструктор и _setup_ui берут их из снимка
+        self._settings_snapshot = SettingsManager.load()
         
         # Загружаем сохраненную тему перед созданием UI
-        saved_theme = SettingsManager.get("current_theme")
+        saved_theme = self._settings_snapshot.get("current_theme")
         if saved_theme and saved_theme in AVAILABLE_THEMES:
             THEME.update(AVAILABLE_THEMES[saved_theme])
         
@@ -4550,11 +5894,11 @@ class ModernTaskManager(QMainWindow):
         # Явно обновляем список задач после загрузки
         self._refresh_tasks()
         
-        # Применяем стили и фиксы прозрачности при запуске
-        self._refresh_styles()
+        # Применяем стили и фиксы прозрачности при запуске (сразу, до первого показа окна)
+        self._do_refresh_styles()
         
         # Подключаем сигнал обновления
-        self.update_found.connect(self._show_update_badge)
+        self.update_found.connect(self._queue_update_badge)
         
         self.setWindowTitle("TaskMaster")
         self.setMinimumSize(320, 400)
@@ -4580,7 +5924,7 @@ class ModernTaskManager(QMainWindow):
         self.setAttribute(Qt.WA_TranslucentBackground, False)
         
         # Восстановление состояния окна (геометрия)
-        saved_geometry = SettingsManager.get("window_geometry")
+        saved_geometry = self._settings_snapshot.get("window_geometry")
         if saved_geometry:
             try:
                 self.restoreGeometry(QByteArray.fromBase64(saved_geometry.encode()))
@@ -4591,17 +5935,17 @@ class ModernTaskManager(QMainWindow):
             self.resize(460, 600)
             
         # Восстановление масштаба
-        saved_scale = SettingsManager.get("ui_scale", 1.0)
+        saved_scale = self._settings_snapshot.get("ui_scale", 1.0)
         if saved_scale != 1.0:
              ZoomManager.set_scale(saved_scale)
+             QApplication.instance().setStyleSheet(get_global_style())
              
              
         # Восстановление прозрачности
-        saved_opacity = SettingsManager.get("window_opacity", 0.96)
+        saved_opacity = self._settings_snapshot.get("window_opacity", 0.96)
         self.setWindowOpacity(saved_opacity)
 
-        # ТРЕКИНГ СОСТОЯНИЯ ПОПАПОВ (Fix for detachment bug)
-        self._active_popups = set()
+        # Патчим комбобоксы для трекинга открытых попапов
         self._patch_combos()
         
     def _patch_combos(self):
@@ -4630,19 +5974,31 @@ class ModernTaskManager(QMainWindow):
         
         def new_show():
             # print(f"DEBUG: Showing popup for {combo}", flush=True)
-            self._active_popups.add(combo)
+            if combo not in self._active_popups:
+                self._active_popups.add(combo)
+                self._active_popup_count += 1
+                self._popup_version += 1
             old_show()
             
+        def forget_popup():
+            # Повторное закрытие не уводит счетчик в минус
+            if combo in self._active_popups:
+                self._active_popups.discard(combo)
+                self._active_popup_count -= 1
+                self._popup_version += 1
+            
         def new_hide():
             # print(f"DEBUG: Hiding popup (grace period) for {combo}", flush=True)
             # Задержка удаления из списка активных, чтобы успеть заблокировать перетаскивание
             # если событие Hide вызвано кликом заголовка. 
             # 200 мс достаточно.
-            QTimer.singleShot(200, lambda: self._active_popups.discard(combo))
+            QTimer.singleShot(200, forget_popup)
             old_hide()
         
         combo.showPopup = new_show
         combo.hidePopup = new_hide
+        # Комбобокс, уничтоженный с открытым списком, не должен навсегда блокировать перетаскивание
+        combo.destroyed.connect(forget_popup)
         combo._is_patched = True
 
     def nativeEvent(self, eventType, message):
@@ -4653,137 +6009,199 @@ class ModernTaskManager(QMainWindow):
             print(f"Error reading MSG: {e}")
             return super().nativeEvent(eventType, message)
 
-        if msg.message == 0x0083: # WM_NCCALCSIZE
-            # Обработка NCCALCSIZE позволяет убрать стандартную рамку Windows,
-            # но сохранить функциональность (прилипание, горячие клавиши)
-            return True, 0
+        # Одна проверка по словарю вместо цепочки сравнений для каждого сообщения Windows
+        handler = self._native_handlers.get(msg.message)
+        if handler is not None:
+            result = handler(msg)
+            if result is not None:
+                return result
+            
+        return super().nativeEvent(eventType, message)
 
-        if msg.message == 0x0112: # WM_SYSCOMMAND
-            # Ловим команду перемещения или изменения размера
-            cmd = msg.wParam & 0xFFF0
-            if cmd == 0xF010 or cmd == 0xF000: # SC_MOVE or SC_SIZE
+    def _on_nccalcsize(self, msg):
+        """WM_NCCALCSIZE"""
+        # Обработка NCCALCSIZE позволяет убрать стандартную рамку Windows,
+        # но сохранить функциональность (прилипание, горячие клавиши)
+        return True, 0
+
+    def _on_syscommand(self, msg):
+        """WM_SYSCOMMAND"""
+        # Ловим команду перемещения или изменения размера
+        cmd = msg.wParam & 0xFFF0
+        if cmd == 0xF010 or cmd == 0xF000: # SC_MOVE or SC_SIZE
+            return self._on_enter_sizemove(msg)
+        return None
+
+    def _on_nclbuttondown(self, msg):
+        """WM_NCLBUTTONDOWN"""
+        # Если началось перемещение окна (клик по заголовку)
+        if msg.wParam == 2: # HTCAPTION
+            # Над кнопкой фильтров WM_NCHITTEST возвращает HTCLIENT,
+            # поэтому сюда попадают только клики по области перетаскивания
+            
+            # Если есть открытые меню - закрываем их и БЛОКИРУЕМ перетаскивание
+            # (чтобы список не "уезжал" вместе с окном)
+            if self._has_active_popups():
                 self._force_close_popups()
-
-        if msg.message == 0x00A1: # WM_NCLBUTTONDOWN
-            # Если началось перемещение окна (клик по заголовку)
-            if msg.wParam == 2: # HTCAPTION
-                # Проверяем, не кликнули ли на кнопку фильтров
-                if hasattr(self, 'filter_btn') and self.filter_btn.isVisible():
-                    # Получаем координаты клика
-                    x = ctypes.c_short(msg.lParam & 0xFFFF).value
-                    y = ctypes.c_short((msg.lParam >> 16) & 0xFFFF).value
-                    global_pos = QPoint(x, y)
-                    filter_btn_global_pos = self.filter_btn.mapToGlobal(QPoint(0, 0))
-                    filter_btn_rect = QRect(filter_btn_global_pos, self.filter_btn.size())
-                    if filter_btn_rect.contains(global_pos):
-                        return True, 0 # Блокируем перетаскивание
-                
-                # Если есть открытые меню - закрываем их и БЛОКИРУЕМ перетаскивание
-                # (чтобы список не "уезжал" вместе с окном)
-                if self._has_active_popups():
-                    self._force_close_popups()
-                    return True, 0 # Консьюмим событие, перетаскивание НЕ начнется
-
-        if msg.message == 0x0231: # WM_ENTERSIZEMOVE
-             self._force_close_popups()
-        
-        if msg.message == 0x0084: # WM_NCHITTEST
-            # Если есть активное всплывающее окно - блокируем нативное перетаскивание,
-            # возвращая HTCLIENT.
-            if self._has_active_popups():
-                return True, 1 # HTCLIENT
-
-            # Получаем координаты мыши (LPARAM = y << 16 | x)
-            x = ctypes.c_short(msg.lParam & 0xFFFF).value
-            y = ctypes.c_short((msg.lParam >> 16) & 0xFFFF).value
-            
-            global_pos = QPoint(x, y)
-            local_pos = self.mapFromGlobal(global_pos)
-            
-            # --- Логика изменения размера (Borders) ---
-            # Увеличиваем зону захвата для удобства
-            border_width = 8
-            w = self.width()
-            h = self.height()
-            lx = local_pos.x()
-            ly = local_pos.y()
-            
-            resize_result = None
-            
-            if lx < border_width:
-                if ly < border_width:
-                    resize_result = 13 # HTTOPLEFT
-                elif ly > h - border_width:
-                    resize_result = 16 # HTBOTTOMLEFT
-                else:
-                    resize_result = 10 # HTLEFT
-            elif lx > w - border_width:
-                if ly < border_width:
-                    resize_result = 14 # HTTOPRIGHT
-                elif ly > h - border_width:
-                    resize_result = 17 # HTBOTTOMRIGHT
-                else:
-                    resize_result = 11 # HTRIGHT
-            elif ly < border_width:
-                resize_result = 12 # HTTOP
-            elif ly > h - border_width:
-                resize_result = 15 # HTBOTTOM
+                return True, 0 # Консьюмим событие, перетаскивание НЕ начнется
+        return None
+
+    def _on_enter_sizemove(self, msg):
+        """WM_ENTERSIZEMOVE (и SC_MOVE/SC_SIZE из WM_SYSCOMMAND) - начало перемещения/resize"""
+        # Без открытых попапов _force_close_popups сразу возвращается (без processEvents)
+        self._force_close_popups()
+        return None
+
+    def _on_nchittest(self, msg):
+        """WM_NCHITTEST"""
+        # Windows шлет NCHITTEST на каждое движение мыши - повтор для той же точки
+        # при неизменных окне и попапах отдаем из кэша
+        cache = self._nchittest_cache
+        if cache is not None and cache[0] == msg.lParam and cache[1] == self._popup_version:
+            return True, cache[2]
+        result = self._nc_hit_test(msg.lParam)
+        self._nchittest_cache = (msg.lParam, self._popup_version, result)
+        return True, result
+
+    # Ширина зоны захвата рамки для изменения размера (увеличена для удобства)
+    _BORDER_WIDTH = 8
+    # Коды WM_NCHITTEST для рамки окна по [строка][столбец]; None - клиентская часть
+    _HT_RESIZE_TABLE = (
+        (13, 12, 14),    # HTTOPLEFT, HTTOP, HTTOPRIGHT
+        (10, None, 11),  # HTLEFT, -, HTRIGHT
+        (16, 15, 17),    # HTBOTTOMLEFT, HTBOTTOM, HTBOTTOMRIGHT
+    )
+
+    def _nc_hit_test(self, lparam):
+        """Результат WM_NCHITTEST для координат курсора из lParam"""
+        # Если есть активное всплывающее окно - блокируем нативное перетаскивание,
+        # возвращая HTCLIENT.
+        if self._has_active_popups():
+            return 1 # HTCLIENT
+
+        # Получаем координаты мыши (LPARAM = y << 16 | x)
+        # Знаковые 16-битные значения (на многомониторных системах бывают отрицательными)
+        x, y = _unpack_lparam_xy((lparam & 0xFFFFFFFF).to_bytes(4, 'little'))
+        
+        global_pos = QPoint(x, y)
+        local_pos = self.mapFromGlobal(global_pos)
+        
+        # --- Логика изменения размера (Borders) ---
+        # Развернутое окно Windows за края не тянет - рамки не проверяем
+        lx = local_pos.x()
+        ly = local_pos.y()
+        if not self._is_maximized:
+            border_width = self._BORDER_WIDTH
+            w = self._w
+            h = self._h
+            
+            # Столбец/строка сетки 3x3: 0 - левая/верхняя рамка, 1 - середина, 2 - правая/нижняя
+            col = (lx >= border_width) + (lx > w - border_width)
+            row = (ly >= border_width) + (ly > h - border_width)
+            resize_result = self._HT_RESIZE_TABLE[row][col]
                 
             if resize_result:
-                return True, resize_result
-
-            # Проверяем, не кликнули ли на кнопку фильтров
-            if hasattr(self, 'filter_btn') and self.filter_btn.isVisible():
-                filter_btn_global_pos = self.filter_btn.mapToGlobal(QPoint(0, 0))
-                filter_btn_rect = QRect(filter_btn_global_pos, self.filter_btn.size())
-                if filter_btn_rect.contains(global_pos):
-                    return True, 1 # HTCLIENT - не перетаскивать
-            
-            # --- Логика перемещения (Title Bar) ---
-            if hasattr(self, 'header_widget'):
-                # Определяем глобальную позицию заголовка
-                header_pos = self.header_widget.mapTo(self, QPoint(0,0))
-                header_rect = QRect(header_pos, self.header_widget.size())
-                
-                if header_rect.contains(local_pos):
-                     # Проверяем дочерний виджет (кнопки)
-                    child = self.header_widget.childAt(self.header_widget.mapFrom(self, local_pos))
-                    
-                    if not isinstance(child, QPushButton):
-                         # Если есть активные попапы - блокируем драг (возвращаем HTCLIENT)
-                         if self._has_active_popups():
-                             return True, 1 # HTCLIENT
-                             
-                         # Иначе разрешаем стандартный драг Windows (HTCAPTION)
-                         # Это вернет прилипание (Snap Layouts)
-                         return True, 2 # HTCAPTION
-            
-            return True, 1 # HTCLIENT
+                return resize_result
+
+        exclusion_rects, header_rect, header_button_rects = self._get_hit_rects()
+        
+        # Кнопки-исключения (фильтры) - клиентская область, не перетаскивать
+        for widget, (x0, y0, x1, y1) in exclusion_rects:
+            if x0 <= lx < x1 and y0 <= ly < y1 and widget.isVisible():
+                return 1 # HTCLIENT
+        
+        # --- Логика перемещения (Title Bar) ---
+        if header_rect is not None and header_rect[0] <= lx < header_rect[2] and header_rect[1] <= ly < header_rect[3]:
+            # Кнопки заголовка (уведомления, свернуть, закрыть) - по готовым прямоугольникам
+            over_button = False
+            for button, (x0, y0, x1, y1) in header_button_rects:
+                if x0 <= lx < x1 and y0 <= ly < y1 and button.isVisible():
+                    over_button = True
+                    break
             
-        return super().nativeEvent(eventType, message)
+            if not over_button:
+                 # Если есть активные попапы - блокируем драг (возвращаем HTCLIENT)
+                 if self._has_active_popups():
+                     return 1 # HTCLIENT
+                     
+                 # Иначе разрешаем стандартный драг Windows (HTCAPTION)
+                 # Это вернет прилипание (Snap Layouts)
+                 return 2 # HTCAPTION
+        
+        return 1 # HTCLIENT
 
     # mousePressEvent удален, так как мы вернули нативный драг для работы Snap
 
+    def _get_drag_exclusion_widgets(self):
+        """Виджеты, над которыми WM_NCHITTEST возвращает HTCLIENT (список собирается один раз)"""
+        if self._drag_exclusion_widgets is None:
+            if self.filter_btn is None:
+                return ()  # Интерфейс еще не построен
+            self._drag_exclusion_widgets = (self.filter_btn,)
+        return self._drag_exclusion_widgets
+
+    def _get_hit_rects(self):
+        """
+        Прямоугольники (x0, y0, x1, y1) кнопок-исключений, заголовка и кнопок заголовка
+        в координатах окна для WM_NCHITTEST - простые числа, без Qt-объектов на каждое событие.
+        Считаются один раз; сбрасываются, когда сдвигается или меняет размер
+        сам виджет или любой его предок (см. eventFilter), а также при resize окна.
+        """
+        if self._hit_rects is None:
+            exclusion = self._get_drag_exclusion_widgets()
+            if not exclusion:
+                return (), None, ()  # Интерфейс еще не построен
+            header = self.header_widget
+            header_buttons = header.findChildren(QPushButton)
+            if self._hit_rect_watched is None:
+                watched = set()
+                for widget in (*exclusion, *header_buttons, header):
+                    while widget is not self:
+                        watched.add(widget)
+                        widget = widget.parentWidget()
+                for widget in watched:
+                    widget.installEventFilter(self)
+                self._hit_rect_watched = watched
+            def bounds(widget):
+                pos = widget.mapTo(self, QPoint(0, 0))
+                return (pos.x(), pos.y(), pos.x() + widget.width(), pos.y() + widget.height())
+            
+            self._hit_rects = (
+                tuple((w, bounds(w)) for w in exclusion),
+                bounds(header),
+                tuple((b, bounds(b)) for b in header_buttons),
+            )
+        return self._hit_rects
+
+    # Полный обход окон и комбобоксов в _has_active_popups (для отладки трекинга попапов)
+    _SCAN_POPUPS_DEBUG = False
+    # Флаги окон, считающихся всплывающими при обходе topLevelWidgets
+    _POPUP_WINDOW_FLAGS = Qt.Popup | Qt.ToolTip | Qt.SplashScreen
+
     def _has_active_popups(self):
-        """Проверка наличия активных всплывающих окон"""
-        # Проверяем меню фильтров
+        """Проверка наличия активных всплывающих окон (вызывается на каждый WM_NCHITTEST)"""
+        # 0. Счетчик открытых комбобоксов (monkey-patching в _patch_single_combo)
+        if self._active_popup_count:
+             return True
+        
+        # Меню фильтров
         if self._active_filter_menu and self._active_filter_menu.isVisible():
             return True
-        
-        # 0. Самая надежная проверка через monkey-patching
-        if hasattr(self, '_active_popups') and self._active_popups:
-             # print(f"DEBUG: NCHITTEST sees active popups: {self._active_popups}", flush=True)
-             return True
 
-        # 1. Обычный Qt механизм
+        # 1. Обычный Qt механизм - готовый указатель, без обхода дерева
         if QApplication.activePopupWidget():
             return True
-            
+        
+        if self._SCAN_POPUPS_DEBUG:
+            return self._scan_active_popups()
+        return False
+
+    def _scan_active_popups(self):
+        """Медленный поиск открытых попапов обходом всех окон и комбобоксов"""
         # 2. Топ-левел виджеты с флагом Popup
         for widget in QApplication.topLevelWidgets():
             if widget is not self and widget.isWindow() and widget.isVisible():
-                 flags = widget.windowFlags()
-                 if (flags & Qt.Popup) or (flags & Qt.ToolTip) or (flags & Qt.SplashScreen):
+                 if widget.windowFlags() & self._POPUP_WINDOW_FLAGS:
                     return True
 
         # 3. Все QComboBox в интерфейсе (общий случай)
@@ -4795,39 +6213,39 @@ class ModernTaskManager(QMainWindow):
         
     def _force_close_popups(self):
         """Принудительное закрытие всех всплывающих окон"""
+        # Подсказки (Qt.ToolTip) не попадают в activePopupWidget - прячем отдельно
+        if QToolTip.isVisible():
+            QToolTip.hideText()
+        
+        popup = QApplication.activePopupWidget()
+        if not (self._active_popup_count or self._active_filter_menu or popup):
+            return  # Закрывать нечего - без обхода окон и обработки событий
+        
+        self._popup_version += 1
         # 0. Закрываем меню фильтров
         if self._active_filter_menu:
             self._active_filter_menu.close()
             self._active_filter_menu = None
         
-        # 1. Закрываем через наш надежный список
-        if hasattr(self, '_active_popups'):
-            for combo in list(self._active_popups):
-                combo.hidePopup()
-        
-        # 2. Обычный Qt механизм
-        popup = QApplication.activePopupWidget()
-        if popup:
+        # 1. Закрываем через наш надежный список (все комбобоксы окна пропатчены в _patch_combos)
+        for combo in list(self._active_popups):
+            combo.hidePopup()
+            # Агрессивное скрытие контейнера view
+            if combo.view() and combo.view().window():
+                 combo.view().window().setVisible(False)
+        
+        # 2. Обычный Qt механизм (календари и прочие Qt.Popup). Попапы могут быть
+        # открыты стопкой (подменю, календарь из попапа) - закрываем до последнего
+        closed = set()
+        while popup is not None and popup.isVisible() and id(popup) not in closed:
+            closed.add(id(popup))
             popup.close()
-            
-        # 3. Топ-левел виджеты с флагом Popup
-        for widget in QApplication.topLevelWidgets():
-            if widget is not self and widget.isWindow() and widget.isVisible():
-                 # Проверяем флаги
-                 flags = widget.windowFlags()
-                 if (flags & Qt.Popup) or (flags & Qt.ToolTip):
-                    widget.close()
-
-        # 4. Все QComboBox в интерфейсе
-        for combo in self.findChildren(QComboBox):
-            if combo.isVisible():
-                combo.hidePopup()
-                # Агрессивное скрытие контейнера view
-                if combo.view() and combo.view().window():
-                     combo.view().window().setVisible(False)
+            popup = QApplication.activePopupWidget()
         
-        # Обработка событий для мгновенного применения
-        QApplication.processEvents()
+        # Доставляем только отложенные закрытия/удаления попапов - очередь отрисовки,
+        # таймеров и ввода не разбираем (и не входим в обработчики повторно)
+        QApplication.sendPostedEvents(None, QEvent.Close)
+        QApplication.sendPostedEvents(None, QEvent.DeferredDelete)
         
     def _cleanup_old_version(self):
         """Удаляет старый .bak файл, оставшийся после обновления"""
@@ -4851,12 +6269,14 @@ class ModernTaskManager(QMainWindow):
             SettingsManager.set("window_opacity", self.windowOpacity())
         except Exception as e:
             print(f"Ошибка сохранения состояния: {e}")
-            
+        
+        self._save_now()
         super().closeEvent(event)
 
         
     def _setup_ui(self):
         """Настройка интерфейса"""
+        styles = get_main_window_styles()
         # Центральный виджет
         central = QWidget()
         self.setCentralWidget(central)
@@ -4869,16 +6289,7 @@ class ModernTaskManager(QMainWindow):
         # Контейнер с фоном
         self.main_container = QFrame()
         self.main_container.setObjectName("mainContainer")
-        self.main_container.setStyleSheet(f"""
-            QFrame#mainContainer {{
-                background: qlineargradient(
-                    x1:0, y1:0, x2:1, y2:1,
-                    stop:0 {THEME['window_bg_start']},
-                    stop:1 {THEME['window_bg_end']}
-                );
-                border: none;
-            }}
-        """)
+        _set_style_if_changed(self.main_container, styles.main_container)
         
         container_layout = QVBoxLayout(self.main_container)
         container_layout.setContentsMargins(20, 20, 20, 20)
@@ -4895,8 +6306,8 @@ class ModernTaskManager(QMainWindow):
         title_layout.setSpacing(2)
         
         self.app_title_lbl = QLabel("TaskMaster")
-        self.app_title_lbl.setFont(QFont("Segoe UI", 18, QFont.Bold))
-        self.app_title_lbl.setStyleSheet(f"color: {THEME['text_primary']};")
+        self.app_title_lbl.setFont(_FONT_TITLE)
+        self.app_title_lbl.setObjectName("appTitle")
         self.app_title_lbl.setTextInteractionFlags(Qt.NoTextInteraction)
         title_layout.addWidget(self.app_title_lbl)
         title_layout.addStretch()
@@ -4924,6 +6335,8 @@ class ModernTaskManager(QMainWindow):
         close_btn.setFixedSize(32, 32)
         close_btn.clicked.connect(self.exit_application)
         header_layout.addWidget(close_btn)
+        # Кнопки заголовка рисуются сами - при смене темы их нужно только перерисовать
+        self._header_buttons = (self.minimize_btn, close_btn)
         
         container_layout.addWidget(self.header_widget)
         
@@ -4933,13 +6346,7 @@ class ModernTaskManager(QMainWindow):
         
         # Форма добавления задачи
         self.add_form = QFrame()
-        self.add_form.setStyleSheet(f"""
-            QFrame {{
-                background-color: {THEME['form_bg']};
-                border-radius: 12px;
-                border: 1px solid {THEME['border_color']};
-            }}
-        """)
+        self.add_form.setObjectName("addForm")
         
         form_layout = QVBoxLayout(self.add_form)
         form_layout.setContentsMargins(12, 12, 12, 12)
@@ -4948,27 +6355,9 @@ class ModernTaskManager(QMainWindow):
         # Поле ввода названия
         self.title_input = QLineEdit()
         self.title_input.setPlaceholderText("Новая задача...")
-        self.title_input.setFont(QFont("Segoe UI", 11))
+        self.title_input.setFont(_FONT_INPUT)
         self.title_input.setAttribute(Qt.WA_MacShowFocusRect, False)
-        self.title_input.setStyleSheet(f"""
-            QLineEdit {{
-                background-color: {THEME['input_bg']};
-                border: 1px solid {THEME['border_color']};
-                border-radius: 8px;
-                padding: 10px 12px;
-                color: {THEME['text_primary']};
-                selection-background-color: #6bcf7f;
-                selection-color: #ffffff;
-            }}
-            QLineEdit:focus {{
-                border: 1px solid rgba(107, 207, 127, 0.6);
-                background-color: {THEME['input_bg_focus']};
-            }}
-            QLineEdit::selection {{
-                background-color: #6bcf7f !important;
-                color: #ffffff !important;
-            }}
-        """)
+        _set_style_if_changed(self.title_input, styles.title_input)
         self.title_input.returnPressed.connect(self._add_task)
         form_layout.addWidget(self.title_input)
         
@@ -4979,42 +6368,9 @@ class ModernTaskManager(QMainWindow):
         self.priority_combo = QComboBox()
         self.priority_combo.addItems(["⚡ Высокий", "⭐ Средний", "✓ Низкий"])
         self.priority_combo.setCurrentIndex(1)
-        self.priority_combo.setFont(QFont("Segoe UI", 10))
+        self.priority_combo.setFont(_FONT_COMBO)
         self.priority_combo.setAttribute(Qt.WA_MacShowFocusRect, False)
-        self.priority_combo.setStyleSheet(f"""
-            QComboBox {{
-                background-color: {THEME['input_bg']};
-                border: 1px solid {THEME['border_color']};
-                border-radius: 8px;
-                padding: 8px 12px;
-                color: {THEME['text_primary']};
-            }}
-            QComboBox:hover {{
-                background-color: {THEME['input_bg_focus']};
-            }}
-            QComboBox:focus {{
-                border: 1px solid rgba(107, 207, 127, 0.6);
-            }}
-            QComboBox::drop-down {{
-                border: none;
-            }}
-            QComboBox QAbstractItemView {{
-                background-color: {THEME['card_bg']};
-                border: 1px solid {THEME['border_color']};
-                color: {THEME['text_primary']};
-                outline: none;
-            }}
-            QComboBox QAbstractItemView::item {{
-                padding: 4px;
-            }}
-            QComboBox QAbstractItemView::item:hover {{
-                background-color: {THEME['card_bg_hover']};
-            }}
-            QComboBox QAbstractItemView::item:selected {{
-                background-color: {THEME['accent_bg']};
-                color: {THEME['accent_text']};
-            }}
-        """)
+        _set_style_if_changed(self.priority_combo, styles.priority_combo)
         # Убираем стретч-фактор 1, чтобы комбобокс не задавливал кнопку
         self.priority_combo.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Fixed)
         priority_layout.addWidget(self.priority_combo)
@@ -5022,27 +6378,19 @@ class ModernTaskManager(QMainWindow):
         self.add_btn = QPushButton("+ Добавить")
         # Используем Minimum, но с большим min-width
         self.add_btn.setSizePolicy(QSizePolicy.Minimum, QSizePolicy.Fixed)
-        self.add_btn.setFont(QFont("Segoe UI", 10, QFont.Medium))
+        self.add_btn.setFont(_FONT_BTN)
         self.add_btn.setCursor(QCursor(Qt.PointingHandCursor))
         # Жесткий минимум
         self.add_btn.setMinimumWidth(120) 
-        self.add_btn.setStyleSheet(f"""
-            QPushButton {{
-                background-color: {THEME['accent_bg']};
-                border: none;
-                border-radius: 8px;
-                padding: 8px 16px;
-                color: {THEME['accent_text']};
-            }}
-            QPushButton:hover {{
-                background-color: {THEME['accent_hover']};
-            }}
-        """)
+        _set_style_if_changed(self.add_btn, styles.add_btn)
         self.add_btn.clicked.connect(self._add_task)
         priority_layout.addWidget(self.add_btn)
         
         form_layout.addLayout(priority_layout)
         container_layout.addWidget(self.add_form)
+        # Поля ввода окна, получающие стиль полей темы (см. _do_refresh_styles).
+        # title_input сюда не входит: его таблица (scaled title_input) уже содержит цвета темы
+        self._themed_inputs = (self.priority_combo,)
         
         # === Кнопка фильтров (Компактная) ===
         filter_header_layout = QHBoxLayout()
@@ -5050,8 +6398,8 @@ class ModernTaskManager(QMainWindow):
         
         # Счетчик задач
         self.task_counter = QLabel("0 задач")
-        self.task_counter.setFont(QFont("Segoe UI", 9))
-        self.task_counter.setStyleSheet(f"color: {THEME['text_secondary']};")
+        self.task_counter.setFont(_FONT_COUNTER)
+        self.task_counter.setObjectName("taskCounter")
         self.task_counter.setTextInteractionFlags(Qt.NoTextInteraction)
         
         filter_header_layout.addWidget(self.task_counter)
@@ -5096,22 +6444,7 @@ class ModernTaskManager(QMainWindow):
         self.filter_btn.setCursor(Qt.PointingHandCursor)
         self.filter_btn.setFixedHeight(28)
         self.filter_btn.setMinimumWidth(130)
-        self.filter_btn.setStyleSheet(f"""
-            QPushButton {{
-                background-color: rgba(255, 255, 255, 0.05);
-                border: 1px solid {THEME['border_color']};
-                color: {THEME['text_secondary']};
-                border-radius: 14px;
-                padding: 0 12px;
-                font-size: 11px;
-                font-weight: 500;
-            }}
-            QPushButton:hover {{
-                background-color: rgba(255, 255, 255, 0.1);
-                border: 1px solid rgba(255, 255, 255, 0.2);
-                color: {THEME['text_primary']};
-            }}
-        """)
+        self.filter_btn.setObjectName("filterBtn")
         self.filter_btn.clicked.connect(self._show_filter_menu)
         filter_header_layout.addWidget(self.filter_btn)
         
@@ -5121,32 +6454,13 @@ class ModernTaskManager(QMainWindow):
         scroll = QScrollArea()
         scroll.setWidgetResizable(True)
         scroll.setFrameShape(QFrame.NoFrame)
-        scroll.setStyleSheet(f"""
-            QScrollArea {{
-                background: transparent;
-                border: none;
-            }}
-            QScrollBar:vertical {{
-                background: transparent;
-                width: 6px;
-                margin: 0px;
-            }}
-            QScrollBar::handle:vertical {{
-                background: {THEME['scroll_handle']};
-                min-height: 20px;
-                border-radius: 3px;
-            }}
-            QScrollBar::add-line:vertical, QScrollBar::sub-line:vertical {{
-                height: 0px;
-            }}
-            QScrollBar::add-page:vertical, QScrollBar::sub-page:vertical {{
-                background: none;
-            }}
-        """)
+        scroll.setObjectName("tasksScroll")
         
         # Контейнер для задач
         self.tasks_container = QWidget()
-        self.tasks_container.setStyleSheet("background: transparent;")
+        # Стиль только для самого контейнера, чтобы не перекрывать глобальные стили карточек
+        self.tasks_container.setObjectName("tasksContainer")
+        self.tasks_container.setStyleSheet("QWidget#tasksContainer { background: transparent; }")
         main_tasks_layout = QVBoxLayout(self.tasks_container)
         main_tasks_layout.setContentsMargins(0, 0, 0, 0)
         main_tasks_layout.setSpacing(0)  # Полностью убираем отступ
@@ -5154,7 +6468,7 @@ class ModernTaskManager(QMainWindow):
         # === Секция активных задач ===
         self.active_header = QLabel("📋 Активные задачи")
         self.active_header.setFont(ZoomManager.font("Segoe UI", 11, QFont.Bold))
-        self.active_header.setStyleSheet(f"color: {THEME['text_primary']}; padding: 0px;") # Убираем отступы
+        _set_style_if_changed(self.active_header, styles.active_header) # Убираем отступы
         main_tasks_layout.addWidget(self.active_header)
         
         # Контейнер для активных задач с поддержкой drop
@@ -5181,13 +6495,9 @@ class ModernTaskManager(QMainWindow):
         self.bottom_bar = QFrame()
         self.bottom_bar.setObjectName("bottomBar")
         self.bottom_bar.setFixedHeight(ZoomManager.scaled(45))
-        self.bottom_bar.setStyleSheet(f"""
-            QFrame#bottomBar {{
-                background-color: {THEME['card_bg']};
-                border: 1px solid {THEME['border_color']}; 
-                border-radius: 22px;
-            }}
-        """)
+        # Одна таблица стилей на панель: кнопки справки, обновления, инструментов и архива
+        # адресуются по objectName, их состояние - динамическими свойствами (см. _update_bottom_bar_styles)
+        _set_style_if_changed(self.bottom_bar, styles.bottom_bar)
         
         bottom_layout = QHBoxLayout(self.bottom_bar)
         bottom_layout.setContentsMargins(15, 0, 10, 0)
@@ -5198,29 +6508,93 @@ class ModernTaskManager(QMainWindow):
         # Контейнер для инструментов (скрыт по умолчанию)
         self.tools_container = QFrame()
         self.tools_container.setVisible(False) # Скрыто по умолчанию
+        _set_style_if_changed(self.tools_container, styles.tools_container)
         tools_layout = QHBoxLayout(self.tools_container)
         tools_layout.setContentsMargins(0, 0, 0, 0)
         tools_layout.setSpacing(8)
         
+        # Кнопки инструментов создаются при первом открытии панели (_build_tools)
+        self._tools_built = False
+
+        # Кнопка справки (Слева от обновления)
+        self.help_btn = QPushButton("❓")
+        self.help_btn.setObjectName("helpBtn")
+        self.help_btn.setFixedSize(32, 32)
+        self.help_btn.setCursor(QCursor(Qt.PointingHandCursor))
+        self.help_btn.setToolTip("О программе")
+        self.help_btn.clicked.connect(self._show_about)
+        bottom_layout.addWidget(self.help_btn)
+
+        # Кнопка проверки обновлений (с badge)
+        update_container = QWidget()
+        update_container.setFixedSize(32, 32)
+        update_container_layout = QVBoxLayout(update_container)
+        update_container_layout.setContentsMargins(0, 0, 0, 0)
+        update_container_layout.setSpacing(0)
+        
+        self.update_btn = QPushButton("🔄")
+        self.update_btn.setFixedSize(32, 32)
+        self.update_btn.setObjectName("updateBtn")  # Для точного применения стилей
+        self.update_btn.setCursor(QCursor(Qt.PointingHandCursor))
+        self.update_btn.setToolTip("Проверить обновления")
+        self.update_btn.clicked.connect(self._check_updates)
+        bottom_layout.addWidget(self.update_btn)
+
+        # Кнопка переключения инструментов (Слева)
+        self.toggle_tools_btn = QPushButton("🛠️")
+        self.toggle_tools_btn.setObjectName("toolsBtn")
+        self.toggle_tools_btn.setFixedSize(32, 32)
+        self.toggle_tools_btn.setCursor(QCursor(Qt.PointingHandCursor))
+        self.toggle_tools_btn.clicked.connect(self._toggle_tools)
+        bottom_layout.addWidget(self.toggle_tools_btn)
+        
+        # Начальная установка подсказок и инициализация стилей
+        self.toggle_tools_btn.setToolTip("Показать инструменты")
+        self._update_bottom_bar_styles()
+
+        # Добавляем контейнер инструментов в нижнюю панель (сразу за кнопкой)
+        bottom_layout.addWidget(self.tools_container)
+        
+        # Кнопка выполненных задач (справа, принимает drop перетаскиваемых задач)
+        self.completed_tasks_btn = QPushButton()
+        self.completed_tasks_btn.setObjectName("completedBtn")
+        self.completed_tasks_btn.setFixedSize(32, 32)
+        self.completed_tasks_btn.setCursor(QCursor(Qt.PointingHandCursor))
+        self.completed_tasks_btn.setToolTip("Архив задач")
+        self.completed_tasks_btn.clicked.connect(self._open_completed_tasks_dialog)
+        # Разрешаем drop на кнопку и обрабатываем его через eventFilter
+        self.completed_tasks_btn.setAcceptDrops(True)
+        self.completed_tasks_btn.installEventFilter(self)
+        bottom_layout.addWidget(self.completed_tasks_btn)
+        
+        # Спейсер, чтобы сдвинуть всё влево
+        bottom_layout.addStretch()
+        
+        # Добавляем нижнюю панель в контейнер с отступами для эффекта «пилюли»
+        bottom_wrapper = QWidget()
+        bottom_wrapper_layout = QHBoxLayout(bottom_wrapper)
+        bottom_wrapper_layout.setContentsMargins(15, 0, 15, 12)
+        bottom_wrapper_layout.setSpacing(0)
+        bottom_wrapper_layout.addWidget(self.bottom_bar)
+        container_layout.addWidget(bottom_wrapper)
+        
+        # Убеждаемся, что главный контейнер добавлен в основной лейаут центрального виджета
+        if main_layout.count() == 0:
+            main_layout.addWidget(self.main_container)
+    
+    
+    def _build_tools(self):
+        """Создание кнопок панели инструментов (откладывается до первого показа панели)"""
+        self._tools_built = True
+        styles = get_main_window_styles()
+        tools_layout = self.tools_container.layout()
+        
         # 1. Шрифт
         self.zoom_btn = QPushButton("Aa")
         self.zoom_btn.setFixedSize(32, 32)
         self.zoom_btn.setCursor(QCursor(Qt.PointingHandCursor))
         self.zoom_btn.setToolTip("Размер шрифта")
-        self.zoom_btn.setStyleSheet(f"""
-            QPushButton {{
-                background-color: transparent;
-                color: {THEME['text_primary']};
-                border: 1px solid {THEME['border_color']};
-                border-radius: 6px;
-                font-weight: bold;
-                font-size: 14px;
-            }}
-            QPushButton:hover {{
-                background-color: {THEME['secondary_hover']};
-                border-color: {THEME['accent_hover']};
-            }}
-        """)
+        self.zoom_btn.setObjectName("zoomBtn")
         self.zoom_btn.clicked.connect(self._show_zoom_slider)
         tools_layout.addWidget(self.zoom_btn)
         
@@ -5229,19 +6603,7 @@ class ModernTaskManager(QMainWindow):
         self.opacity_btn.setFixedSize(32, 32)
         self.opacity_btn.setCursor(QCursor(Qt.PointingHandCursor))
         self.opacity_btn.setToolTip("Прозрачность окна")
-        self.opacity_btn.setStyleSheet(f"""
-            QPushButton {{
-                background-color: transparent;
-                color: {THEME['text_primary']};
-                border: 1px solid {THEME['border_color']};
-                border-radius: 6px;
-                font-size: 16px;
-            }}
-            QPushButton:hover {{
-                background-color: {THEME['secondary_hover']};
-                border-color: {THEME['accent_hover']};
-            }}
-        """)
+        self.opacity_btn.setObjectName("opacityBtn")
         self.opacity_btn.clicked.connect(self._show_opacity_slider)
         tools_layout.addWidget(self.opacity_btn)
         
@@ -5249,7 +6611,7 @@ class ModernTaskManager(QMainWindow):
         sep = QFrame()
         sep.setFrameShape(QFrame.VLine)
         sep.setFixedSize(1, 20)
-        sep.setStyleSheet(f"background-color: {THEME['border_color']}; border: none;")
+        sep.setStyleSheet(styles.separator)
         tools_layout.addWidget(sep)
         
         # Кнопка управления тегами
@@ -5257,19 +6619,7 @@ class ModernTaskManager(QMainWindow):
         self.tags_btn.setFixedSize(32, 32)
         self.tags_btn.setCursor(QCursor(Qt.PointingHandCursor))
         self.tags_btn.setToolTip("Управление тегами")
-        self.tags_btn.setStyleSheet(f"""
-            QPushButton {{
-                background-color: transparent;
-                color: {THEME['text_primary']};
-                border: 1px solid {THEME['border_color']};
-                border-radius: 6px;
-                font-size: 16px;
-            }}
-            QPushButton:hover {{
-                background-color: {THEME['secondary_hover']};
-                border-color: {THEME['accent_hover']};
-            }}
-        """)
+        self.tags_btn.setObjectName("tagsBtn")
         self.tags_btn.clicked.connect(self._show_tags_manager)
         tools_layout.addWidget(self.tags_btn)
         
@@ -5279,52 +6629,22 @@ class ModernTaskManager(QMainWindow):
         self.minimal_mode_btn.setToolTip("Минималистичный режим")
         self.minimal_mode_btn.setCheckable(True)
         self.minimal_mode_btn.setFixedSize(24, 24)
-        self.minimal_mode_btn.setStyleSheet(f"""
-            QPushButton {{
-                background-color: transparent;
-                border: none;
-                color: {THEME['text_secondary']};
-                font-size: 16px;
-                border-radius: 4px;
-            }}
-            QPushButton:hover {{
-                background-color: {THEME['secondary_hover']};
-                color: {THEME['text_primary']};
-            }}
-            QPushButton:checked {{
-                background-color: {THEME['accent_bg']};
-                color: {THEME['accent_text']};
-            }}
-        """)
+        self.minimal_mode_btn.setObjectName("minimalModeBtn")
+        self.minimal_mode_btn.setProperty("class", "tool")
         self.minimal_mode_btn.clicked.connect(self._toggle_minimal_mode)
         tools_layout.addWidget(self.minimal_mode_btn)
         
         # Кнопка включения/выключения звуков
         # Загружаем состояние звуков из настроек
-        sounds_enabled = SettingsManager.get("sounds_enabled", True)
+        sounds_enabled = self._settings_snapshot.get("sounds_enabled", True)
+        SoundManager.set_enabled(sounds_enabled)
         self.sound_btn = QPushButton("🔊" if sounds_enabled else "🔇")
         self.sound_btn.setCursor(QCursor(Qt.PointingHandCursor))
         self.sound_btn.setToolTip("Выключить звуки" if sounds_enabled else "Включить звуки")
         self.sound_btn.setCheckable(True)
         self.sound_btn.setChecked(sounds_enabled)
         self.sound_btn.setFixedSize(24, 24)
-        self.sound_btn.setStyleSheet(f"""
-            QPushButton {{
-                background-color: transparent;
-                border: none;
-                color: {THEME['text_secondary']};
-                font-size: 14px;
-                border-radius: 4px;
-            }}
-            QPushButton:hover {{
-                background-color: {THEME['secondary_hover']};
-                color: {THEME['text_primary']};
-            }}
-            QPushButton:checked {{
-                background-color: {THEME['accent_bg']};
-                color: {THEME['accent_text']};
-            }}
-        """)
+        self.sound_btn.setProperty("class", "tool")
         self.sound_btn.clicked.connect(self._toggle_sounds)
         tools_layout.addWidget(self.sound_btn)
         
@@ -5335,23 +6655,7 @@ class ModernTaskManager(QMainWindow):
         self.pin_btn.setCheckable(True)
         self.pin_btn.setChecked(True) # По умолчанию у нас стоит StaysOnTop
         self.pin_btn.setFixedSize(24, 24)
-        self.pin_btn.setStyleSheet(f"""
-            QPushButton {{
-                background-color: transparent;
-                border: none;
-                color: {THEME['text_secondary']};
-                font-size: 14px;
-                border-radius: 4px;
-            }}
-            QPushButton:hover {{
-                background-color: {THEME['secondary_hover']};
-                color: {THEME['text_primary']};
-            }}
-            QPushButton:checked {{
-                background-color: {THEME['accent_bg']};
-                color: {THEME['accent_text']};
-            }}
-        """)
+        self.pin_btn.setProperty("class", "tool")
         self.pin_btn.clicked.connect(self._toggle_pin)
         tools_layout.addWidget(self.pin_btn)
         
@@ -5360,19 +6664,7 @@ class ModernTaskManager(QMainWindow):
         self.theme_btn.setCursor(QCursor(Qt.PointingHandCursor))
         self.theme_btn.setToolTip("Сменить цвет темы")
         self.theme_btn.setFixedSize(24, 24)
-        self.theme_btn.setStyleSheet(f"""
-            QPushButton {{
-                background-color: transparent;
-                border: none;
-                color: {THEME['text_secondary']};
-                font-size: 14px;
-                border-radius: 4px;
-            }}
-            QPushButton:hover {{
-                background-color: {THEME['secondary_hover']};
-                color: {THEME['text_primary']};
-            }}
-        """)
+        self.theme_btn.setProperty("class", "tool")
         self.theme_btn.clicked.connect(self._show_theme_menu)
         tools_layout.addWidget(self.theme_btn)
         
@@ -5382,119 +6674,15 @@ class ModernTaskManager(QMainWindow):
         self.report_btn.setFixedSize(24, 24)
         self.report_btn.setIcon(create_report_icon(size=20))
         self.report_btn.setIconSize(QSize(20, 20))
-        self.report_btn.setStyleSheet(f"""
-            QPushButton {{
-                background-color: transparent;
-                border: none;
-                border-radius: 4px;
-            }}
-            QPushButton:hover {{
-                background-color: {THEME['secondary_hover']};
-            }}
-        """)
+        self.report_btn.setProperty("class", "tool")
         self.report_btn.clicked.connect(self._open_time_report)
         tools_layout.addWidget(self.report_btn)
-        
-
-
-
-        # Кнопка справки (Слева от обновления)
-        self.help_btn = QPushButton("❓")
-        self.help_btn.setFixedSize(32, 32)
-        self.help_btn.setCursor(QCursor(Qt.PointingHandCursor))
-        self.help_btn.setToolTip("О программе")
-        self.help_btn.setStyleSheet(f"""
-            QPushButton {{
-                background-color: transparent;
-                color: #ff4d4d;
-                border: 1px solid {THEME['border_color']};
-                border-radius: 16px; 
-                font-size: 18px;
-                font-weight: bold;
-            }}
-            QPushButton:hover {{
-                background-color: {THEME['secondary_hover']};
-                border-color: #ff4d4d;
-            }}
-        """)
-        self.help_btn.clicked.connect(self._show_about)
-        bottom_layout.addWidget(self.help_btn)
-
-        # Кнопка проверки обновлений (с badge)
-        update_container = QWidget()
-        update_container.setFixedSize(32, 32)
-        update_container_layout = QVBoxLayout(update_container)
-        update_container_layout.setContentsMargins(0, 0, 0, 0)
-        update_container_layout.setSpacing(0)
-        
-        self.update_btn = QPushButton("🔄")
-        self.update_btn.setFixedSize(32, 32)
-        self.update_btn.setObjectName("updateBtn")  # Для точного применения стилей
-        self.update_btn.setCursor(QCursor(Qt.PointingHandCursor))
-        self.update_btn.setToolTip("Проверить обновления")
-        self.update_btn.setStyleSheet(f"""
-            QPushButton {{
-                background-color: transparent;
-                color: {THEME['text_secondary']};
-                border: 1px solid {THEME['border_color']};
-                border-radius: 16px; 
-                font-size: 16px;
-            }}
-            QPushButton:hover {{
-                background-color: {THEME['secondary_hover']};
-                color: {THEME['text_primary']};
-                border-color: {THEME['accent_hover']};
-            }}
-        """)
-        self.update_btn.clicked.connect(self._check_updates)
-        bottom_layout.addWidget(self.update_btn)
-
-        # Кнопка переключения инструментов (Слева)
-        self.toggle_tools_btn = QPushButton("🛠️")
-        self.toggle_tools_btn.setObjectName("toolsBtn")
-        self.toggle_tools_btn.setFixedSize(32, 32)
-        self.toggle_tools_btn.setCursor(QCursor(Qt.PointingHandCursor))
-        self.toggle_tools_btn.clicked.connect(self._toggle_tools)
-        bottom_layout.addWidget(self.toggle_tools_btn)
-        
-        # Начальная установка подсказок и инициализация стилей
-        self.toggle_tools_btn.setToolTip("Показать инструменты")
-        self._update_bottom_bar_styles()
 
-        # Добавляем контейнер инструментов в нижнюю панель (сразу за кнопкой)
-        bottom_layout.addWidget(self.tools_container)
-        
-        # Кнопка выполненных задач (справа, принимает drop перетаскиваемых задач)
-        self.completed_tasks_btn = QPushButton()
-        self.completed_tasks_btn.setFixedSize(32, 32)
-        self.completed_tasks_btn.setCursor(QCursor(Qt.PointingHandCursor))
-        self.completed_tasks_btn.setToolTip("Архив задач")
-        self.completed_tasks_btn.clicked.connect(self._open_completed_tasks_dialog)
-        # Разрешаем drop на кнопку и обрабатываем его через eventFilter
-        self.completed_tasks_btn.setAcceptDrops(True)
-        self.completed_tasks_btn.installEventFilter(self)
-        self._update_completed_btn_style()
-        bottom_layout.addWidget(self.completed_tasks_btn)
-        
-        # Спейсер, чтобы сдвинуть всё влево
-        bottom_layout.addStretch()
-        
-        # Добавляем нижнюю панель в контейнер с отступами для эффекта «пилюли»
-        bottom_wrapper = QWidget()
-        bottom_wrapper_layout = QHBoxLayout(bottom_wrapper)
-        bottom_wrapper_layout.setContentsMargins(15, 0, 15, 12)
-        bottom_wrapper_layout.setSpacing(0)
-        bottom_wrapper_layout.addWidget(self.bottom_bar)
-        container_layout.addWidget(bottom_wrapper)
-        
-        # Убеждаемся, что главный контейнер добавлен в основной лейаут центрального виджета
-        if main_layout.count() == 0:
-            main_layout.addWidget(self.main_container)
-    
-    
     def _toggle_tools(self):
         """Переключение видимости панели инструментов"""
         is_visible = self.tools_container.isVisible()
+        if not self._tools_built:
+            self._build_tools()
         self.tools_container.setVisible(not is_visible)
         
         # Обновляем подсказку
@@ -5503,33 +6691,6 @@ class ModernTaskManager(QMainWindow):
         # Обновляем стили всех кнопок через центральный метод
         self._update_bottom_bar_styles()
     
-    def _open_completed_tasks_dialog(self):
-        """Открытие диалога выполненных задач"""
-        dialog = CompletedTasksDialog(self)
-        
-        # Фильтруем выполненные задачи
-        completed_tasks = [t for t in self.tasks if t.status == "Выполнено"]
-        
-        dialog.set_tasks(completed_tasks, self)
-        dialog.exec()
-    
-    def _update_completed_btn_style(self):
-        """Обновление стиля кнопки выполненных задач"""
-        if hasattr(self, 'completed_tasks_btn'):
-            self.completed_tasks_btn.setStyleSheet(f"""
-                QPushButton {{
-                    background-color: transparent;
-                    color: {THEME['text_secondary']};
-                    border: 1px solid {THEME['border_color']};
-                    border-radius: 16px; 
-                    font-size: 16px;
-                }}
-                QPushButton:hover {{
-                    background-color: {THEME['secondary_hover']};
-                    color: {THEME['text_primary']};
-                    border-color: {THEME['accent_hover']};
-                }}
-            """)
     def _open_time_report(self):
         """Открытие диалога отчета по времени"""
         dialog = TimeReportDialog(self)
@@ -5551,41 +6712,39 @@ class ModernTaskManager(QMainWindow):
         from PySide6.QtWidgets import QMenu
         from PySide6.QtGui import QAction
         
-        menu = QMenu(self)
-        menu.setStyleSheet(f"""
-            QMenu {{
-                background-color: {THEME['card_bg']};
-                border: 1px solid {THEME['border_color']};
-                border-radius: 8px;
-                padding: 4px;
-            }}
-            QMenu::item {{
-                padding: 8px 16px;
-                border-radius: 4px;
-                color: {THEME['text_primary']};
-            }}
-            QMenu::item:selected {{
-                background-color: {THEME['accent_bg']};
-                color: {THEME['accent_text']};
-            }}
-        """)
-        
-        # Опция "Все теги"
-        all_action = QAction("🔘 Все теги", self)
-        all_action.setCheckable(True)
-        all_action.setChecked(self.current_tag_filter is None)
-        all_action.triggered.connect(lambda: self._set_tag_filter(None))
-        menu.addAction(all_action)
-        
-        menu.addSeparator()
-        
-        # Опции для каждого тега
-        for tag in sorted(all_tags):
-            action = QAction(f"🏷️ {tag}", self)
-            action.setCheckable(True)
-            action.setChecked(self.current_tag_filter == tag)
-            action.triggered.connect(lambda checked, t=tag: self._set_tag_filter(t))
-            menu.addAction(action)
+        # Меню создается один раз; пункты пересобираются только при смене набора тегов
+        menu = self._tags_menu
+        if menu is None:
+            menu = self._tags_menu = QMenu(self)
+            # Одно соединение на все меню: тег берется из данных сработавшего действия
+            menu.triggered.connect(self._on_tag_action_triggered)
+        _set_style_if_changed(menu, get_main_window_styles().tags_menu)
+        
+        tags_key = frozenset(all_tags)
+        if tags_key != self._tags_menu_tags:
+            self._tags_menu_tags = tags_key
+            menu.clear()  # Действия принадлежат меню и удаляются вместе с пунктами
+            
+            # Опция "Все теги"
+            all_action = QAction("🔘 Все теги", menu)
+            all_action.setCheckable(True)
+            all_action.setData(None)
+            menu.addAction(all_action)
+            
+            menu.addSeparator()
+            
+            # Опции для каждого тега
+            for tag in sorted(all_tags):
+                action = QAction(f"🏷️ {tag}", menu)
+                action.setCheckable(True)
+                action.setData(tag)
+                menu.addAction(action)
+        
+        # Отмечаем текущий фильтр
+        current = self.current_tag_filter
+        for action in menu.actions():
+            if action.isCheckable():
+                action.setChecked(action.data() == current)
         
         # Показываем меню над кнопкой
         menu.adjustSize()  # Подгоняем размер меню
@@ -5593,16 +6752,44 @@ class ModernTaskManager(QMainWindow):
         menu_pos = QPoint(btn_pos.x(), btn_pos.y() - menu.height() - 4)
         
         # Проверка границ экрана
-        screen_geo = self.screen().geometry()
-        if menu_pos.y() < screen_geo.top():
+        if menu_pos.y() < self._screen_geo().top():
             menu_pos.setY(btn_pos.y() + self.tags_btn.height() + 4)  # Если не помещается вверху, показываем внизу
         
         menu.exec(menu_pos)
     
+    def _on_tag_action_triggered(self, action):
+        """Выбор пункта в меню тегов"""
+        self._set_tag_filter(action.data())
+    
     def _set_tag_filter(self, tag):
         """Установка фильтра по тегу"""
         self.current_tag_filter = tag
-        self._refresh_tasks()
+        # Данные не менялись - достаточно спрятать/показать готовые карточки
+        self._apply_card_filters()
+    
+    def _screen_geo(self):
+        """Геометрия экрана окна (кэш до следующего перемещения окна)"""
+        geo = self._screen_geo_cache
+        if geo is None:
+            geo = self._screen_geo_cache = self.screen().geometry()
+        return geo
+    
+    def _position_popup_above(self, btn, popup):
+        """Поставить всплывающее окно по центру над кнопкой, не выходя за края экрана"""
+        # Важно: сначала подгоняем размер, чтобы знать высоту
+        popup.adjustSize()
+        
+        pos = btn.mapToGlobal(QPoint(0, 0))
+        width = popup.width()
+        x = pos.x() - (width - btn.width()) // 2
+        y = pos.y() - popup.height() - 10
+        
+        # Проверка границ экрана
+        screen_geo = self._screen_geo()
+        if x < screen_geo.left(): x = screen_geo.left() + 5
+        if x + width > screen_geo.right(): x = screen_geo.right() - width - 5
+        
+        popup.move(x, y)
     
     def _show_zoom_slider(self):
         """Показать вертикальный слайдер масштаба"""
@@ -5618,20 +6805,7 @@ class ModernTaskManager(QMainWindow):
             on_change=self._on_zoom_changed
         )
         
-        # Важно: сначала подгоняем размер, чтобы знать высоту
-        popup.adjustSize()
-        
-        # Позиционируем над кнопкой
-        pos = self.zoom_btn.mapToGlobal(QPoint(0, 0))
-        x = pos.x() - (popup.width() - self.zoom_btn.width()) // 2
-        y = pos.y() - popup.height() - 10
-        
-        # Проверка границ экрана
-        screen_geo = self.screen().geometry()
-        if x < screen_geo.left(): x = screen_geo.left() + 5
-        if x + popup.width() > screen_geo.right(): x = screen_geo.right() - popup.width() - 5
-        
-        popup.move(x, y)
+        self._position_popup_above(self.zoom_btn, popup)
         popup.exec()
 
     def _show_opacity_slider(self):
@@ -5651,24 +6825,13 @@ class ModernTaskManager(QMainWindow):
             on_change=on_opacity_change
         )
         
-        # Важно: сначала подгоняем размер, чтобы знать высоту
-        popup.adjustSize()
-        
-        # Позиционируем над кнопкой
-        pos = self.opacity_btn.mapToGlobal(QPoint(0, 0))
-        x = pos.x() - (popup.width() - self.opacity_btn.width()) // 2
-        y = pos.y() - popup.height() - 10
-
-        # Проверка границ экрана
-        screen_geo = self.screen().geometry()
-        if x < screen_geo.left(): x = screen_geo.left() + 5
-        if x + popup.width() > screen_geo.right(): x = screen_geo.right() - popup.width() - 5
-        
-        popup.move(x, y)
+        self._position_popup_above(self.opacity_btn, popup)
         popup.exec()
 
     def mousePressEvent(self, event):
         """Начало перетаскивания окна"""
+        # Клик по окну закрывает открытые попапы и подсказки
+        self._force_close_popups()
         if event.button() == Qt.LeftButton:
             self.drag_position = event.globalPosition().toPoint() - self.frameGeometry().topLeft()
             event.accept()
@@ -5685,49 +6848,61 @@ class ModernTaskManager(QMainWindow):
     
     def moveEvent(self, event):
         """Обработка перемещения окна"""
-        # Закрываем меню фильтров при перемещении окна
-        if self._active_filter_menu and self._active_filter_menu.isVisible():
-            self._active_filter_menu.close()
-            self._active_filter_menu = None
+        # lParam в WM_NCHITTEST - экранные координаты, после перемещения кэш неактуален
+        self._nchittest_cache = None
+        # Окно могло перейти на другой экран
+        self._screen_geo_cache = None
+        # Закрываем меню фильтров, комбобоксы, попапы и подсказки при перемещении окна
+        # (без открытых попапов _force_close_popups сразу возвращается)
+        self._force_close_popups()
         super().moveEvent(event)
     
     def eventFilter(self, obj, event):
         """Фильтр событий: позиция grip и drop на кнопку выполненных задач"""
+        et = event.type()
+        if et not in _MAIN_FILTER_EVENT_TYPES:
+            return super().eventFilter(obj, event)
+        
+        # Геометрия кнопок-исключений/заголовка для WM_NCHITTEST устарела
+        if et in _GEOMETRY_EVENT_TYPES and self._hit_rect_watched and obj in self._hit_rect_watched:
+            self._hit_rects = None
+            self._nchittest_cache = None
+        
         # Закрываем меню фильтров при перемещении главного окна
-        if obj == self and event.type() == QEvent.Move:
+        if et == _MOVE_TYPE and obj is self:
             if self._active_filter_menu and self._active_filter_menu.isVisible():
                 self._active_filter_menu.close()
                 self._active_filter_menu = None
         
         # Предотвращаем перетаскивание окна при клике на кнопку фильтров
-        if hasattr(self, 'filter_btn') and obj == self.filter_btn:
-            if event.type() == QEvent.MouseButtonPress:
+        if obj is self.filter_btn and obj is not None:
+            if et == QEvent.MouseButtonPress:
                 # Останавливаем перетаскивание окна, если оно началось
                 self.drag_position = None
                 # Принимаем событие, чтобы оно не передавалось дальше
                 return False
-            elif event.type() == QEvent.MouseMove:
+            elif et == QEvent.MouseMove:
                 # Если мышь движется над кнопкой, не начинаем перетаскивание
                 if event.buttons() == Qt.LeftButton:
                     self.drag_position = None
                 return False
         
         # Обновление позиции grip внизу окна
-        if hasattr(self, 'grip_container') and obj == self.grip_container and event.type() == QEvent.Resize:
-            if hasattr(self, 'grip_wrapper'):
+        if et == QEvent.Resize and self.grip_container is not None and obj is self.grip_container:
+            if self.grip_wrapper is not None:
                 # Размер кнопки 24x24, отступы контейнера 20px, позиционируем: ширина - отступ - размер кнопки
                 self.grip_wrapper.move(obj.width() - 44, obj.height() - 44)
                 self.grip_wrapper.raise_()
 
         # Поддержка drag&drop задач на кнопку выполненных задач
-        if hasattr(self, 'completed_tasks_btn') and obj == self.completed_tasks_btn:
+        if obj is self.completed_tasks_btn and obj is not None:
             # При наведении с drag принимаем событие (если в mime есть id задачи)
-            if event.type() in (QEvent.DragEnter, QEvent.DragMove):
+            if et in _DRAG_OVER_EVENT_TYPES:
                 if event.mimeData().hasText():
                     event.acceptProposedAction()
                     return True
             # Обработка сброса задачи на кнопку
-            if event.type() == QEvent.Drop:
+            if et == QEvent.Drop:
                 if event.mimeData().hasText():
                     task_id = event.mimeData().text()
                     # Переносим задачу в выполненные
@@ -5740,105 +6915,152 @@ class ModernTaskManager(QMainWindow):
     def showEvent(self, event):
         """Обновление позиции grip при показе окна"""
         super().showEvent(event)
-        if hasattr(self, 'grip_wrapper') and hasattr(self, 'grip_container'):
+        if self.grip_wrapper is not None and self.grip_container is not None:
             # Используем QTimer для отложенного обновления после полной отрисовки
             from PySide6.QtCore import QTimer
             QTimer.singleShot(10, lambda: self._update_grip_position())
     
     def _update_grip_position(self):
         """Обновление позиции grip"""
-        if hasattr(self, 'grip_wrapper') and hasattr(self, 'grip_container'):
+        if self.grip_wrapper is not None and self.grip_container is not None:
             # Размер кнопки 24x24, отступы контейнера 20px, позиционируем: ширина - отступ - размер кнопки
             self.grip_wrapper.move(self.grip_container.width() - 44, self.grip_container.height() - 44)
             self.grip_wrapper.raise_()
     
+    def changeEvent(self, event):
+        """Отслеживание развернутого состояния окна для WM_NCHITTEST"""
+        if event.type() == QEvent.WindowStateChange:
+            self._is_maximized = bool(self.windowState() & (Qt.WindowMaximized | Qt.WindowFullScreen))
+            self._nchittest_cache = None
+        super().changeEvent(event)
+    
     def resizeEvent(self, event):
         """Обновление позиции grip при изменении размера окна"""
         super().resizeEvent(event)
+        size = event.size()
+        self._w = size.width()
+        self._h = size.height()
+        self._nchittest_cache = None
+        self._hit_rects = None
         self._update_grip_position()
     
     def _load_tasks(self):
         """Загрузка задач"""
         self.tasks = TaskStorage.load()
+        self._tasks_by_id = {t.id: t for t in self.tasks}
+        self._next_id = max((t.id for t in self.tasks), default=0) + 1
         # Проверяем и создаем повторяющиеся задачи
         self._check_recurring_tasks()
+        self._sync_timer_ticks()
+    
+    def _task_by_id(self, task_id):
+        """Задача по ID через индекс (None, если задачи нет)"""
+        return self._tasks_by_id.get(task_id)
+    
+    def _schedule_save(self):
+        """Отложенное сохранение задач (см. _save_timer)"""
+        self._save_timer.start()
+    
+    def _flush_save(self):
+        """Снимок задач в GUI-потоке и запись его на диск в фоновом"""
+        self._save_timer.stop()
+        self._time_save_timer.stop()
+        data = [asdict(t) for t in self.tasks]
+        self._save_pool.start(lambda: TaskStorage.write(data))
+    
+    def _save_now(self):
+        """Сохранение перед выходом: отложенная запись сразу, затем ожидание фоновых"""
+        if self._save_timer.isActive() or self._time_save_timer.isActive():
+            self._flush_save()
+        self._save_pool.waitForDone()
+    
+    def _schedule_refresh(self):
+        """Отложенное обновление списка задач (см. _tasks_refresh_timer)"""
+        self._tasks_refresh_timer.start()
     
     def _refresh_tasks(self):
         """Обновление списка задач"""
+        # Прямой вызов выполняет и отложенный запрос, если он был
+        self._tasks_refresh_timer.stop()
+        
         # Проверяем, существуют ли layouts
-        if not hasattr(self, 'active_tasks_layout') or self.active_tasks_layout is None:
+        if self.active_tasks_layout is None:
             return
         
-        # Очистка активных задач
-        while self.active_tasks_layout.count() > 0:
-            item = self.active_tasks_layout.takeAt(0)
-            if item.widget():
-                item.widget().deleteLater()
-        
-        # Очистка активных задач
-        while self.active_tasks_layout.count() > 0:
-            item = self.active_tasks_layout.takeAt(0)
-            if item.widget():
-                item.widget().deleteLater()
+        # Убираем растяжку в конце списка (карточки остаются в layout и переиспользуются)
+        layout = self.active_tasks_layout
+        for i in reversed(range(layout.count())):
+            if layout.itemAt(i).widget() is None:
+                layout.takeAt(i)
         
         # Фильтрация задач по дате
         current_date_str = self.selected_date.toString("yyyy-MM-dd")
         is_today = self.selected_date == QDate.currentDate()
         
-        filtered_tasks = []
+        # Один проход: фильтр по дате и разделение на активные/выполненные.
+        # Фильтры по приоритету и тегу сюда не входят - они только прячут
+        # карточки (см. _apply_card_filters), чтобы смена фильтра не перепривязывала их.
+        # Активные сразу раскладываются по приоритету (high, medium, low, прочие) -
+        # порядок внутри группы сохраняется, как при стабильной сортировке
+        total = 0
+        by_priority = ([], [], [], [])
+        completed_count = 0
         for task in self.tasks:
+            due = task.due_date
             # Если сегодня - показываем:
             # 1. Задачи без даты (старые/Inbox)
             # 2. Задачи на сегодня
             # 3. Просроченные задачи (дата меньше сегодня)
-            if is_today:
-                if not task.due_date:
-                    filtered_tasks.append(task)
-                elif task.due_date <= current_date_str:
-                    filtered_tasks.append(task)
             # Иначе показываем только по точному совпадению даты
-            elif task.due_date == current_date_str:
-                filtered_tasks.append(task)
-        
-        # Разделяем на активные и выполненные
-        active_tasks = [t for t in filtered_tasks if t.status != "Выполнено"]
-        completed_tasks = [t for t in filtered_tasks if t.status == "Выполнено"]
-        
-        # Применяем дополнительные фильтры
-        if self.current_filter in ["high", "medium", "low"]:
-            active_tasks = [t for t in active_tasks if t.priority == self.current_filter]
-        
-        # Фильтрация по тегам
-        if self.current_tag_filter:
-            active_tasks = [t for t in active_tasks if hasattr(t, 'tags') and t.tags and self.current_tag_filter in t.tags]
-        
-        # Сортировка активных по приоритету
-        priority_map = {"high": 0, "medium": 1, "low": 2}
-        active_tasks.sort(key=lambda t: priority_map.get(t.priority, 3))
+            if is_today:
+                if due and due > current_date_str:
+                    continue
+            elif due != current_date_str:
+                continue
+            total += 1
+            
+            if task.status == "Выполнено":
+                completed_count += 1
+                continue
+            by_priority[_PRIORITY_ORDER.get(task.priority, 3)].append(task)
         
-        # Добавление карточек активных задач
-        for task in active_tasks:
-            card = TaskCard(task, self)
-            card.setAcceptDrops(False)  # Карточки не принимают drop
-            self.active_tasks_layout.addWidget(card)
+        active_tasks = [task for group in by_priority for task in group]
         
-        if active_tasks:
-             self.active_tasks_layout.addStretch()
+        # Карточки активных задач: из пула по порядку, новые создаются только при нехватке.
+        # Перепривязка идет без перерисовки - список перерисуется один раз в конце
+        container = self.active_tasks_container
+        container.setUpdatesEnabled(False)
+        try:
+            pool = self._card_pool
+            for index, task in enumerate(active_tasks):
+                if index < len(pool):
+                    card = pool[index]
+                    card.rebind(task)
+                else:
+                    card = TaskCard(task, self)
+                    card.setAcceptDrops(False)  # Карточки не принимают drop
+                    layout.addWidget(card)
+                    pool.append(card)
+            # Лишние карточки прячем до следующего обновления
+            for card in pool[len(active_tasks):]:
+                card.hide()
+            # Видимые карточки по ID задачи - для ежесекундного обновления таймеров
+            self._card_by_task_id = {task.id: card for task, card in zip(active_tasks, pool)}
+            self._apply_card_filters()
+            
+            if active_tasks:
+                 layout.addStretch()
+        finally:
+            container.setUpdatesEnabled(True)
              
         # Обновление иконки выполненных задач
-        self._update_completed_btn_icon(len(completed_tasks))
-        
-        # Обновляем стиль кнопки выполненных задач
-        self._update_completed_btn_style()
+        self._update_completed_btn_icon(completed_count)
         
         # Обновляем уведомления
         self._check_overdue_tasks()
         
         # Обновление счетчиков
-        total = len(filtered_tasks)
-        completed_count = len(completed_tasks)
-        
-        tasks_word = pluralize(total, ('задача', 'задачи', 'задач'))
+        tasks_word = pluralize(total, _TASKS_PLURAL)
         self.task_counter.setText(f"{total} {tasks_word}")
         
         # Устанавливаем максимальную высоту для активных задач - ОТКЛЮЧЕНО
@@ -5846,61 +7068,38 @@ class ModernTaskManager(QMainWindow):
         self.active_tasks_container.setMaximumHeight(16777215)
         self.active_tasks_container.setMinimumHeight(0)
         
-        # Подстраиваем размер окна
-        self._adjust_window_size(len(active_tasks), completed_count)
+        # Подстраиваем размер окна (только один раз, при первом заполнении списка)
+        if not self._initial_resize_done:
+            self._adjust_window_size(len(active_tasks), completed_count)
+
+    def _apply_card_filters(self):
+        """Показать карточки активных задач, подходящие под фильтры приоритета и тега"""
+        prio_filter = self.current_filter if self.current_filter in ("high", "medium", "low") else None
+        tag_filter = self.current_tag_filter
+        for card in self._card_by_task_id.values():
+            task = card.task
+            card.setVisible(
+                (not prio_filter or task.priority == prio_filter)
+                and (not tag_filter or bool(task.tags and tag_filter in task.tags))
+            )
 
     def _update_completed_btn_icon(self, count):
         """Обновление иконки кнопки выполненных задач с индикатором"""
-        if not hasattr(self, 'completed_tasks_btn'):
+        if self.completed_tasks_btn is None:
             return
-            
-        # Базовая иконка (галочка)
-        # Создаем пустой Pixmap
-        size = 32
-        pixmap = QPixmap(size, size)
-        pixmap.fill(Qt.transparent)
-        
-        painter = QPainter(pixmap)
-        painter.setRenderHint(QPainter.Antialiasing)
-        
-        # Рисуем галочку (текст)
-        font = QFont("Segoe UI Emoji", 16)
-        painter.setFont(font)
-        painter.setPen(QColor(THEME['text_secondary']))
-        # Центрируем галочку
-        painter.drawText(QRect(0, 0, size, size), Qt.AlignCenter, "✅")
         
-        # Если есть задачи, рисуем красную точку
-        if count > 0:
-            dot_size = 10
-            painter.setBrush(QColor("#ff4d4d")) # Красный
-            painter.setPen(Qt.NoPen)
-            # Рисуем в правом верхнем углу
-            painter.drawEllipse(size - dot_size - 2, 2, dot_size, dot_size)
-            
-        painter.end()
+        # Иконка зависит только от наличия выполненных задач и цвета темы
+        key = (count > 0, THEME['text_secondary'])
+        if key == self._completed_icon_key:
+            return
+        self._completed_icon_key = key
         
-        self.completed_tasks_btn.setIcon(QIcon(pixmap))
+        self.completed_tasks_btn.setIcon(_completed_btn_icon(*key))
         self.completed_tasks_btn.setIconSize(QSize(24, 24))
-        
-        # Обновляем стиль для соответствия остальным кнопкам (граница)
-        self.completed_tasks_btn.setStyleSheet(f"""
-            QPushButton {{
-                background-color: transparent;
-                color: {THEME['text_secondary']};
-                border: 1px solid {THEME['border_color']};
-                border-radius: 16px; 
-            }}
-            QPushButton:hover {{
-                background-color: {THEME['secondary_hover']};
-                color: {THEME['text_primary']};
-                border-color: {THEME['accent_hover']};
-            }}
-        """)
-
-    def _open_completed_tasks_dialog(self):
-        """Открытие диалога выполненных задач"""
-        dialog = CompletedTasksDialog(self)
+
+    def _open_completed_tasks_dialog(self):
+        """Открытие диалога выполненных задач"""
+        dialog = CompletedTasksDialog(self)
         
         # Фильтруем выполненные задачи
         completed_tasks = [t for t in self.tasks if t.status == "Выполнено"]
@@ -5908,17 +7107,13 @@ class ModernTaskManager(QMainWindow):
         # Используем отдельный список для диалога, но передаем self как родительское окно
         dialog.set_tasks(completed_tasks, self)
         dialog.exec()
-        
-        # После закрытия диалога обновляем список, так как задачи могли восстановить/удалить
-        self._load_tasks()
-        self._refresh_tasks()
+        # Перечитывать задачи с диска после закрытия не нужно: карточки архива
+        # восстанавливают/удаляют задачи через методы окна (toggle_task_status,
+        # delete_task, edit_task), которые сразу сохраняют и обновляют список
 
     def _adjust_window_size(self, active_count, completed_count):
-        """Автоматическая подстройка размера окна на основе количества задач"""
-        # Если это не первый запуск, не меняем размер окна автоматически
-        if getattr(self, '_initial_resize_done', False):
-            return
-
+        """Автоматическая подстройка размера окна на основе количества задач
+        (вызывается один раз при старте - после этого размер окна не меняется автоматически)"""
         self._initial_resize_done = True
         # Вычисляем высоту для активных задач (максимум 4)
         visible_active = min(active_count, self.MAX_VISIBLE_ACTIVE)
@@ -5944,6 +7139,8 @@ class ModernTaskManager(QMainWindow):
 
     def _on_date_changed(self, date):
         """Обработка смены даты"""
+        if date == self.selected_date:
+            return  # Та же дата - список уже актуален
         self.selected_date = date
         # НЕ проверяем повторяющиеся задачи при смене даты в навигаторе
         # Проверка выполняется только при загрузке приложения
@@ -5951,20 +7148,26 @@ class ModernTaskManager(QMainWindow):
     
     def _check_recurring_tasks(self):
         """Проверка и создание повторяющихся задач"""
+        # Нет активных повторяющихся задач - нечего проверять и сохранять
+        if not any(t.repeat_type and t.status != "Выполнено" for t in self.tasks):
+            return
+        
         today = QDate.currentDate()
         today_str = today.toString("yyyy-MM-dd")
         tasks_to_add = []
         tasks_to_update = []
         
         # Получаем список всех существующих дат задач для проверки дубликатов
-        existing_dates = set()
-        for t in self.tasks:
-            if t.due_date and t.title:  # Проверяем по дате и названию
-                existing_dates.add((t.due_date, t.title))
+        existing_dates = {(t.due_date, t.title) for t in self.tasks if t.due_date and t.title}
+        
+        # Все созданные за одну проверку задачи получают одно время создания
+        created_str = datetime.now().strftime("%d.%m.%Y %H:%M")
+        from_string = QDate.fromString
         
         for task in self.tasks:
-            # Пропускаем задачи без повторения или уже выполненные
-            if not task.repeat_type:
+            # Пропускаем задачи без повторения или с неизвестным типом повторения
+            interval = REPEAT_INTERVAL_DAYS.get(task.repeat_type)
+            if interval is None:
                 continue
             
             # Пропускаем выполненные задачи - они не должны создавать повторения
@@ -5975,110 +7178,53 @@ class ModernTaskManager(QMainWindow):
             if not task.due_date:
                 continue
                 
-            task_date = QDate.fromString(task.due_date, "yyyy-MM-dd")
+            task_date = from_string(task.due_date, "yyyy-MM-dd")
             if not task_date.isValid():
                 continue
             
-            # Определяем дату для следующего повторения
+            # Следующая дата отсчитывается от последнего повторения или от даты задачи
             last_repeated = None
             if task.last_repeated_date:
-                last_repeated = QDate.fromString(task.last_repeated_date, "yyyy-MM-dd")
+                last_repeated = from_string(task.last_repeated_date, "yyyy-MM-dd")
+            if last_repeated and last_repeated.isValid():
+                next_date = last_repeated.addDays(interval)
+            else:
+                next_date = task_date.addDays(interval)
             
-            # Вычисляем следующую дату повторения
-            next_date = None
+            # Создаем только одну задачу, если следующая дата уже наступила
+            if next_date > today:
+                continue
+            date_str = next_date.toString("yyyy-MM-dd")
+            # Проверяем, что такой задачи еще нет
+            if (date_str, task.title) in existing_dates:
+                continue
             
-            if task.repeat_type == "daily":
-                # Ежедневно: следующая дата = завтра от последнего повторения или от даты задачи
-                if last_repeated and last_repeated.isValid():
-                    next_date = last_repeated.addDays(1)
-                else:
-                    # Первое повторение: создаем на следующий день после даты задачи
-                    next_date = task_date.addDays(1)
-                
-                # Создаем только одну задачу на следующий день, если она еще не наступила в будущем
-                # и такой задачи еще нет
-                if next_date <= today:
-                    date_str = next_date.toString("yyyy-MM-dd")
-                    # Проверяем, что такой задачи еще нет
-                    if (date_str, task.title) not in existing_dates:
-                        new_id = max([t.id for t in self.tasks], default=0) + len(tasks_to_add) + 1
-                        new_task = Task(
-                            id=new_id,
-                            title=task.title,
-                            description=task.description,
-                            priority=task.priority,
-                            status="Не выполнено",
-                            due_date=date_str,
-                            created=datetime.now().strftime("%d.%m.%Y %H:%M"),
-                            repeat_type=task.repeat_type,
-                            last_repeated_date=None
-                        )
-                        tasks_to_add.append(new_task)
-                        existing_dates.add((date_str, task.title))
-                        # Обновляем дату последнего повторения на дату созданной задачи
-                        task.last_repeated_date = date_str
-                        tasks_to_update.append(task)
-                        
-            elif task.repeat_type == "weekly":
-                # Еженедельно: следующая дата через 7 дней
-                if last_repeated and last_repeated.isValid():
-                    next_date = last_repeated.addDays(7)
-                else:
-                    next_date = task_date.addDays(7)
-                
-                # Создаем только если следующая дата уже наступила
-                if next_date <= today:
-                    date_str = next_date.toString("yyyy-MM-dd")
-                    # Проверяем, что такой задачи еще нет
-                    if (date_str, task.title) not in existing_dates:
-                        new_id = max([t.id for t in self.tasks], default=0) + len(tasks_to_add) + 1
-                        new_task = Task(
-                            id=new_id,
-                            title=task.title,
-                            description=task.description,
-                            priority=task.priority,
-                            status="Не выполнено",
-                            due_date=date_str,
-                            created=datetime.now().strftime("%d.%m.%Y %H:%M"),
-                            repeat_type=task.repeat_type,
-                            last_repeated_date=None
-                        )
-                        tasks_to_add.append(new_task)
-                        task.last_repeated_date = today_str
-                        tasks_to_update.append(task)
-                        
-            elif task.repeat_type == "monthly":
-                # Ежемесячно: следующая дата через 30 дней
-                if last_repeated and last_repeated.isValid():
-                    next_date = last_repeated.addDays(30)
-                else:
-                    next_date = task_date.addDays(30)
-                
-                # Создаем только если следующая дата уже наступила
-                if next_date <= today:
-                    date_str = next_date.toString("yyyy-MM-dd")
-                    # Проверяем, что такой задачи еще нет
-                    if (date_str, task.title) not in existing_dates:
-                        new_id = max([t.id for t in self.tasks], default=0) + len(tasks_to_add) + 1
-                        new_task = Task(
-                            id=new_id,
-                            title=task.title,
-                            description=task.description,
-                            priority=task.priority,
-                            status="Не выполнено",
-                            due_date=date_str,
-                            created=datetime.now().strftime("%d.%m.%Y %H:%M"),
-                            repeat_type=task.repeat_type,
-                            last_repeated_date=None
-                        )
-                        tasks_to_add.append(new_task)
-                        task.last_repeated_date = today_str
-                        tasks_to_update.append(task)
-        
-        # Добавляем новые задачи
+            new_task = Task(
+                id=self._next_id,
+                title=task.title,
+                description=task.description,
+                priority=task.priority,
+                status="Не выполнено",
+                due_date=date_str,
+                created=created_str,
+                repeat_type=task.repeat_type,
+                last_repeated_date=None
+            )
+            self._next_id += 1
+            tasks_to_add.append(new_task)
+            existing_dates.add((date_str, task.title))
+            # Ежедневные задачи догоняют пропущенные дни по одному,
+            # еженедельные и ежемесячные отсчитываются от сегодняшнего дня
+            task.last_repeated_date = date_str if task.repeat_type == "daily" else today_str
+            tasks_to_update.append(task)
+        
+        # Добавляем новые задачи; сохраняем только если что-то изменилось
+        # (новые задачи или обновленная дата последнего повторения у шаблонов)
         if tasks_to_add:
             self.tasks.extend(tasks_to_add)
-            TaskStorage.save(self.tasks)
+            self._tasks_by_id.update((t.id, t) for t in tasks_to_add)
+        if tasks_to_add or tasks_to_update:
+            self._schedule_save()
     
     def _add_task(self):
         """Добавление новой задачи через диалог"""
@@ -6118,7 +7264,8 @@ class ModernTaskManager(QMainWindow):
                 return
             
             # Создание задачи
-            new_id = max([t.id for t in self.tasks], default=0) + 1
+            new_id = self._next_id
+            self._next_id += 1
             
             task = Task(
                 id=new_id,
@@ -6134,7 +7281,8 @@ class ModernTaskManager(QMainWindow):
             )
             
             self.tasks.append(task)
-            TaskStorage.save(self.tasks)
+            self._tasks_by_id[new_id] = task
+            self._schedule_save()
             self._refresh_tasks()
             
             # Очистка поля ввода
@@ -6143,27 +7291,32 @@ class ModernTaskManager(QMainWindow):
     
     def toggle_task_status(self, task_id: int):
         """Переключение статуса задачи"""
-        for task in self.tasks:
-            if task.id == task_id:
-                old_status = task.status
-                task.status = "Выполнено" if task.status != "Выполнено" else "Не выполнено"
-                
-                # Обновляем дату выполнения
-                if task.status == "Выполнено":
-                    task.completion_date = datetime.now().strftime("%d.%m.%Y %H:%M")
-                else:
-                    task.completion_date = None
-                
-                # Если задача перенесена в выполненные, скрываем её из списка (обновление через _refresh_tasks)
-                break
+        task = self._task_by_id(task_id)
+        if task is not None:
+            task.status = "Выполнено" if task.status != "Выполнено" else "Не выполнено"
+            
+            # Обновляем дату выполнения
+            if task.status == "Выполнено":
+                task.completion_date = datetime.now().strftime("%d.%m.%Y %H:%M")
+            else:
+                task.completion_date = None
+            
+            # Если задача перенесена в выполненные, скрываем её из списка (обновление через _refresh_tasks)
         
-        TaskStorage.save(self.tasks)
+        self._schedule_save()
         self._refresh_tasks()
     
     def delete_task(self, task_id: int):
         """Удаление задачи"""
-        self.tasks = [t for t in self.tasks if t.id != task_id]
-        TaskStorage.save(self.tasks)
+        task = self._task_by_id(task_id)
+        if task is None:
+            return
+        # Удаляем на месте, без пересборки списка
+        index = next(i for i, t in enumerate(self.tasks) if t is task)
+        del self.tasks[index]
+        del self._tasks_by_id[task_id]
+        self._sync_timer_ticks()
+        self._schedule_save()
         self._refresh_tasks()
     
     def edit_task(self, task: Task):
@@ -6177,55 +7330,70 @@ class ModernTaskManager(QMainWindow):
                 return
             
             # Обновляем задачу
-            for t in self.tasks:
-                if t.id == task.id:
-                    t.title = data["title"]
-                    t.description = data["description"]
-                    t.priority = data["priority"]
-                    t.due_date = data["due_date"]
-                    t.repeat_type = data.get("repeat_type")
-                    t.tags = data.get("tags", [])
-                    break
-            
-            TaskStorage.save(self.tasks)
+            t = self._task_by_id(task.id)
+            if t is not None:
+                t.title = data["title"]
+                t.description = data["description"]
+                t.priority = data["priority"]
+                t.due_date = data["due_date"]
+                t.repeat_type = data.get("repeat_type")
+                t.tags = data.get("tags", [])
+            
+            self._schedule_save()
             self._refresh_tasks()
     
     def _on_zoom_changed(self, value):
-        """Обработка изменения масштаба"""
+        """Обработка изменения масштаба (применяется отложенно, см. _zoom_apply_timer)"""
+        self._pending_zoom = value
+        self._zoom_apply_timer.start()
+    
+    def _apply_pending_zoom(self):
+        """Применение последнего запрошенного масштаба"""
+        value, self._pending_zoom = self._pending_zoom, None
+        if value is None:
+            return
         scale = value / 100.0
         ZoomManager.set_scale(scale)
+        # Стили карточек в глобальной таблице зависят от масштаба
+        QApplication.instance().setStyleSheet(get_global_style())
         self._refresh_ui_scale()
         self._check_overdue_tasks()
     
     def _check_overdue_tasks(self):
         """Проверка просроченных задач и обновление иконки"""
-        today = QDate.currentDate()
+        today = QDate.currentDate().toJulianDay()
+        self._overdue_scan_day = today
         old_overdue_ids = {task.id for task in self.overdue_tasks}  # Сохраняем старые ID
-        self.overdue_tasks = []
-        
-        for task in self.tasks:
-            # Проверяем только активные задачи
-            if task.status != "completed" and task.due_date:
-                try:
-                    due = QDate.fromString(task.due_date, "yyyy-MM-dd")
-                    if due < today:
-                        self.overdue_tasks.append(task)
-                except:
-                    pass
+        # Проверяем только активные задачи
+        self.overdue_tasks = [
+            task for task in self.tasks
+            if task.status != "Выполнено" and task.due_date and _due_julian_day(task.due_date) < today
+        ]
         
         # Если появились новые просроченные задачи (которых не было в старом списке), сбрасываем флаг
-        new_overdue_ids = {task.id for task in self.overdue_tasks}
-        if new_overdue_ids - old_overdue_ids:  # Есть новые задачи
+        # (флаг уже сброшен - искать незачем; any останавливается на первой новой задаче)
+        if self.notifications_dismissed and any(task.id not in old_overdue_ids for task in self.overdue_tasks):
             self.notifications_dismissed = False
                     
         has_overdue = len(self.overdue_tasks) > 0 and not self.notifications_dismissed
         
+        # Состояние индикатора не изменилось - кнопку не трогаем
+        # (проверка идет при каждом обновлении списка: drag&drop, фильтры, закрытие диалогов)
+        if has_overdue == self._overdue_badge_state:
+            return
+        
         if hasattr(self, 'notification_btn'):
+            self._overdue_badge_state = has_overdue
             # Кнопка всегда видна, но badge показывается только при наличии просроченных задач и если не закрыты
             self.notification_btn.set_notification_state(has_overdue)
             # Принудительное обновление для немедленного отображения изменений
             self.notification_btn.update()
     
+    def _on_overdue_day_tick(self):
+        """Минутный тик: при смене даты обновляем список (сроки и просроченные задачи)"""
+        if QDate.currentDate().toJulianDay() != self._overdue_scan_day:
+            self._schedule_refresh()
+    
     def _show_notifications(self):
         """Показать диалог уведомлений"""
         # Если уведомления были очищены пользователем, показываем пустой список
@@ -6241,30 +7409,29 @@ class ModernTaskManager(QMainWindow):
         # Позиционируем диалог точно под кнопкой уведомлений (прилипает к иконке)
         if hasattr(self, 'notification_btn'):
             dialog.adjustSize()
-            # Получаем глобальную позицию кнопки
+            # Размеры диалога и кнопки, позиция кнопки и границы экрана - один раз
+            dialog_w, dialog_h = dialog.width(), dialog.height()
             btn_pos = self.notification_btn.mapToGlobal(QPoint(0, 0))
-            btn_width = self.notification_btn.width()
-            btn_height = self.notification_btn.height()
+            btn_x, btn_y = btn_pos.x(), btn_pos.y()
+            screen_geo = self._screen_geo()
+            margin = ZoomManager.scaled(10)
             
             # Позиционируем диалог: выравниваем правый край диалога с правым краем кнопки
             # и размещаем сразу под кнопкой (без отступа или с минимальным)
-            x = btn_pos.x() + btn_width - dialog.width()
-            y = btn_pos.y() + btn_height  # Прямо под кнопкой, без отступа
-            
-            # Проверяем, чтобы диалог не выходил за границы экрана
-            screen_geo = self.screen().geometry()
+            x = btn_x + self.notification_btn.width() - dialog_w
+            y = btn_y + self.notification_btn.height()  # Прямо под кнопкой, без отступа
             
             # Если диалог выходит за правый край экрана, выравниваем по левому краю кнопки
-            if x + dialog.width() > screen_geo.right():
-                x = btn_pos.x()  # Выравниваем по левому краю кнопки
+            if x + dialog_w > screen_geo.right():
+                x = btn_x  # Выравниваем по левому краю кнопки
             if x < screen_geo.left():
-                x = screen_geo.left() + ZoomManager.scaled(10)
+                x = screen_geo.left() + margin
             
             # Если диалог не помещается снизу, показываем сверху кнопки
-            if y + dialog.height() > screen_geo.bottom():
-                y = btn_pos.y() - dialog.height()  # Показываем сверху кнопки
+            if y + dialog_h > screen_geo.bottom():
+                y = btn_y - dialog_h  # Показываем сверху кнопки
             if y < screen_geo.top():
-                y = screen_geo.top() + ZoomManager.scaled(10)
+                y = screen_geo.top() + margin
             
             dialog.move(x, y)
         
@@ -6276,6 +7443,7 @@ class ModernTaskManager(QMainWindow):
         self.notifications_dismissed = True
         # Обновляем состояние кнопки (убираем badge) - принудительно
         if hasattr(self, 'notification_btn'):
+            self._overdue_badge_state = False
             # Прямо устанавливаем флаг и обновляем
             self.notification_btn.has_notifications = False
             self.notification_btn.update()
@@ -6284,9 +7452,18 @@ class ModernTaskManager(QMainWindow):
              
     def _refresh_ui_scale(self):
         """Обновление UI при изменении масштаба"""
+        scale = ZoomManager.get_scale()
+        # Тот же масштаб уже применен - пересчитывать размеры и стили незачем
+        if scale == self._ui_scale_applied:
+            return
+        self._ui_scale_applied = scale
+        styles = _scaled_main_window_styles(scale, tuple(THEME.items()))
+        scaled = ZoomManager.scaled
+        s1, s4, s8, s24, s28, s45, s120 = (scaled(v) for v in (1, 4, 8, 24, 28, 45, 120))
+        
         # Обновляем отступы макетов
-        if hasattr(self, 'active_tasks_layout'):
-            self.active_tasks_layout.setSpacing(ZoomManager.scaled(4))
+        if self.active_tasks_layout is not None:
+            self.active_tasks_layout.setSpacing(s4)
             # Обновляем каждую карточку активной задачи
             for i in range(self.active_tasks_layout.count()):
                 item = self.active_tasks_layout.itemAt(i)
@@ -6297,31 +7474,23 @@ class ModernTaskManager(QMainWindow):
         
         
         
-        if hasattr(self, 'tasks_layout'):
-            self.tasks_layout.setSpacing(ZoomManager.scaled(8))
+        if self.tasks_layout is not None:
+            self.tasks_layout.setSpacing(s8)
+        
+        # Шрифт полей ввода (используется дважды)
+        font_input = ZoomManager.font("Segoe UI", 11)
         
         # Обновляем заголовки секций
         if hasattr(self, 'active_header'):
             self.active_header.setFont(ZoomManager.font("Segoe UI", 11, QFont.Bold))
-            self.active_header.setStyleSheet(f"color: {THEME['text_primary']}; padding: {ZoomManager.scaled(8)}px 0px;")
+            _set_style_if_changed(self.active_header, styles.active_header)
         
         
         
         # Обновляем кнопку переключения выполненных задач
         if hasattr(self, 'toggle_completed_btn'):
-            self.toggle_completed_btn.setFixedSize(ZoomManager.scaled(24), ZoomManager.scaled(24))
-            self.toggle_completed_btn.setStyleSheet(f"""
-                QPushButton {{
-                    background-color: transparent;
-                    color: {THEME['text_secondary']};
-                    border: none;
-                    font-size: {ZoomManager.scaled(18)}px;
-                    font-weight: bold;
-                }}
-                QPushButton:hover {{
-                    color: {THEME['text_primary']};
-                }}
-            """)
+            self.toggle_completed_btn.setFixedSize(s24, s24)
+            _set_style_if_changed(self.toggle_completed_btn, styles.toggle_completed_btn)
         
         # Обновляем шрифт счетчика задач
         if hasattr(self, 'task_counter'):
@@ -6331,68 +7500,32 @@ class ModernTaskManager(QMainWindow):
         if hasattr(self, 'add_btn'):
             self.add_btn.setFont(ZoomManager.font("Segoe UI", 10, QFont.Medium))
             # Динамически обновляем минимальную ширину
-            calc_width = ZoomManager.scaled(120)
-            self.add_btn.setMinimumWidth(calc_width)
+            self.add_btn.setMinimumWidth(s120)
             self.add_btn.setMaximumWidth(16777215) # MAX_SIZE
-            
-            self.add_btn.setStyleSheet(f"""
-                QPushButton {{
-                    background-color: {THEME['accent_bg']};
-                    border: none;
-                    border-radius: {ZoomManager.scaled(8)}px;
-                    padding: {ZoomManager.scaled(8)}px {ZoomManager.scaled(16)}px;
-                    color: {THEME['accent_text']};
-                }}
-                QPushButton:hover {{
-                    background-color: {THEME['accent_hover']};
-                }}
-            """)
+            _set_style_if_changed(self.add_btn, styles.add_btn)
 
             
         if hasattr(self, 'title_input'):
-            self.title_input.setFont(ZoomManager.font("Segoe UI", 11))
-            self.title_input.setStyleSheet(f"""
-            QLineEdit {{
-                background-color: {THEME['input_bg']};
-                border: 1px solid {THEME['border_color']};
-                border-radius: {ZoomManager.scaled(8)}px;
-                padding: {ZoomManager.scaled(10)}px {ZoomManager.scaled(12)}px;
-                color: {THEME['text_primary']};
-                selection-background-color: #6bcf7f;
-                selection-color: #ffffff;
-            }}
-            QLineEdit:focus {{
-                border: 1px solid rgba(107, 207, 127, 0.6);
-                background-color: {THEME['input_bg_focus']};
-            }}
-            QLineEdit::selection {{
-                background-color: #6bcf7f !important;
-                color: #ffffff !important;
-            }}
-        """)
+            self.title_input.setFont(font_input)
+            _set_style_if_changed(self.title_input, styles.title_input)
             
         if hasattr(self, 'priority_combo'):
             self.priority_combo.setFont(ZoomManager.font("Segoe UI", 10))
         
         # Обновляем нижнюю панель
         if hasattr(self, 'bottom_bar'):
-            self.bottom_bar.setFixedHeight(ZoomManager.scaled(45))
+            self.bottom_bar.setFixedHeight(s45)
         
         # Обновляем кнопку фильтров
-        if hasattr(self, 'filter_btn'):
-            self.filter_btn.setFixedHeight(ZoomManager.scaled(28))
+        if self.filter_btn is not None:
+            self.filter_btn.setFixedHeight(s28)
         
         # Обновляем разделитель
         if hasattr(self, 'separator'):
-            self.separator.setFixedHeight(ZoomManager.scaled(1))
+            self.separator.setFixedHeight(s1)
         
         # Обновляем все карточки задач (пересоздаем их)
         self._refresh_tasks()
-
-        # Обновляем шрифты в инпутах
-        font_input = ZoomManager.font("Segoe UI", 11)
-        if hasattr(self, 'title_input'):
-            self.title_input.setFont(font_input)
             
         # Force layout update
         self.updateGeometry()
@@ -6402,7 +7535,7 @@ class ModernTaskManager(QMainWindow):
         visible = not checked
         
         # Скрываем/показываем элементы
-        if hasattr(self, 'header_widget'):
+        if self.header_widget is not None:
             self.header_widget.setVisible(visible)
         
         # Скрываем форму добавления
@@ -6423,20 +7556,36 @@ class ModernTaskManager(QMainWindow):
     def _toggle_sounds(self, checked):
         """Переключение звуков"""
         SettingsManager.set("sounds_enabled", checked)
+        SoundManager.set_enabled(checked)
         # Обновляем иконку кнопки
         self.sound_btn.setText("🔊" if checked else "🔇")
         self.sound_btn.setToolTip("Включить звуки" if not checked else "Выключить звуки")
     
     def _toggle_pin(self, checked):
         """Переключение режима 'Поверх всех окон'"""
-        flags = self.windowFlags()
-        if checked:
-            flags |= Qt.WindowStaysOnTopHint
-        else:
-            flags &= ~Qt.WindowStaysOnTopHint
+        # В Windows меняем z-порядок существующего окна: без пересоздания HWND и мигания
+        if sys.platform == "win32" and self.isVisible():
+            insert_after = _HWND_TOPMOST if checked else _HWND_NOTOPMOST
+            hwnd = wintypes.HWND(int(self.winId()))
+            if ctypes.windll.user32.SetWindowPos(hwnd, insert_after, 0, 0, 0, 0, _SWP_Z_ORDER_ONLY):
+                # Флаг Qt приводим в соответствие без пересоздания окна: иначе код,
+                # читающий/переустанавливающий windowFlags() (мини-режим, show/hide), снимет закрепление
+                flags = self.windowFlags()
+                if checked:
+                    flags |= Qt.WindowStaysOnTopHint
+                else:
+                    flags &= ~Qt.WindowStaysOnTopHint
+                self.overrideWindowFlags(flags)
+                window_handle = self.windowHandle()
+                if window_handle is not None:
+                    window_handle.setFlag(Qt.WindowStaysOnTopHint, checked)
+                return
         
-        self.setWindowFlags(flags)
-        self.show() # Необходимо вызвать show после изменения флагов
+        # Иначе через флаг Qt (пересоздает нативное окно)
+        was_visible = self.isVisible()
+        self.setWindowFlag(Qt.WindowStaysOnTopHint, checked)
+        if was_visible:
+            self.show() # Необходимо вызвать show после изменения флагов
         
     def _show_about(self):
         """Показать диалог 'О программе'"""
@@ -6445,12 +7594,9 @@ class ModernTaskManager(QMainWindow):
         
     def _check_updates(self):
         """Проверка обновлений через GitHub"""
-        
-        try:
-            from version import __version__, GITHUB_API_URL
-        except ImportError:
-            __version__ = "1.0.1"
-            GITHUB_API_URL = "https://api.github.com/repos/elementary1997/taskmaster/releases/latest"
+        # Повторный клик, пока идёт запрос, игнорируем
+        if self._update_check_thread is not None and self._update_check_thread.isRunning():
+            return
         
         # Диалог проверки
         progress = QProgressDialog("Проверка обновлений...", None, 0, 0, self)
@@ -6459,74 +7605,50 @@ class ModernTaskManager(QMainWindow):
         progress.setMinimumDuration(0)
         progress.setValue(0)
         progress.show()
-        QApplication.processEvents()
         
-        try:
-            # Запрос к GitHub API
-            req = urllib.request.Request(GITHUB_API_URL)
-            req.add_header('User-Agent', 'TaskMaster')
+        self._update_check_progress = progress
+        
+        # Запрос к GitHub выполняется в отдельном потоке, чтобы не блокировать интерфейс
+        self._update_check_thread = UpdateCheckThread(GITHUB_API_URL)
+        self._update_check_thread.checked.connect(self._on_update_checked)
+        self._update_check_thread.failed.connect(self._on_update_check_failed)
+        self._update_check_thread.start()
+    
+    def _close_update_check_progress(self):
+        """Закрытие диалога прогресса ручной проверки обновлений"""
+        if self._update_check_progress is not None:
+            self._update_check_progress.close()
+            self._update_check_progress = None
+    
+    def _on_update_checked(self, latest_version, changelog, installer_url):
+        """Результат ручной проверки обновлений"""
+        self._close_update_check_progress()
+        styles = get_main_window_styles()
+        
+        # Сравнение версий
+        if self._compare_versions(latest_version, __version__) > 0:
+            # Доступно обновление - показываем badge и диалог
+            self._show_update_badge(True)
+            dialog = UpdateDialog(self, latest_version, changelog, installer_url)
+            dialog.exec()
+        else:
+            # Уже последняя версия
+            msg = QMessageBox(self)
+            msg.setWindowTitle("Обновление TaskMaster")
+            msg.setText(f"У вас установлена последняя версия TaskMaster v{__version__}")
+            msg.setIcon(QMessageBox.Information)
             
-            with urllib.request.urlopen(req, timeout=5) as response:
-                data = json.loads(response.read().decode())
-                
-                latest_version = data['tag_name'].lstrip('v')
-                changelog = data.get('body', 'Нет описания изменений')
-                
-                # Ищем только инсталлятор в активах релиза (TaskMaster-Installer-*.exe)
-                installer_url = None
-                if 'assets' in data:
-                    for asset in data['assets']:
-                        asset_name = asset['name']
-                        # Ищем только инсталлятор
-                        if 'installer' in asset_name.lower() and asset_name.lower().endswith('.exe'):
-                            installer_url = asset['browser_download_url']
-                            break
-                
-                # Если инсталлятор не найден, используем html_url как запасной вариант
-                if not installer_url:
-                    installer_url = data.get('html_url', '')
-                
-                progress.close()
-                
-                # Сравнение версий
-                if self._compare_versions(latest_version, __version__) > 0:
-                    # Доступно обновление - показываем badge и диалог
-                    self._show_update_badge(True)
-                    dialog = UpdateDialog(self, latest_version, changelog, installer_url)
-                    dialog.exec()
-                else:
-                    # Уже последняя версия
-                    msg = QMessageBox(self)
-                    msg.setWindowTitle("Обновление TaskMaster")
-                    msg.setText(f"У вас установлена последняя версия TaskMaster v{__version__}")
-                    msg.setIcon(QMessageBox.Information)
-                    
-                    # Стилизация
-                    msg.setStyleSheet(f"""
-                        QMessageBox {{
-                            background-color: {THEME['window_bg_end']};
-                        }}
-                        QLabel {{
-                            color: {THEME['text_primary']};
-                            font-size: 14px;
-                        }}
-                        QPushButton {{
-                            background-color: {THEME['accent_bg']};
-                            color: {THEME['accent_text']};
-                            border: none;
-                            border-radius: 6px;
-                            padding: 6px 16px;
-                            min-width: 80px;
-                        }}
-                        QPushButton:hover {{
-                            background-color: {THEME['accent_hover']};
-                        }}
-                    """)
-                    msg.exec()
-                    
-        except (FileNotFoundError, OSError) as e:
+            # Стилизация
+            msg.setStyleSheet(styles.msgbox_latest)
+            msg.exec()
+    
+    def _on_update_check_failed(self, e):
+        """Ошибка ручной проверки обновлений"""
+        self._close_update_check_progress()
+        styles = get_main_window_styles()
+        
+        if isinstance(e, (FileNotFoundError, OSError)):
             # Ошибки, связанные с отсутствием файлов PyInstaller (base_library.zip и т.д.)
-            progress.close()
             error_msg = str(e)
             if 'base_library.zip' in error_msg or '_MEI' in error_msg:
                 # Это ошибка PyInstaller - просто игнорируем проверку обновлений
@@ -6535,12 +7657,7 @@ class ModernTaskManager(QMainWindow):
                 msg.setText("Проверка обновлений временно недоступна")
                 msg.setInformativeText("Приложение работает в режиме без проверки обновлений.")
                 msg.setIcon(QMessageBox.Warning)
-                msg.setStyleSheet(f"""
-                    QMessageBox {{
-                        background-color: {THEME['window_bg_end']};
-                        color: {THEME['text_primary']};
-                    }}
-                """)
+                msg.setStyleSheet(styles.msgbox_plain)
                 msg.exec()
             else:
                 # Другая ошибка файловой системы
@@ -6549,16 +7666,9 @@ class ModernTaskManager(QMainWindow):
                 msg.setText("Не удалось проверить обновления")
                 msg.setInformativeText(f"Ошибка: {error_msg}")
                 msg.setIcon(QMessageBox.Critical)
-                msg.setStyleSheet(f"""
-                    QMessageBox {{
-                        background-color: {THEME['window_bg_end']};
-                        color: {THEME['text_primary']};
-                    }}
-                """)
+                msg.setStyleSheet(styles.msgbox_plain)
                 msg.exec()
-        except urllib.error.HTTPError as e:
-            progress.close()
-            
+        elif isinstance(e, urllib.error.HTTPError):
             if e.code == 404:
                 # Нет релизов на GitHub
                 msg = QMessageBox(self)
@@ -6566,22 +7676,7 @@ class ModernTaskManager(QMainWindow):
                 msg.setText(f"У вас установлена последняя версия TaskMaster v{__version__}")
                 msg.setInformativeText("Релизы пока не опубликованы на GitHub.")
                 msg.setIcon(QMessageBox.Information)
-                msg.setStyleSheet(f"""
-                    QMessageBox {{
-                        background-color: {THEME['window_bg_end']};
-                    }}
-                    QLabel {{
-                        color: {THEME['text_primary']};
-                        font-size: 13px;
-                    }}
-                    QPushButton {{
-                        background-color: {THEME['accent_bg']};
-                        color: {THEME['accent_text']};
-                        border: none;
-                        border-radius: 6px;
-                        padding: 6px 16px;
-                    }}
-                """)
+                msg.setStyleSheet(styles.msgbox_no_releases)
                 msg.exec()
             else:
                 # Другая HTTP ошибка
@@ -6590,87 +7685,62 @@ class ModernTaskManager(QMainWindow):
                 msg.setText("Не удалось проверить обновления")
                 msg.setInformativeText(f"HTTP ошибка: {e.code}")
                 msg.setIcon(QMessageBox.Warning)
-                msg.setStyleSheet(f"""
-                    QMessageBox {{
-                        background-color: {THEME['window_bg_end']};
-                    }}
-                    QLabel {{
-                        color: {THEME['text_primary']};
-                    }}
-                    QPushButton {{
-                        background-color: {THEME['accent_bg']};
-                        color: {THEME['accent_text']};
-                        border: none;
-                        border-radius: 6px;
-                        padding: 6px 16px;
-                    }}
-                """)
+                msg.setStyleSheet(styles.msgbox_error)
                 msg.exec()
                     
-        except Exception as e:
-            progress.close()
-            
+        else:
             # Ошибка проверки
             msg = QMessageBox(self)
             msg.setWindowTitle("Ошибка")
             msg.setText("Не удалось проверить обновления")
             msg.setInformativeText(f"Проверьте подключение к интернету\n\nОшибка: {str(e)}")
             msg.setIcon(QMessageBox.Warning)
-            msg.setStyleSheet(f"""
-                QMessageBox {{
-                    background-color: {THEME['window_bg_end']};
-                }}
-                QLabel {{
-                    color: {THEME['text_primary']};
-                }}
-                QPushButton {{
-                    background-color: {THEME['accent_bg']};
-                    color: {THEME['accent_text']};
-                    border: none;
-                    border-radius: 6px;
-                    padding: 6px 16px;
-                }}
-            """)
+            msg.setStyleSheet(styles.msgbox_error)
             msg.exec()
     
     def _check_updates_background(self):
         """Фоновая проверка обновлений без показа диалогов"""
         import threading
-        import urllib.request
-        import json
         
         def check_in_background():
-            print("Update check started in background...")
+            _update_log.debug("Update check started in background...")
             try:
-                import version
-                print(f"Current version: {version.__version__}")
+                _update_log.debug("Current version: %s", __version__)
                 
-                req = urllib.request.Request(version.GITHUB_API_URL, headers={'User-Agent': 'TaskMaster'})
+                req = urllib.request.Request(GITHUB_API_URL, headers={'User-Agent': 'TaskMaster'})
                 with urllib.request.urlopen(req, timeout=15) as response:
-                    data = json.loads(response.read().decode())
+                    data = json.load(response)
                     latest_version = data['tag_name'].lstrip('v')
-                    print(f"Latest version found: {latest_version}")
+                    _update_log.debug("Latest version found: %s", latest_version)
                     
-                    if self._compare_versions(latest_version, version.__version__) > 0:
-                        print("Update available! Emitting signal...")
+                    if self._compare_versions(latest_version, __version__) > 0:
+                        _update_log.debug("Update available! Emitting signal...")
                         self.update_found.emit(True)
                     else:
-                        print("No update available.")
+                        _update_log.debug("No update available.")
                         self.update_found.emit(False)
             except (FileNotFoundError, OSError) as e:
                 # Ошибки, связанные с отсутствием файлов PyInstaller - просто игнорируем
                 error_msg = str(e)
                 if 'base_library.zip' in error_msg or '_MEI' in error_msg:
-                    print("Update check skipped: PyInstaller files not found (running from exe)")
+                    _update_log.debug("Update check skipped: PyInstaller files not found (running from exe)")
                 else:
-                    print(f"Background update check failed (file system error): {e}")
+                    _update_log.debug("Background update check failed (file system error): %s", e)
             except Exception as e:
-                print(f"Background update check failed: {e}")
+                _update_log.debug("Background update check failed: %s", e)
         
         threading.Thread(target=check_in_background, daemon=True).start()
     
+    def _queue_update_badge(self, show):
+        """Отложенный показ индикации обновления: повторные сигналы схлопываются"""
+        self._pending_update_badge = show
+        self._update_badge_timer.start()
+    
     def _show_update_badge(self, show):
         """Показать/скрыть индикацию обновления"""
+        # Кнопка уже в нужном состоянии (изначально - без индикатора) - не трогаем
+        if show == self.update_available:
+            return
         self.update_available = show
         if show:
             # Используем синий цвет для обновления (выглядит как инфо, а не как ошибка)
@@ -6688,214 +7758,38 @@ class ModernTaskManager(QMainWindow):
     
     def _update_bottom_bar_styles(self):
         """Обновление стилей кнопок в нижней панели"""
+        # Панель и кнопки справки/обновления/инструментов/архива - одна таблица на bottom_bar
+        _set_style_if_changed(self.bottom_bar, get_main_window_styles().bottom_bar)
         
-        # Общий стиль для кнопок нижней панели
-        base_btn_style = f"""
-            QPushButton {{
-                background-color: transparent !important;
-                color: {THEME['text_secondary']} !important;
-                border: 1px solid {THEME['border_color']} !important;
-                border-radius: 16px; 
-                font-size: 16px;
-            }}
-            QPushButton:hover {{
-                background-color: {THEME['secondary_hover']} !important;
-                color: {THEME['text_primary']} !important;
-                border-color: {THEME['accent_hover']} !important;
-            }}
-        """
-
-        # 1. Кнопка обновления
-        if self.update_available:
-            self.update_btn.setStyleSheet(f"""
-                QPushButton#updateBtn {{
-                    background-color: transparent !important;
-                    border: 2px solid #4dabf7 !important;
-                    border-radius: 16px; 
-                }}
-                QPushButton#updateBtn:hover {{
-                    background-color: rgba(77, 171, 247, 0.1) !important;
-                }}
-            """)
-        else:
-            self.update_btn.setStyleSheet(f"""
-                QPushButton#updateBtn {{
-                    background-color: transparent !important;
-                    color: {THEME['text_secondary']} !important;
-                    border: 1px solid {THEME['border_color']} !important;
-                    border-radius: 16px; 
-                    font-size: 16px;
-                }}
-                QPushButton#updateBtn:hover {{
-                    background-color: {THEME['secondary_hover']} !important;
-                    color: {THEME['text_primary']} !important;
-                    border-color: {THEME['accent_hover']} !important;
-                }}
-            """)
-
-        # 2. Кнопка справки
-        if hasattr(self, 'help_btn'):
-            self.help_btn.setStyleSheet(f"""
-                QPushButton {{
-                    background-color: transparent;
-                    color: #ff4d4d;
-                    border: 1px solid {THEME['border_color']};
-                    border-radius: 16px; 
-                    font-size: 18px;
-                    font-weight: bold;
-                }}
-                QPushButton:hover {{
-                    background-color: {THEME['secondary_hover']};
-                    border-color: #ff4d4d;
-                }}
-            """)
-
-        # 3. Кнопка инструментов
-        is_tools_visible = self.tools_container.isVisible()
-        if is_tools_visible:
-            self.toggle_tools_btn.setStyleSheet(f"""
-                QPushButton#toolsBtn {{
-                    background-color: {THEME['accent_bg']} !important;
-                    color: {THEME['accent_text']} !important;
-                    border: 1px solid {THEME['accent_hover']} !important;
-                    border-radius: 16px; 
-                    font-size: 16px;
-                }}
-            """)
-        else:
-            self.toggle_tools_btn.setStyleSheet(f"""
-                QPushButton#toolsBtn {{
-                    background-color: transparent !important;
-                    color: {THEME['text_secondary']} !important;
-                    border: 1px solid {THEME['border_color']} !important;
-                    border-radius: 16px; 
-                    font-size: 16px;
-                }}
-                QPushButton#toolsBtn:hover {{
-                    background-color: {THEME['secondary_hover']} !important;
-                    color: {THEME['text_primary']} !important;
-                    border-color: {THEME['accent_hover']} !important;
-                }}
-            """)
-            
-        # 4. Кнопки внутри панели инструментов (zoom, opacity, pin, theme)
-        if hasattr(self, 'zoom_btn'):
-            # Zoom (Aa)
-            self.zoom_btn.setStyleSheet(f"""
-                QPushButton {{
-                    background-color: transparent;
-                    border: 1px solid {THEME['border_color']};
-                    color: {THEME['text_primary']};
-                    border-radius: 6px;
-                    font-weight: bold;
-                    font-size: 14px;
-                }}
-                QPushButton:hover {{
-                    background-color: {THEME['secondary_hover']};
-                    border-color: {THEME['accent_hover']};
-                }}
-            """)
-            
-        if hasattr(self, 'opacity_btn'):
-            # Opacity (Drop)
-            self.opacity_btn.setStyleSheet(f"""
-                QPushButton {{
-                    background-color: transparent;
-                    border: 1px solid {THEME['border_color']};
-                    color: {THEME['text_primary']};
-                    border-radius: 6px;
-                    font-size: 16px;
-                }}
-                QPushButton:hover {{
-                    background-color: {THEME['secondary_hover']};
-                    border-color: {THEME['accent_hover']};
-                }}
-            """)
-            
-        if hasattr(self, 'pin_btn'):
-            # Pin icon
-            self.pin_btn.setStyleSheet(f"""
-                QPushButton {{
-                    background-color: transparent;
-                    border: none;
-                    color: {THEME['text_secondary']};
-                    font-size: 14px;
-                    border-radius: 4px;
-                }}
-                QPushButton:hover {{
-                    background-color: {THEME['secondary_hover']};
-                    color: {THEME['text_primary']};
-                }}
-                QPushButton:checked {{
-                    background-color: {THEME['accent_bg']};
-                    color: {THEME['accent_text']};
-                }}
-            """)
+        # Состояние кнопок - динамические свойства, без пересборки таблиц стилей
+        _set_style_state(self.update_btn, "updateAvailable", bool(self.update_available))
+        _set_style_state(self.toggle_tools_btn, "open", self.tools_container.isVisible())
             
-        if hasattr(self, 'theme_btn'):
-            # Theme icon
-            self.theme_btn.setStyleSheet(f"""
-                QPushButton {{
-                    background-color: transparent;
-                    border: none;
-                    color: {THEME['text_secondary']};
-                    font-size: 14px;
-                    border-radius: 4px;
-                }}
-                QPushButton:hover {{
-                    background-color: {THEME['secondary_hover']};
-                    color: {THEME['text_primary']};
-                }}
-            """)
+        # Кнопки панели инструментов (zoom, opacity, теги и маленькие) - одна таблица на tools_container
+        _set_style_if_changed(self.tools_container, get_main_window_styles().tools_container)
 
     
     def _compare_versions(self, v1, v2):
         """Сравнение версий (v1 > v2 = 1, v1 == v2 = 0, v1 < v2 = -1)"""
-        def normalize(v):
-            return [int(x) for x in v.split('.')]
-        
-        parts1 = normalize(v1)
-        parts2 = normalize(v2)
-        
-        for i in range(max(len(parts1), len(parts2))):
-            p1 = parts1[i] if i < len(parts1) else 0
-            p2 = parts2[i] if i < len(parts2) else 0
-            
-            if p1 > p2:
-                return 1
-            elif p1 < p2:
-                return -1
-        
-        return 0
+        k1 = _version_key(v1)
+        k2 = _version_key(v2)
+        return (k1 > k2) - (k1 < k2)
     
     def _show_theme_menu(self):
         """Показать меню выбора темы"""
         from PySide6.QtWidgets import QMenu
-        from PySide6.QtGui import QAction, QColor
-        
-        menu = QMenu(self)
-        menu.setStyleSheet(f"""
-            QMenu {{
-                background-color: {THEME['window_bg_end']};
-                color: {THEME['text_primary']};
-                border: 1px solid {THEME['border_color']};
-                border-radius: 8px;
-                padding: 5px;
-            }}
-            QMenu::item {{
-                padding: 5px 20px;
-                border-radius: 4px;
-            }}
-            QMenu::item:selected {{
-                background-color: {THEME['secondary_hover']};
-            }}
-        """)
+        from PySide6.QtGui import QAction
         
-        for name, theme_data in AVAILABLE_THEMES.items():
-            action = QAction(f"● {name}", self)
-            # Замыкание для захвата имени и данных темы
-            action.triggered.connect(lambda checked=False, n=name, t=theme_data: self._apply_custom_theme(n, t))
-            menu.addAction(action)
+        # Набор тем фиксирован - пункты создаются один раз
+        menu = self._theme_menu
+        if menu is None:
+            menu = self._theme_menu = QMenu(self)
+            for name in AVAILABLE_THEMES:
+                action = QAction(f"● {name}", menu)
+                action.setData(name)
+                menu.addAction(action)
+            menu.triggered.connect(self._on_theme_action_triggered)
+        _set_style_if_changed(menu, get_main_window_styles().theme_menu)
             
         # Корректируем позицию, чтобы меню не выходило за границы окна
         menu_height = menu.sizeHint().height()
@@ -6912,6 +7806,11 @@ class ModernTaskManager(QMainWindow):
             menu_pos.setX(window_rect.right() - menu_width - 5)
             
         menu.exec(menu_pos)
+    
+    def _on_theme_action_triggered(self, action):
+        """Выбор пункта в меню тем"""
+        name = action.data()
+        self._apply_custom_theme(name, AVAILABLE_THEMES[name])
         
     def _apply_custom_theme(self, theme_name, theme_data):
         """Применение выбранной темы"""
@@ -6923,79 +7822,31 @@ class ModernTaskManager(QMainWindow):
         # Сохраняем выбранную тему в настройки
         SettingsManager.set("current_theme", theme_name)
         
-        # Обновляем глобальные стили приложения с новыми цветами темы
-        QApplication.instance().setStyleSheet(get_global_style())
-        
-        self._refresh_styles()
-
-    def _refresh_styles(self):
-        """Обновление стилей всех элементов"""
-        # Обновляем заголовок приложения
-        if hasattr(self, 'app_title_lbl'):
-            self.app_title_lbl.setStyleSheet(f"color: {THEME['text_primary']};")
-        
-        # Обновляем фон основного контейнера
-        if hasattr(self, 'main_container'):
-            self.main_container.setStyleSheet(f"""
-                QFrame#mainContainer {{
-                    background: qlineargradient(
-                        x1:0, y1:0, x2:1, y2:1,
-                        stop:0 {THEME['window_bg_start']},
-                        stop:1 {THEME['window_bg_end']}
-                    );
-                    border: none;
-                }}
-            """)
-            
-        # Обновляем нижнюю панель (bottom_bar) до формы «пилюли»
-        if hasattr(self, 'bottom_bar'):
-            self.bottom_bar.setStyleSheet(f"""
-                QFrame#bottomBar {{
-                    background-color: {THEME['card_bg']};
-                    border: 1px solid {THEME['border_color']}; 
-                    border-radius: 22px;
-                }}
-            """)
+        # Глобальная таблица и стили виджетов меняются вместе в _do_refresh_styles -
+        # без кадра с новой глобальной темой и старыми цветами виджетов
+        self._style_refresh_timer.start()
 
-        # Обновляем кнопку добавления (она использует accent_bg)
-        self.add_btn.setStyleSheet(f"""
-            QPushButton {{
-                background-color: {THEME['accent_bg']};
-                border: none;
-                border-radius: 8px;
-                padding: 8px 16px;
-                color: {THEME['accent_text']};
-            }}
-            QPushButton:hover {{
-                background-color: {THEME['accent_hover']};
-            }}
-        """)
+    def _do_refresh_styles(self):
+        """Обновление стилей всех элементов (вызывается через _style_refresh_timer)"""
+        styles = get_main_window_styles()
+        scaled_styles = _scaled_main_window_styles(ZoomManager.get_scale(), tuple(THEME.items()))
+        
+        # Глобальная таблица (в т.ч. карточки и подсказки QToolTip) - в том же проходе,
+        # что и таблицы виджетов; ставим ее, только если она устарела
+        app = QApplication.instance()
+        global_style = get_global_style()
+        if app.styleSheet() != global_style:
+            app.setStyleSheet(global_style)
         
+        # Фон окна, заголовок, форма добавления, счетчик, кнопка фильтров и прокрутка -
+        # одна таблица на главный контейнер
+        _set_style_if_changed(self.main_container, styles.main_container)
+        
+        # Нижняя панель («пилюля») и ее кнопки обновляются в _update_bottom_bar_styles
+
         # Обновляем слайдер
         # ... (пропуск закомментированного кода слайдера)
 
-        # Кнопка минимализма (checked state uses accent)
-        self.minimal_mode_btn.setStyleSheet(f"""
-            QPushButton {{
-                background-color: transparent;
-                border: none;
-                color: {THEME['text_secondary']};
-                font-size: 16px;
-                border-radius: 4px;
-            }}
-            QPushButton:hover {{
-                background-color: {THEME['secondary_hover']};
-                color: {THEME['text_primary']};
-            }}
-            QPushButton:checked {{
-                background-color: {THEME['accent_bg']};
-                color: {THEME['accent_text']};
-            }}
-        """)
-        
-        # Кнопка пина (checked state uses accent)
-        self.pin_btn.setStyleSheet(self.minimal_mode_btn.styleSheet())
-        
         # Обновляем стрелку выполненных
         
         
@@ -7003,152 +7854,29 @@ class ModernTaskManager(QMainWindow):
             self.date_navigator.update_styles()
             self.date_navigator.update_label()
 
-        if hasattr(self, 'priority_combo'):
-            self.priority_combo.setStyleSheet(f"""
-                QComboBox {{
-                    background-color: {THEME['input_bg']};
-                    border: 1px solid {THEME['border_color']};
-                    border-radius: 8px;
-                    padding: 8px 12px;
-                    color: {THEME['text_primary']};
-                }}
-                QComboBox:hover {{
-                    background-color: {THEME['input_bg_focus']};
-                }}
-                QComboBox:focus {{
-                    border: 1px solid {THEME['accent_hover']};
-                }}
-                QComboBox::drop-down {{
-                    border: none;
-                }}
-                QComboBox QAbstractItemView {{
-                    background-color: {THEME['card_bg']};
-                    border: 1px solid {THEME['border_color']};
-                    color: {THEME['text_primary']};
-                    outline: none;
-                }}
-                QComboBox QAbstractItemView::item {{
-                    padding: 6px 10px;
-                }}
-                QComboBox QAbstractItemView::item:selected {{
-                    background-color: {THEME['accent_bg']};
-                    color: {THEME['accent_text']};
-                }}
-            """)
-            
         # Task Cards (re-create them to apply new theme)
         self._refresh_tasks()
         
-        # Обновляем кнопку фильтров
-        if hasattr(self, 'filter_btn'):
-            self.filter_btn.setStyleSheet(f"""
-                QPushButton {{
-                    background-color: rgba(255, 255, 255, 0.05);
-                    border: 1px solid {THEME['border_color']};
-                    color: {THEME['text_secondary']};
-                    border-radius: 14px;
-                    padding: 0 12px;
-                    font-size: 11px;
-                    font-weight: 500;
-                }}
-                QPushButton:hover {{
-                    background-color: rgba(255, 255, 255, 0.1);
-                    border: 1px solid rgba(255, 255, 255, 0.2);
-                    color: {THEME['text_primary']};
-                }}
-            """)
-            
-        # Обновление подсказок (ToolTips) - Применяем максимально жестко
-        tooltip_style = f"""
-            QToolTip {{
-                background-color: {THEME['window_bg_start']} !important;
-                color: {THEME['text_primary']} !important;
-                border: 1px solid {THEME['border_color']} !important;
-                border-radius: 6px !important;
-                padding: 5px !important;
-            }}
-        """
-        QApplication.instance().setStyleSheet(get_global_style() + tooltip_style)
-        self.setStyleSheet(self.styleSheet() + tooltip_style)
-        
         # Обновляем кнопки закрытия и сворачивания (они используют paintEvent)
-        for btn in self.findChildren(CloseButton):
-            btn.update()
-        for btn in self.findChildren(MinimizeButton):
+        for btn in self._header_buttons:
             btn.update()
         
         # КРИТИЧЕСКИ ВАЖНО: Применяем новые стили полей ввода с цветами из текущей темы
+        # (список полей собран при создании интерфейса - без обхода всего дерева виджетов)
         input_style = get_input_field_style()
-        for widget in self.findChildren(QLineEdit):
-            widget.setStyleSheet(input_style)
-        
-        for widget in self.findChildren(QComboBox):
-            # Для QComboBox нужно сохранить дополнительные стили, если они есть
-            widget.setStyleSheet(input_style)
-            # Явно отключаем прозрачность для выпадающего списка
-            if hasattr(widget, 'view') and widget.view():
-                widget.view().setAttribute(Qt.WA_TranslucentBackground, False)
-                if widget.view().window():
-                    widget.view().window().setAttribute(Qt.WA_TranslucentBackground, False)
-        
-        for widget in self.findChildren(QDateEdit):
-            widget.setStyleSheet(input_style)
-        
-        # Обновление индикатора обновления
-        if hasattr(self, 'update_badge'):
-            self.update_badge.setStyleSheet(f"""
-                QLabel {{
-                    background-color: #ff4444;
-                    border: 2px solid {THEME['window_bg_end']};
-                    border-radius: 6px;
-                }}
-            """)
-        
-        # Обновление формы добавления задачи
-        if hasattr(self, 'add_form'):
-            self.add_form.setStyleSheet(f"""
-                QFrame {{
-                    background-color: {THEME['form_bg']};
-                    border-radius: 12px;
-                    border: 1px solid {THEME['border_color']};
-                }}
-            """)
-
-        # Обновление поля ввода названия с правильными цветами выделения
-        if hasattr(self, 'title_input'):
-            # Определяем цвет выделения на основе акцента темы
-            selection_bg = THEME['accent_bg'].replace("0.4", "1.0") # Делаем непрозрачным
-            # Если это rgba, попробуем преобразовать или просто используем accent_hover
-            
-            self.title_input.setStyleSheet(f"""
-                QLineEdit {{
-                    background-color: {THEME['input_bg']};
-                    border: 1px solid {THEME['border_color']};
-                    border-radius: 8px;
-                    padding: 10px 12px;
-                    color: {THEME['text_primary']};
-                    selection-background-color: {THEME['accent_hover']};
-                    selection-color: {THEME['accent_text']};
-                }}
-                QLineEdit:focus {{
-                    border: 1px solid {THEME['accent_hover']};
-                    background-color: {THEME['input_bg_focus']};
-                }}
-                QLineEdit::selection {{
-                    background-color: {THEME['accent_hover']};
-                    color: {THEME['accent_text']};
-                }}
-            """)
-            
-        # Обновление заголовков и разделителей
-        if hasattr(self, 'active_header'):
-            self.active_header.setStyleSheet(f"color: {THEME['text_primary']}; padding: 8px 0px;")
-            
-        if hasattr(self, 'separator'):
-            self.separator.setStyleSheet(f"background-color: {THEME['border_color']}; border: none; max-height: 1px; min-height: 1px;")
-            
-        if hasattr(self, 'completed_header_label'):
-            self.completed_header_label.setStyleSheet(f"color: {THEME['text_secondary']}; padding: 8px 0px;")
+        for widget in self._themed_inputs:
+            _set_style_if_changed(widget, input_style)
+            if isinstance(widget, QComboBox):
+                # Явно отключаем прозрачность для выпадающего списка
+                view = widget.view()
+                view.setAttribute(Qt.WA_TranslucentBackground, False)
+                if view.window():
+                    view.window().setAttribute(Qt.WA_TranslucentBackground, False)
+        
+        # Элементы с размерами от масштаба: кнопка добавления, поле названия, заголовок секции
+        _set_style_if_changed(self.add_btn, scaled_styles.add_btn)
+        _set_style_if_changed(self.title_input, scaled_styles.title_input)
+        _set_style_if_changed(self.active_header, scaled_styles.active_header)
         
         # Обновление кнопок нижней панели
         self._update_bottom_bar_styles()
@@ -7158,99 +7886,103 @@ class ModernTaskManager(QMainWindow):
         QApplication.instance().quit()
 
 
+    def _sync_timer_ticks(self):
+        """Обновить список задач с запущенным таймером и включить/выключить секундный тик"""
+        self._running_timer_tasks = [t for t in self.tasks if t.is_running]
+        if self._running_timer_tasks:
+            if not self.timer.isActive():
+                self.timer.start()
+        else:
+            # Без запущенных таймеров окно не просыпается каждую секунду
+            self.timer.stop()
+
     def _update_timers(self):
         """Обновление таймеров активных задач"""
-        save_needed = False
+        running = self._running_timer_tasks
+        if not running:
+            return
+        # Дата берется один раз за тик - общая для всех запущенных задач
         date_str = QDate.currentDate().toString("yyyy-MM-dd")
         
-        for task in self.tasks:
-            if task.is_running:
-                task.time_spent += 1
-                
-                # Логируем время по дням
-                if not hasattr(task, 'time_log') or task.time_log is None:
-                    task.time_log = {}
-                
-                task.time_log[date_str] = task.time_log.get(date_str, 0) + 1
-                save_needed = True
-                
-        if save_needed:
-            # Обновляем UI активных задач без полной перерисовки
-            # Находим карточки активных задач
-            if hasattr(self, 'tasks_layout'):
-                for i in range(self.tasks_layout.count()):
-                    item = self.tasks_layout.itemAt(i)
-                    if item and item.widget():
-                        card = item.widget()
-                        if isinstance(card, TaskCard) and card.task.is_running:
-                            card.update_time_display(card.task.time_spent)
+        for task in running:
+            task.time_spent += 1
             
-            # Сохраняем не каждый тик, а, скажем, раз в минуту или при закрытии? 
-            # Для надежности сохраняем раз в 10 секунд или полагаемся на автосохранение при выходе/паузе.
-            # Пока оставим сохранение в памяти, сброс на диск при паузе/выходе.
-            pass
+            # Логируем время по дням (time_log - всегда словарь, см. Task и TaskStorage.load)
+            time_log = task.time_log
+            time_log[date_str] = time_log.get(date_str, 0) + 1
+                
+        # Обновляем UI активных задач без полной перерисовки: карточки по ID задачи
+        cards = self._card_by_task_id
+        for task in running:
+            card = cards.get(task.id)
+            if card is not None and card.task is task:
+                card.update_time_display(task.time_spent)
+        
+        # Время пишется на диск не каждый тик, а раз в минуту (и при паузе/выходе)
+        if not self._time_save_timer.isActive():
+            self._time_save_timer.start()
 
     def toggle_task_timer(self, task_id):
         """Переключение таймера задачи"""
-        for task in self.tasks:
-            if task.id == task_id:
-                # Если запускаем эту задачу, останавливаем другие (опционально)
-                if not task.is_running:
-                    for t in self.tasks:
-                        if t.is_running:
-                            t.is_running = False
-                            # Обновляем UI остановленной задачи
-                            self._refresh_single_task_card(t.id)
-                
-                task.is_running = not task.is_running
-                TaskStorage.save(self.tasks)
-                
-                # Обновляем UI текущей задачи
-                self._refresh_single_task_card(task_id)
-                break
+        task = self._task_by_id(task_id)
+        if task is None:
+            return
+        # Если запускаем эту задачу, останавливаем другие (опционально):
+        # запущенные уже собраны в _running_timer_tasks, весь список не обходим
+        if not task.is_running:
+            for t in self._running_timer_tasks:
+                t.is_running = False
+                # Обновляем UI остановленной задачи
+                self._refresh_single_task_card(t.id)
+        
+        task.is_running = not task.is_running
+        self._sync_timer_ticks()
+        self._schedule_save()
+        
+        # Обновляем UI текущей задачи
+        self._refresh_single_task_card(task_id)
     
     def reset_task_timer(self, task_id):
         """Сброс таймера задачи"""
-        for task in self.tasks:
-            if task.id == task_id:
-                task.time_spent = 0
-                task.is_running = False
-                TaskStorage.save(self.tasks)
-                self._refresh_single_task_card(task_id)
-                break
+        task = self._task_by_id(task_id)
+        if task is None:
+            return
+        task.time_spent = 0
+        task.is_running = False
+        self._sync_timer_ticks()
+        self._schedule_save()
+        self._refresh_single_task_card(task_id)
     
     def change_task_status_by_id(self, task_id, new_status):
         """Изменение статуса задачи (для drag & drop)"""
-        for task in self.tasks:
-            if str(task.id) == task_id:
-                task.status = new_status
-                TaskStorage.save(self.tasks)
-                # Полное обновление, так как задача перемещается между секциями
-                self._refresh_tasks()
-                
-                # Если задача перенесена в выполненные, закрываем секцию выполненных задач
-                if new_status == "Выполнено":
-                    if hasattr(self, 'completed_tasks_container'):
-                        self.completed_tasks_container.setVisible(False)
-                        self.toggle_completed_btn.setText("▶")
-                break
+        # ID приходит текстом из mime-данных
+        try:
+            task = self._task_by_id(int(task_id))
+        except ValueError:
+            return
+        if task is None:
+            return
+        task.status = new_status
+        self._schedule_save()
+        # Полное обновление, так как задача перемещается между секциями
+        self._schedule_refresh()
+        
+        # Если задача перенесена в выполненные, закрываем секцию выполненных задач
+        if new_status == "Выполнено":
+            if self.completed_tasks_container is not None:
+                self.completed_tasks_container.setVisible(False)
+                self.toggle_completed_btn.setText("▶")
     
     def _refresh_single_task_card(self, task_id):
         """Обновление одной карточки задачи"""
-        if hasattr(self, 'tasks_layout'):
-            for i in range(self.tasks_layout.count()):
-                item = self.tasks_layout.itemAt(i)
-                if item and item.widget():
-                    card = item.widget()
-                    if isinstance(card, TaskCard) and card.task.id == task_id:
-                        # Находим обновленную задачу
-                        for task in self.tasks:
-                            if task.id == task_id:
-                                # Обновляем состояние без пересоздания
-                                card.task = task
-                                card.update_time_display(task.time_spent)
-                                card.update_timer_state(task.is_running)
-                                return
+        card = self._card_by_task_id.get(task_id)
+        task = self._task_by_id(task_id)
+        if card is None or task is None:
+            return
+        # Обновляем состояние без пересоздания
+        card.task = task
+        card.update_time_display(task.time_spent)
+        card.update_timer_state(task.is_running)
                                 
     def _show_filter_menu(self):
         """Показать выпадающее меню фильтров"""
@@ -7261,48 +7993,34 @@ class ModernTaskManager(QMainWindow):
         if self._active_filter_menu:
             self._active_filter_menu.close()
         
-        menu = QMenu(self)
-        menu.setStyleSheet(f"""
-            QMenu {{
-                background-color: {THEME['window_bg_end']};
-                color: {THEME['text_primary']};
-                border: 1px solid {THEME['border_color']};
-                border-radius: 8px;
-                padding: 6px;
-            }}
-            QMenu::item {{
-                padding: 8px 32px 8px 16px;
-                border-radius: 4px;
-                margin: 2px;
-            }}
-            QMenu::item:selected {{
-                background-color: {THEME['accent_bg']};
-                color: {THEME['accent_text']};
-            }}
-            QMenu::icon {{
-                padding-left: 10px;
-            }}
-        """)
+        menu = self._filter_menu
+        if menu is None:
+            menu = self._filter_menu = QMenu(self)
+            # Закрываем меню - сбрасываем ссылку на открытое меню
+            menu.aboutToHide.connect(lambda: setattr(self, '_active_filter_menu', None))
+            
+            filters = [
+                ("all", "📋 Все задачи"),
+                ("high", "🚩 Высокий приоритет"),
+                ("medium", "🟠 Средний приоритет"),
+                ("low", "🟢 Низкий приоритет")
+            ]
+            
+            for filter_id, label in filters:
+                action = QAction(label, menu)
+                action.setCheckable(True)
+                action.setData(filter_id)
+                menu.addAction(action)
+            menu.triggered.connect(self._on_filter_action_triggered)
+        _set_style_if_changed(menu, get_main_window_styles().filter_menu)
         
         # Сохраняем ссылку на меню
         self._active_filter_menu = menu
+        self._popup_version += 1
         
-        # Закрываем меню при его закрытии
-        menu.aboutToHide.connect(lambda: setattr(self, '_active_filter_menu', None))
-        
-        filters = [
-            ("all", "📋 Все задачи"),
-            ("high", "🚩 Высокий приоритет"),
-            ("medium", "🟠 Средний приоритет"),
-            ("low", "🟢 Низкий приоритет")
-        ]
-        
-        for filter_id, label in filters:
-            action = QAction(label, self)
-            action.setCheckable(True)
-            action.setChecked(self.current_filter == filter_id)
-            action.triggered.connect(lambda checked, fid=filter_id: self._set_filter(fid))
-            menu.addAction(action)
+        # Отмечаем текущий фильтр
+        for action in menu.actions():
+            action.setChecked(action.data() == self.current_filter)
             
         # Корректируем позицию, чтобы меню не выходило за границы главного окна
         menu_pos = self.filter_btn.mapToGlobal(QPoint(0, self.filter_btn.height() + 4))
@@ -7320,6 +8038,10 @@ class ModernTaskManager(QMainWindow):
         # Показываем меню
         menu.exec(menu_pos)
     
+    def _on_filter_action_triggered(self, action):
+        """Выбор пункта в меню фильтров"""
+        self._set_filter(action.data())
+    
     def _set_filter(self, filter_id):
         """Установка текущего фильтра"""
         self.current_filter = filter_id
@@ -7333,41 +8055,45 @@ class ModernTaskManager(QMainWindow):
         }
         self.filter_btn.setText(filters.get(filter_id, "🔘 Фильтры"))
             
-        # Обновляем список задач
-        self._refresh_tasks()
+        # Данные не менялись - достаточно спрятать/показать готовые карточки
+        self._apply_card_filters()
 
 
 
-def create_app_icon():
-    """Создание иконки приложения"""
-    # Пытаемся загрузить иконку из файла
-    base_dir = Path(__file__).parent.resolve()
-    
+def _resource_dirs():
+    """Папки, где ищутся файлы иконок (в порядке приоритета)"""
     # В PyInstaller exe ресурсы распаковываются во временную папку
     if getattr(sys, 'frozen', False):
-        # Запущено из exe
-        exe_dir = Path(sys.executable).parent
-        icon_paths = [
-            exe_dir / "icon.ico",
-            exe_dir / "icon.png",
-        ]
-        # Также проверяем временную папку PyInstaller
+        # Запущено из exe: рядом с exe, затем временная папка PyInstaller
+        dirs = [Path(sys.executable).parent]
         if hasattr(sys, '_MEIPASS'):
-            icon_paths.extend([
-                Path(sys._MEIPASS) / "icon.ico",
-                Path(sys._MEIPASS) / "icon.png",
-            ])
-    else:
-        # Запущено из скрипта
-        icon_paths = [
-            base_dir / "icon.ico",
-            base_dir / "icon.png",
-        ]
-    
-    # Пытаемся загрузить иконку
-    for icon_path in icon_paths:
-        if icon_path.exists():
-            return QIcon(str(icon_path))
+            dirs.append(Path(sys._MEIPASS))
+        return dirs
+    # Запущено из скрипта
+    return [Path(__file__).parent.resolve()]
+
+
+def _find_resource(*names):
+    """Первый существующий файл из names (по всем папкам ресурсов) или None"""
+    for base_dir in _resource_dirs():
+        for name in names:
+            path = base_dir / name
+            if path.exists():
+                return path
+    return None
+
+
+# Пути к иконкам ищутся один раз при импорте, а не при каждом создании иконки
+_APP_ICON_PATH = _find_resource("icon.ico", "icon.png")
+_TIMER_ICON_PATH = _find_resource(Path("icons") / "timer.png")
+
+
+@lru_cache(maxsize=1)
+def create_app_icon():
+    """Создание иконки приложения"""
+    # Пытаемся загрузить иконку из файла
+    if _APP_ICON_PATH is not None:
+        return QIcon(str(_APP_ICON_PATH))
     
     # Если иконки нет, создаем программно
     pixmap = QPixmap(32, 32)
@@ -7400,37 +8126,40 @@ def create_app_icon():
 def create_timer_icon():
     """Создание иконки таймера"""
     # Пытаемся загрузить иконку из файла
-    base_dir = Path(__file__).parent.resolve()
-    
-    # В PyInstaller exe ресурсы распаковываются во временную папку
-    if getattr(sys, 'frozen', False):
-        # Запущено из exe
-        exe_dir = Path(sys.executable).parent
-        icon_paths = [
-            exe_dir / "icons" / "timer.png",
-        ]
-        # Также проверяем временную папку PyInstaller
-        if hasattr(sys, '_MEIPASS'):
-            icon_paths.extend([
-                Path(sys._MEIPASS) / "icons" / "timer.png",
-            ])
-    else:
-        # Запущено из скрипта
-        icon_paths = [
-            base_dir / "icons" / "timer.png",
-        ]
-    
-    # Пытаемся загрузить иконку
-    for icon_path in icon_paths:
-        if icon_path.exists():
-            return QIcon(str(icon_path))
+    if _TIMER_ICON_PATH is not None:
+        return QIcon(str(_TIMER_ICON_PATH))
     
     # Если иконки нет, возвращаем пустую иконку (fallback на эмодзи)
     return QIcon()
 
 
+# Иконка таймера загружается один раз на все карточки
+_TIMER_ICON = None
+# Иконки таймера, отрисованные под конкретный размер (по масштабу)
+_TIMER_PIX_CACHE = {}
+
+
+def _get_timer_icon(size=None):
+    """
+    Общая иконка таймера для карточек задач.
+    size - сторона в пикселях: возвращается иконка из заранее отрисованного пиксмапа
+    """
+    global _TIMER_ICON
+    if _TIMER_ICON is None:
+        _TIMER_ICON = create_timer_icon()
+    if size is None or _TIMER_ICON.isNull():
+        return _TIMER_ICON
+    icon = _TIMER_PIX_CACHE.get(size)
+    if icon is None:
+        icon = QIcon(_TIMER_ICON.pixmap(QSize(size, size)))
+        _TIMER_PIX_CACHE[size] = icon
+    return icon
+
+
+@lru_cache(maxsize=16)
 def create_notification_icon(color="#4dabf7", size=64):
-    """Программное создание красивой иконки уведомления (восклицательный знак)"""
+    """Программное создание красивой иконки уведомления (восклицательный знак).
+    Кэшируется по цвету и размеру: индикатор обновления переключается многократно"""
     pixmap = QPixmap(size, size)
     pixmap.fill(Qt.transparent)
     
@@ -7472,8 +8201,9 @@ def create_notification_icon(color="#4dabf7", size=64):
     return QIcon(pixmap)
 
 
+@lru_cache(maxsize=16)
 def create_report_icon(color="#6bcf7f", size=64):
-    """Программное создание иконки отчета (графема)"""
+    """Программное создание иконки отчета (графема), кэш по цвету и размеру"""
     pixmap = QPixmap(size, size)
     pixmap.fill(Qt.transparent)
     
@@ -7557,7 +8287,18 @@ def main():
     
     window.show()
     
-    sys.exit(app.exec())
+    exit_code = app.exec()
+    # os._exit не вызывает деструкторы: иконку трея убираем сами,
+    # иначе в Windows она остается «призраком» до наведения мыши
+    tray_icon = getattr(window, 'tray_icon', None)
+    if tray_icon is not None:
+        tray_icon.hide()
+    # К этому моменту задачи уже записаны (aboutToQuit -> _save_now), настройки
+    # сохраняются синхронно. Обычный sys.exit прогнал бы разбор интерпретатора
+    # с уничтожением всех Qt-объектов по одному - выходим сразу
+    sys.stdout.flush()
+    sys.stderr.flush()
+    os._exit(exit_code)
 
 
 if __name__ == "__main__":
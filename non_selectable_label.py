@@ -17,21 +17,6 @@ class NonSelectableLabel(QLabel):
         self.setTextInteractionFlags(Qt.NoTextInteraction)
         # Отключаем фокус
         self.setFocusPolicy(Qt.NoFocus)
-        # Делаем виджет прозрачным для событий мыши (но видимым визуально)
-        self.setAttribute(Qt.WA_TransparentForMouseEvents, False)
-    
-    def mousePressEvent(self, event):
-        """Игнорируем нажатия мыши"""
-        event.ignore()
-    
-    def mouseReleaseEvent(self, event):
-        """Игнорируем отпускание мыши"""
-        event.ignore()
-    
-    def mouseMoveEvent(self, event):
-        """Игнорируем движение мыши"""
-        event.ignore()
-    
-    def mouseDoubleClickEvent(self, event):
-        """Игнорируем двойной клик"""
-        event.ignore()
+        # Делаем виджет прозрачным для событий мыши (но видимым визуально):
+        # события уходят родителю прямо из Qt, без вызова Python-обработчиков
+        self.setAttribute(Qt.WA_TransparentForMouseEvents, True)